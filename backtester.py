@@ -10,6 +10,10 @@ from data_fetcher import DataFetcher
 from analyzer import TechnicalAnalyzer
 
 
+# Nanoseconds -> hours, for hold times computed on int64 ns timestamps
+NS_TO_HOURS = 1.0 / 3.6e12
+
+
 class Backtester:
     """
     Backtest trading strategies on historical data
@@ -33,7 +37,13 @@ class Backtester:
         self.balance = initial_balance
         self.positions = {}
         self.trades = []
-        self.equity_curve = []
+        self.equity_curve = pd.DataFrame()
+        
+        # Equity curve columns, filled per bar and assembled once per run
+        self._ts_list = []
+        self._bal_list = []
+        self._eq_list = []
+        self._np_list = []
         
     def run_backtest(self, df: pd.DataFrame, symbol: str, analyzer: TechnicalAnalyzer,
                     stop_loss_percent=3, take_profit_percent=5) -> Dict:
@@ -56,16 +66,24 @@ class Backtester:
         self.balance = self.initial_balance
         self.positions = {}
         self.trades = []
-        self.equity_curve = []
+        self.equity_curve = pd.DataFrame()
+        self._ts_list = []
+        self._bal_list = []
+        self._eq_list = []
+        self._np_list = []
         
         # Calculate indicators
         df = analyzer.calculate_all_indicators(df)
         
+        # Candle times as int64 nanoseconds for hold-time arithmetic
+        index_ns = df.index.values.astype('datetime64[ns]').view(np.int64)
+        
         # Iterate through candles
         for i in range(50, len(df)):  # Start after warmup period
             current_candle = df.iloc[i]
             current_price = current_candle['close']
             current_time = current_candle.name
+            current_ns = index_ns[i]
             
             # Get historical data up to current point
             historical_df = df.iloc[:i+1]
@@ -73,7 +91,7 @@ class Backtester:
             # Check stop loss / take profit for existing positions
             if symbol in self.positions:
                 self._check_exit_conditions(
-                    symbol, current_price, current_time,
+                    symbol, current_price, current_time, current_ns,
                     stop_loss_percent, take_profit_percent
                 )
             
@@ -82,25 +100,24 @@ class Backtester:
             
             # Execute trades based on signal
             if signal == 'BUY' and symbol not in self.positions:
-                self._execute_backtest_buy(symbol, current_price, current_time, strength)
+                self._execute_backtest_buy(symbol, current_price, current_time, current_ns, strength)
             
             elif signal == 'SELL' and symbol in self.positions:
-                self._execute_backtest_sell(symbol, current_price, current_time, 'Signal')
+                self._execute_backtest_sell(symbol, current_price, current_time, current_ns, 'Signal')
             
             # Record equity
             equity = self._calculate_backtest_equity(current_price)
-            self.equity_curve.append({
-                'timestamp': current_time,
-                'balance': self.balance,
-                'equity': equity,
-                'positions': len(self.positions)
-            })
+            self._ts_list.append(current_time)
+            self._bal_list.append(self.balance)
+            self._eq_list.append(equity)
+            self._np_list.append(len(self.positions))
         
         # Close any remaining positions at end
         if symbol in self.positions:
             final_price = df.iloc[-1]['close']
             final_time = df.iloc[-1].name
-            self._execute_backtest_sell(symbol, final_price, final_time, 'End of backtest')
+            self._execute_backtest_sell(symbol, final_price, final_time, index_ns[-1],
+                                       'End of backtest')
         
         # Calculate results
         results = self._calculate_backtest_results()
@@ -111,7 +128,8 @@ class Backtester:
         
         return results
     
-    def _execute_backtest_buy(self, symbol: str, price: float, timestamp, strength: int):
+    def _execute_backtest_buy(self, symbol: str, price: float, timestamp, timestamp_ns: int,
+                              strength: int):
         """Execute buy in backtest"""
         # Apply slippage
         execution_price = price * (1 + self.slippage)
@@ -129,7 +147,7 @@ class Backtester:
         self.positions[symbol] = {
             'amount': position_size,
             'entry_price': execution_price,
-            'entry_time': timestamp,
+            'entry_time': timestamp_ns,
             'entry_balance': self.balance + total_cost
         }
         
@@ -145,7 +163,8 @@ class Backtester:
             'balance': self.balance
         })
     
-    def _execute_backtest_sell(self, symbol: str, price: float, timestamp, reason: str):
+    def _execute_backtest_sell(self, symbol: str, price: float, timestamp, timestamp_ns: int,
+                               reason: str):
         """Execute sell in backtest"""
         if symbol not in self.positions:
             return
@@ -183,10 +202,10 @@ class Backtester:
             'profit_loss_percent': profit_loss_percent,
             'balance': self.balance,
             'reason': reason,
-            'hold_time': (timestamp - position['entry_time']).total_seconds() / 3600  # hours
+            'hold_time': float((timestamp_ns - position['entry_time']) * NS_TO_HOURS)  # hours
         })
     
-    def _check_exit_conditions(self, symbol: str, price: float, timestamp,
+    def _check_exit_conditions(self, symbol: str, price: float, timestamp, timestamp_ns: int,
                               stop_loss_percent: float, take_profit_percent: float):
         """Check if stop loss or take profit should trigger"""
         if symbol not in self.positions:
@@ -198,13 +217,13 @@ class Backtester:
         # Stop loss
         stop_loss_price = entry_price * (1 - stop_loss_percent / 100)
         if price <= stop_loss_price:
-            self._execute_backtest_sell(symbol, price, timestamp, 'Stop Loss')
+            self._execute_backtest_sell(symbol, price, timestamp, timestamp_ns, 'Stop Loss')
             return
         
         # Take profit
         take_profit_price = entry_price * (1 + take_profit_percent / 100)
         if price >= take_profit_price:
-            self._execute_backtest_sell(symbol, price, timestamp, 'Take Profit')
+            self._execute_backtest_sell(symbol, price, timestamp, timestamp_ns, 'Take Profit')
             return
     
     def _calculate_backtest_equity(self, current_price: float) -> float:
@@ -216,6 +235,17 @@ class Backtester:
     
     def _calculate_backtest_results(self) -> Dict:
         """Calculate comprehensive backtest results"""
+        # Build the equity curve DataFrame once from the per-bar columns.
+        # Reporting arrays are float32/int32; the running balance itself
+        # stays float64 for accounting.
+        equity_values = np.asarray(self._eq_list, dtype=np.float32)
+        self.equity_curve = pd.DataFrame({
+            'timestamp': self._ts_list,
+            'balance': np.asarray(self._bal_list, dtype=np.float32),
+            'equity': equity_values,
+            'positions': np.asarray(self._np_list, dtype=np.int32)
+        })
+        
         if not self.trades:
             return {
                 'total_trades': 0,
@@ -229,32 +259,34 @@ class Backtester:
         # Separate buy and sell trades
         buy_trades = [t for t in self.trades if t['action'] == 'BUY']
         sell_trades = [t for t in self.trades if t['action'] == 'SELL']
+        pnl = np.fromiter((t.get('profit_loss', 0) for t in sell_trades),
+                          dtype=np.float32, count=len(sell_trades))
+        hold_times = np.fromiter((t.get('hold_time', 0) for t in sell_trades),
+                                 dtype=np.float64, count=len(sell_trades))
         
         # Calculate metrics
         total_trades = len(sell_trades)
-        winning_trades = len([t for t in sell_trades if t.get('profit_loss', 0) > 0])
-        losing_trades = len([t for t in sell_trades if t.get('profit_loss', 0) < 0])
+        wins = pnl > 0
+        losses = pnl < 0
+        winning_trades = int(np.count_nonzero(wins))
+        losing_trades = int(np.count_nonzero(losses))
         
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
         
-        total_profit = sum(t.get('profit_loss', 0) for t in sell_trades if t.get('profit_loss', 0) > 0)
-        total_loss = sum(t.get('profit_loss', 0) for t in sell_trades if t.get('profit_loss', 0) < 0)
+        # Accumulate in float64 so cent-level totals stay exact
+        total_profit = float(pnl[wins].sum(dtype=np.float64))
+        total_loss = float(pnl[losses].sum(dtype=np.float64))
         net_profit = total_profit + total_loss
         
-        final_equity = self.equity_curve[-1]['equity'] if self.equity_curve else self.initial_balance
+        final_equity = self._eq_list[-1] if self._eq_list else self.initial_balance
         total_return = ((final_equity - self.initial_balance) / self.initial_balance) * 100
         
         # Calculate maximum drawdown
-        equity_values = [e['equity'] for e in self.equity_curve]
-        peak = equity_values[0]
-        max_drawdown = 0
-        
-        for equity in equity_values:
-            if equity > peak:
-                peak = equity
-            drawdown = ((peak - equity) / peak) * 100
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
+        if len(equity_values) > 0:
+            running_max = np.maximum.accumulate(equity_values)
+            max_drawdown = float((((running_max - equity_values) / running_max) * 100).max())
+        else:
+            max_drawdown = 0
         
         # Average trade metrics
         avg_profit = total_profit / winning_trades if winning_trades > 0 else 0
@@ -263,16 +295,12 @@ class Backtester:
         profit_factor = abs(total_profit / total_loss) if total_loss != 0 else 0
         
         # Average hold time
-        avg_hold_time = np.mean([t.get('hold_time', 0) for t in sell_trades]) if sell_trades else 0
+        avg_hold_time = float(hold_times.mean()) if len(hold_times) else 0
         
         # Sharpe ratio (simplified)
-        returns = []
-        for i in range(1, len(self.equity_curve)):
-            prev_equity = self.equity_curve[i-1]['equity']
-            curr_equity = self.equity_curve[i]['equity']
-            returns.append((curr_equity - prev_equity) / prev_equity)
+        returns = np.diff(equity_values) / equity_values[:-1]
         
-        sharpe_ratio = (np.mean(returns) / np.std(returns)) * np.sqrt(252) if len(returns) > 1 else 0
+        sharpe_ratio = float((np.mean(returns) / np.std(returns)) * np.sqrt(252)) if len(returns) > 1 else 0
         
         return {
             'total_trades': total_trades,
@@ -311,8 +339,7 @@ class Backtester:
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
             
             # Equity curve
-            equity_df = pd.DataFrame(results['equity_curve'])
-            equity_df.set_index('timestamp', inplace=True)
+            equity_df = results['equity_curve'].set_index('timestamp')
             
             ax1.plot(equity_df.index, equity_df['equity'], label='Equity', linewidth=2)
             ax1.axhline(y=self.initial_balance, color='r', linestyle='--', 
@@ -322,13 +349,17 @@ class Backtester:
             ax1.legend()
             ax1.grid(True, alpha=0.3)
             
-            # Mark buy/sell trades
-            for trade in results['trades']:
-                color = 'g' if trade['action'] == 'BUY' else 'r'
-                marker = '^' if trade['action'] == 'BUY' else 'v'
-                ax1.scatter(trade['timestamp'], 
-                          equity_df.loc[trade['timestamp'], 'equity'],
-                          color=color, marker=marker, s=100, zorder=5)
+            # Mark buy/sell trades (one scatter call per side)
+            if results['trades']:
+                trades_df = pd.DataFrame(results['trades'], columns=['timestamp', 'action'])
+                trades_df = pd.merge_asof(trades_df, results['equity_curve'][['timestamp', 'equity']],
+                                          on='timestamp')
+                buys = (trades_df['action'] == 'BUY').values
+                sells = ~buys
+                ax1.scatter(trades_df['timestamp'].values[buys], trades_df['equity'].values[buys],
+                          color='g', marker='^', s=100, zorder=5)
+                ax1.scatter(trades_df['timestamp'].values[sells], trades_df['equity'].values[sells],
+                          color='r', marker='v', s=100, zorder=5)
             
             # Drawdown
             equity_values = equity_df['equity'].values
@@ -0,0 +1,127 @@
+"""
+Cache Module - Persistent on-disk cache for fetched market data
+"""
+import glob
+import os
+import pickle
+import re
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+
+class FileCache:
+    """
+    Pickle-backed file cache with per-entry TTL
+
+    Keys are tuples; the first element selects a sub-directory and the rest
+    form the file name, e.g. ('BTC/USDT', '15m', 500, 1894) is stored as
+    .cache/BTC_USDT/15m_500_1894.pkl. The last key element is treated as a
+    bucket: writing a new bucket removes older buckets of the same key.
+    """
+
+    def __init__(self, cache_dir: str = '.cache', default_ttl: Optional[float] = None):
+        """
+        Initialize file cache
+
+        Args:
+            cache_dir: Root directory for cache files
+            default_ttl: Default entry lifetime in seconds (None = no expiry)
+        """
+        self.cache_dir = cache_dir
+        self.default_ttl = default_ttl
+
+    @staticmethod
+    def _safe(part: Any) -> str:
+        """Make a key element safe for use in a file name"""
+        return re.sub(r'[^A-Za-z0-9.-]', '_', str(part))
+
+    def _path(self, key: Tuple) -> str:
+        """Build the file path for a cache key"""
+        directory = os.path.join(self.cache_dir, self._safe(key[0]))
+        name = '_'.join(self._safe(part) for part in key[1:]) or 'value'
+        return os.path.join(directory, f"{name}.pkl")
+
+    def get(self, key: Tuple, ttl: Optional[float] = None) -> Optional[Any]:
+        """
+        Read a cached value
+
+        Args:
+            key: Cache key tuple
+            ttl: Maximum entry age in seconds (defaults to default_ttl)
+
+        Returns:
+            Cached value, or None on miss/expiry
+        """
+        path = self._path(key)
+        ttl = self.default_ttl if ttl is None else ttl
+
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+        if ttl is not None and time.time() - entry['timestamp'] > ttl:
+            return None
+
+        return entry['value']
+
+    def latest(self, key: Tuple) -> Optional[Any]:
+        """
+        Read the newest entry sharing the key's prefix, ignoring bucket and TTL
+
+        Args:
+            key: Cache key tuple (its last element is ignored)
+
+        Returns:
+            Cached value, or None if no bucket of the key exists
+        """
+        path = self._path(key)
+        prefix = '_'.join(self._safe(part) for part in key[1:-1])
+        candidates = glob.glob(os.path.join(glob.escape(os.path.dirname(path)), f"{prefix}_*.pkl"))
+        if not candidates:
+            return None
+
+        try:
+            with open(max(candidates, key=os.path.getmtime), 'rb') as f:
+                return pickle.load(f)['value']
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def set(self, key: Tuple, value: Any):
+        """
+        Store a value
+
+        Args:
+            key: Cache key tuple
+            value: Picklable value
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Drop older buckets of the same key
+        if len(key) > 2:
+            prefix = '_'.join(self._safe(part) for part in key[1:-1])
+            for stale in glob.glob(os.path.join(glob.escape(os.path.dirname(path)), f"{prefix}_*.pkl")):
+                if stale != path:
+                    try:
+                        os.remove(stale)
+                    except OSError:
+                        pass
+
+        # Write atomically so concurrent readers never see a partial file; the
+        # temp name is per thread so concurrent writers of a key don't share it
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'timestamp': time.time(), 'value': value}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        """Remove all cache files"""
+        for path in glob.glob(os.path.join(glob.escape(self.cache_dir), '*', '*.pkl')):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -3,7 +3,7 @@ Configuration Management with Pydantic Models
 Provides type-safe, validated configuration with schema validation
 """
 
-from pydantic import BaseModel, Field, validator, SecretStr
+from pydantic import BaseModel, Field, PrivateAttr, validator, SecretStr
 from typing import List, Dict, Optional, Literal
 from pathlib import Path
 import yaml
@@ -112,6 +112,7 @@ class MLConfig(BaseModel):
     model_type: Literal['rf', 'xgb', 'ensemble'] = Field('ensemble')
     
     retrain_interval_hours: int = Field(168, ge=24, description="Retrain every N hours")
+    warm_start_retrain: bool = Field(False, description="Extend existing models on retrain instead of refitting")
     min_training_samples: int = Field(1000, ge=100)
     
     feature_importance_threshold: float = Field(0.01, ge=0, le=1)
@@ -119,6 +120,8 @@ class MLConfig(BaseModel):
     
     use_prediction_cache: bool = Field(True)
     cache_ttl_seconds: int = Field(300, ge=60)
+    prediction_cache_path: Optional[str] = Field(None, description="SQLite file persisting predictions across restarts")
+    prediction_cache_policy: Literal['enabled', 'read_only', 'replay', 'disabled'] = Field('enabled')
     
     ensemble_weights: Dict[str, float] = Field(
         default={'rf': 0.4, 'xgb': 0.4, 'indicators': 0.2}
@@ -160,6 +163,7 @@ class DatabaseConfig(BaseModel):
     password: Optional[SecretStr] = None
     ssl_mode: Optional[str] = Field('prefer')
     
+    group_commit: bool = Field(True, description="Batch trade/signal inserts in a background writer")
     encrypt_local: bool = Field(False, description="Encrypt local SQLite database")
     backup_enabled: bool = Field(True)
     backup_interval_hours: int = Field(24, ge=1)
@@ -205,6 +209,10 @@ class BotConfig(BaseModel):
     logging: LoggingConfig
     backtest: BacktestConfig
     
+    # Memoized validate_for_live_trading() result, keyed by a checksum of its inputs
+    _validation_hash: Optional[int] = PrivateAttr(default=None)
+    _cached_issues: Optional[List[str]] = PrivateAttr(default=None)
+    
     class Config:
         use_enum_values = True
         validate_assignment = True
@@ -270,6 +278,19 @@ class BotConfig(BaseModel):
         Returns:
             List of validation warnings/errors
         """
+        # Skip revalidation while the relevant fields are unchanged
+        h = hash((
+            self.trading.mode,
+            bool(self.exchange.api_key),
+            bool(self.exchange.api_secret),
+            self.risk_management.stop_loss_pct,
+            self.risk_management.max_daily_loss_pct,
+            self.trading.position_size_pct,
+            self.database.backup_enabled,
+        ))
+        if h == self._validation_hash:
+            return list(self._cached_issues)
+        
         issues = []
         
         if self.trading.mode == 'live':
@@ -292,7 +313,9 @@ class BotConfig(BaseModel):
             if not self.database.backup_enabled:
                 issues.append("Database backup should be enabled for live trading")
         
-        return issues
+        self._validation_hash = h
+        self._cached_issues = issues
+        return list(issues)
 
 
 # Create default configuration
@@ -1,14 +1,114 @@
 """
 Data Fetcher Module - Fetch real-time and historical cryptocurrency data
 """
+import asyncio
+import functools
+import json
+import os
 import ccxt
+import ccxt.async_support as ccxt_async
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import numpy as np
 from logger import get_logger
+from cache import FileCache
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import ccxt.pro as ccxtpro
+    CCXTPRO_AVAILABLE = True
+except ImportError:
+    CCXTPRO_AVAILABLE = False
+
+
+class CircuitOpenError(ccxt.NetworkError):
+    """Raised without sending a request while the primary exchange circuit is open"""
+    pass
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for request-weight rate limiting
+    
+    Tokens are reserved up front: a request that overdraws the bucket sleeps
+    until the refill covers it, so concurrent callers queue in order.
+    """
+    
+    def __init__(self, capacity: float = 1200, refill_per_s: float = 20.0):
+        """
+        Initialize token bucket
+        
+        Args:
+            capacity: Maximum burst weight
+            refill_per_s: Weight restored per second
+        """
+        self.capacity = capacity
+        self.tokens = capacity
+        self.refill_per_s = refill_per_s
+        self.base_refill_per_s = refill_per_s
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, weight: float = 1) -> float:
+        """
+        Reserve weight and return how long the caller must wait
+        
+        Args:
+            weight: Request weight
+        
+        Returns:
+            Seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self._last_refill) * self.refill_per_s)
+            self._last_refill = now
+            self.tokens -= weight
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.refill_per_s
+    
+    def consume(self, weight: float = 1):
+        """
+        Block until the requested weight is available
+        
+        Args:
+            weight: Request weight
+        """
+        wait = self.reserve(weight)
+        if wait > 0:
+            time.sleep(wait)
+    
+    def penalize(self):
+        """Halve the refill rate after the server reports throttling"""
+        with self._lock:
+            self.refill_per_s = max(self.refill_per_s / 2, self.base_refill_per_s / 16)
+    
+    def recover(self):
+        """Step the refill rate back towards the configured rate after a success"""
+        if self.refill_per_s < self.base_refill_per_s:
+            with self._lock:
+                self.refill_per_s = min(self.refill_per_s * 1.1, self.base_refill_per_s)
 
 
 class DataFetcher:
@@ -16,8 +116,38 @@ class DataFetcher:
     Multi-source cryptocurrency data fetcher with error handling and validation
     """
     
+    # Binance REST request weights (budget: 1200 per minute per IP)
+    REQUEST_WEIGHTS = {
+        'fetch_ohlcv': 2,
+        'fetch_ticker': 2,
+        'fetch_order_book': 5,
+        'coingecko': 1,
+    }
+    
+    # CoinGecko coin IDs by base asset (expand as needed)
+    _COINGECKO_IDS = {
+        'BTC': 'bitcoin',
+        'ETH': 'ethereum',
+        'BNB': 'binancecoin',
+        'SOL': 'solana',
+        'ADA': 'cardano',
+        'XRP': 'ripple',
+        'DOT': 'polkadot',
+        'DOGE': 'dogecoin',
+        'MATIC': 'matic-network',
+        'AVAX': 'avalanche-2'
+    }
+    
+    # Candle timeframe -> minutes
+    _TIMEFRAME_MINUTES = {
+        '1m': 1, '5m': 5, '15m': 15, '30m': 30,
+        '1h': 60, '4h': 240, '1d': 1440
+    }
+    
     def __init__(self, primary_source='binance', backup_source='coingecko',
-                 api_key=None, api_secret=None):
+                 api_key=None, api_secret=None, use_cache=True, cache_dir='.cache',
+                 cache_ttl=None, poll_interval=1.0, price_dtype=np.float32,
+                 markets_ttl=6 * 3600):
         """
         Initialize data fetcher
         
@@ -26,22 +156,43 @@ class DataFetcher:
             backup_source: Backup data source
             api_key: API key for exchange (optional)
             api_secret: API secret for exchange (optional)
+            use_cache: Cache OHLCV on disk so repeat fetches only download
+                candles from the last cached (possibly still open) one on
+            cache_dir: Directory for the OHLCV cache
+            cache_ttl: Cache entry lifetime in seconds (defaults to the timeframe duration)
+            poll_interval: Seconds between background price polls
+            price_dtype: dtype of the open/high/low/close columns. float32
+                keeps >7 significant digits (cent precision up to ~$100k,
+                dollar precision up to ~$10M) at half the memory traffic;
+                volume always stays float64
+            markets_ttl: Seconds a disk copy of exchange markets stays valid
         """
         self.logger = get_logger()
         self.primary_source = primary_source
         self.backup_source = backup_source
+        self.price_dtype = np.dtype(price_dtype)
+        self.markets_ttl = markets_ttl
+        self.markets_cache_path = os.path.join(cache_dir, f"markets_{primary_source.lower()}.json")
         
         # Initialize primary exchange (public access - no auth needed for price data)
+        # Binance is throttled by our weight-aware TokenBucket (see
+        # rate_limiters below), so ccxt's own limiter is disabled to avoid
+        # sleeping twice. Other exchanges keep ccxt's limiter since
+        # REQUEST_WEIGHTS only models Binance.
+        self.builtin_rate_limit = primary_source.lower() != 'binance'
+        
         try:
             if primary_source.lower() == 'binance':
                 self.exchange = ccxt.binance({
-                    'enableRateLimit': True,
+                    'enableRateLimit': False,
                     'options': {
                         'defaultType': 'spot'
                     }
                 })
+                # Should anything fall back to ccxt's throttler: 1200/min = 50ms
+                self.exchange.rateLimit = 50
                 # Load markets (public endpoint, no timestamp required)
-                self.exchange.load_markets()
+                self._load_markets()
             else:
                 # Generic exchange initialization
                 exchange_class = getattr(ccxt, primary_source.lower())
@@ -49,36 +200,217 @@ class DataFetcher:
                     'enableRateLimit': True
                 })
                 if self.exchange:
-                    self.exchange.load_markets()
+                    self._load_markets()
             
             self.logger.info(f"Initialized {primary_source} exchange connection")
         except Exception as e:
             self.logger.error(f"Failed to initialize exchange: {e}")
             self.exchange = None
         
-        # Rate limiting
-        self.last_request_time = {}
-        self.min_request_interval = 1.0  # Minimum seconds between requests
+        # Rate limiting: weight-aware token buckets per source
+        self.rate_limiters = {
+            self.primary_source: TokenBucket(capacity=1200, refill_per_s=20.0),
+            'coingecko': TokenBucket(capacity=10, refill_per_s=0.5)
+        }
+        self.max_retries = 3
+        
+        # Circuit breaker: after breaker_threshold consecutive network failures
+        # the primary exchange is skipped for breaker_cooldown seconds
+        self._breaker = {'fails': 0, 'open_until': 0.0}
+        self.breaker_threshold = 5
+        self.breaker_cooldown = 60
         
         # CoinGecko API
         self.coingecko_base_url = "https://api.coingecko.com/api/v3"
         
-    def _rate_limit(self, source: str):
+        # Pooled HTTP session for REST fallbacks (keeps TCP/TLS connections alive)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.5,
+                              status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'User-Agent': 'crypto-bot/1.0'
+        })
+        
+        # OHLCV cache, keyed by the current candle bucket
+        self.use_cache = use_cache
+        self.cache_ttl = cache_ttl
+        self.cache = FileCache(cache_dir)
+        
+        # Background price poller: symbol -> (price, monotonic timestamp)
+        self.poll_interval = poll_interval
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
+        self._watched: set = set()
+        self._poller_thread: Optional[threading.Thread] = None
+        self._stop_polling = threading.Event()
+        
+    def _load_markets(self):
+        """
+        Load exchange markets, reusing a recent disk copy when available
+        
+        A fresh copy skips the exchangeInfo download on cold start; otherwise
+        markets are fetched and the copy is rewritten.
+        """
+        try:
+            if time.time() - os.path.getmtime(self.markets_cache_path) < self.markets_ttl:
+                with open(self.markets_cache_path, 'rb') as f:
+                    data = _json_loads(f.read())
+                self.exchange.set_markets(data['markets'], data.get('currencies'))
+                self.logger.debug(f"Loaded {len(data['markets'])} markets from disk cache")
+                return
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        
+        self.exchange.load_markets()
+        
+        try:
+            os.makedirs(os.path.dirname(self.markets_cache_path) or '.', exist_ok=True)
+            tmp_path = f"{self.markets_cache_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'markets': self.exchange.markets,
+                           'currencies': self.exchange.currencies,
+                           'ts': time.time()}, f)
+            os.replace(tmp_path, self.markets_cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"Could not write markets cache: {e}")
+    
+    def _invalidate_markets_cache(self):
+        """Drop the disk copy of markets so the next start refetches them"""
+        try:
+            os.remove(self.markets_cache_path)
+        except OSError:
+            pass
+    
+    def close(self):
+        """Stop the price poller and release pooled HTTP connections"""
+        self._stop_polling.set()
+        if self._poller_thread is not None:
+            self._poller_thread.join(timeout=self.poll_interval * 2)
+            self._poller_thread = None
+        self.session.close()
+    
+    def _start_price_poller(self):
+        """Start the background price poller if it is not running"""
+        if self._poller_thread is not None and self._poller_thread.is_alive():
+            return
+        
+        self._stop_polling.clear()
+        self._poller_thread = threading.Thread(target=self._price_poller,
+                                               name='price-poller', daemon=True)
+        self._poller_thread.start()
+    
+    def _price_poller(self):
+        """Refresh prices of all watched symbols with one batched request per interval"""
+        while not self._stop_polling.is_set():
+            symbols = list(self._watched)
+            if symbols and self.exchange is not None:
+                try:
+                    tickers = self._call_with_backoff('fetch_tickers', self.exchange.fetch_tickers,
+                                                      symbols, weight=self._tickers_weight(len(symbols)))
+                    now = time.monotonic()
+                    for symbol in symbols:
+                        ticker = tickers.get(symbol)
+                        if ticker:
+                            price = ticker.get('last') or ticker.get('close')
+                            if price:
+                                self._price_cache[symbol] = (float(price), now)
+                except Exception as e:
+                    self.logger.warning(f"Price poller error: {e}")
+            
+            self._stop_polling.wait(self.poll_interval)
+    
+    def _consume(self, method: str, weight: Optional[int] = None):
         """
-        Implement rate limiting
+        Take request weight from the rate-limit bucket of the method's source
         
         Args:
-            source: Data source identifier
+            method: Request type (key of REQUEST_WEIGHTS)
+            weight: Explicit weight (overrides the table)
+        """
+        source = 'coingecko' if method.startswith('coingecko') else self.primary_source
+        if weight is None:
+            weight = self.REQUEST_WEIGHTS.get(method, 1)
+        self.rate_limiters[source].consume(weight)
+    
+    def _call_with_backoff(self, method: str, func, *args, weight: Optional[int] = None,
+                           **kwargs):
         """
-        current_time = time.time()
-        last_time = self.last_request_time.get(source, 0)
+        Call an exchange method under the token bucket, backing off on HTTP 429
+        
+        While the circuit breaker is open the call fails immediately with
+        CircuitOpenError (a ccxt.NetworkError), so callers take their
+        network-failure path, e.g. the CoinGecko backup for OHLCV.
         
-        time_since_last = current_time - last_time
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            time.sleep(sleep_time)
+        Args:
+            method: Request type (key of REQUEST_WEIGHTS)
+            func: Exchange method to call
+            weight: Explicit request weight (optional)
         
-        self.last_request_time[source] = time.time()
+        Returns:
+            Result of func
+        """
+        if time.monotonic() < self._breaker['open_until']:
+            raise CircuitOpenError(f"{self.primary_source} circuit open, skipping {method}")
+        
+        bucket = self.rate_limiters[self.primary_source]
+        
+        for attempt in range(self.max_retries + 1):
+            self._consume(method, weight)
+            try:
+                result = func(*args, **kwargs)
+            except (ccxt.DDoSProtection, ccxt.RateLimitExceeded) as e:
+                if attempt == self.max_retries:
+                    self._record_primary_failure()
+                    raise
+                bucket.penalize()
+                delay = 2 ** attempt
+                self.logger.warning(f"Rate limited on {method}, retrying in {delay}s: {e}")
+                time.sleep(delay)
+                continue
+            except ccxt.NetworkError:
+                self._record_primary_failure()
+                raise
+            
+            bucket.recover()
+            self._breaker['fails'] = 0
+            return result
+    
+    def _record_primary_failure(self):
+        """Count a primary-exchange network failure and open the breaker at the threshold"""
+        self._breaker['fails'] += 1
+        if self._breaker['fails'] >= self.breaker_threshold:
+            self._breaker['open_until'] = time.monotonic() + self.breaker_cooldown
+            self._breaker['fails'] = 0
+            self.logger.warning(
+                f"{self.primary_source} failed {self.breaker_threshold} times in a row, "
+                f"routing to backup for {self.breaker_cooldown}s"
+            )
+    
+    @staticmethod
+    def _tickers_weight(count: int) -> int:
+        """Binance 24hr ticker endpoint weight for a given number of symbols"""
+        if count <= 20:
+            return 2
+        if count <= 100:
+            return 40
+        return 80
+    
+    @staticmethod
+    def _order_book_weight(limit: int) -> int:
+        """Binance depth endpoint weight for a given limit"""
+        if limit <= 100:
+            return 5
+        if limit <= 500:
+            return 25
+        if limit <= 1000:
+            return 50
+        return 250
     
     def fetch_ohlcv(self, symbol: str, timeframe: str = '15m', 
                     limit: int = 500) -> Optional[pd.DataFrame]:
@@ -93,41 +425,335 @@ class DataFetcher:
         Returns:
             DataFrame with OHLCV data or None
         """
+        # The cached frame's last candle may still have been forming, so it is
+        # never served as-is; only the candles from its last row on are fetched
+        cache_key, previous = self._read_ohlcv_cache(symbol, timeframe, limit)
+        
         try:
-            self._rate_limit(self.primary_source)
-            
             if self.exchange is None:
                 raise Exception("Exchange not initialized")
             
-            # Fetch OHLCV data
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            if self._can_extend(previous, timeframe, limit):
+                df = self._fetch_ohlcv_since(symbol, timeframe, previous)
+            else:
+                # Fetch OHLCV data
+                ohlcv = self._call_with_backoff('fetch_ohlcv', self.exchange.fetch_ohlcv,
+                                                symbol, timeframe, limit=limit)
+                df = self._build_ohlcv_dataframe(ohlcv, symbol, timeframe)
             
-            if not ohlcv:
-                self.logger.warning(f"No OHLCV data returned for {symbol}")
-                return None
+        except ccxt.NetworkError as e:
+            self.logger.error(f"Network error fetching OHLCV for {symbol}: {e}")
+            return self._fetch_ohlcv_backup(symbol, timeframe, limit)
+        except ccxt.ExchangeError as e:
+            self.logger.error(f"Exchange error fetching OHLCV for {symbol}: {e}")
+            self._invalidate_markets_cache()
+            return None
+        except Exception as e:
+            self.logger.error(f"Unexpected error fetching OHLCV for {symbol}: {e}")
+            return None
+        
+        self._write_ohlcv_cache(cache_key, df, symbol)
+        return df
+    
+    def fetch_ohlcv_arrow(self, symbol: str, timeframe: str = '15m',
+                          limit: int = 500):
+        """
+        Fetch OHLCV data as a columnar Arrow table and persist it as Parquet
+        
+        Indicator code can then read single columns without going through
+        pandas, e.g. table.column('close').to_numpy().
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            limit: Number of candles to fetch
+        
+        Returns:
+            pyarrow.Table with a 'timestamp' column plus OHLCV columns, or None
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow/Parquet OHLCV output")
+        
+        df = self.fetch_ohlcv(symbol, timeframe, limit)
+        if df is None:
+            return None
+        
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        
+        path = self._parquet_path(symbol, timeframe, limit)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pq.write_table(table, path, compression='zstd')
+        except OSError as e:
+            self.logger.warning(f"Could not write Parquet cache for {symbol}: {e}")
+        
+        return table
+    
+    def read_ohlcv_parquet(self, symbol: str, timeframe: str = '15m',
+                           limit: int = 500):
+        """
+        Read the last Parquet snapshot written by fetch_ohlcv_arrow()
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            limit: Number of candles
+        
+        Returns:
+            pyarrow.Table or None if no snapshot exists
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow/Parquet OHLCV output")
+        
+        path = self._parquet_path(symbol, timeframe, limit)
+        if not os.path.exists(path):
+            return None
+        return pq.read_table(path)
+    
+    def _parquet_path(self, symbol: str, timeframe: str, limit: int) -> str:
+        """Parquet snapshot path next to the pickle cache"""
+        return os.path.join(self.cache.cache_dir, FileCache._safe(symbol),
+                            f"{timeframe}_{limit}.parquet")
+    
+    def fetch_ohlcv_incremental(self, symbol: str, timeframe: str,
+                                existing_df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Extend an OHLCV DataFrame with the candles published since its last row
+        
+        The last existing candle may still have been open when it was fetched,
+        so it is pulled again; the result keeps the original number of rows.
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            existing_df: Previously fetched OHLCV DataFrame
+        
+        Returns:
+            Updated DataFrame with OHLCV data or None
+        """
+        if existing_df is None or existing_df.empty:
+            return self.fetch_ohlcv(symbol, timeframe)
+        
+        try:
+            if self.exchange is None:
+                raise Exception("Exchange not initialized")
             
-            # Convert to DataFrame
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            return self._fetch_ohlcv_since(symbol, timeframe, existing_df)
             
-            # Validate data
-            if not self._validate_ohlcv(df):
-                self.logger.warning(f"OHLCV data validation failed for {symbol}")
-                return None
+        except Exception as e:
+            self.logger.error(f"Error updating OHLCV for {symbol}: {e}")
+            return None
+    
+    def _fetch_ohlcv_since(self, symbol: str, timeframe: str,
+                           existing_df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Fetch candles from the last row of existing_df onwards and merge them in"""
+        since = existing_df.index[-1].value // 1_000_000  # ns -> ms
+        ohlcv = self._call_with_backoff('fetch_ohlcv', self.exchange.fetch_ohlcv,
+                                        symbol, timeframe, since=since, limit=len(existing_df))
+        return self._merge_ohlcv(existing_df, ohlcv, symbol, timeframe)
+    
+    def _merge_ohlcv(self, existing_df: pd.DataFrame, ohlcv: List[List], symbol: str,
+                     timeframe: str) -> Optional[pd.DataFrame]:
+        """Replace the last row of existing_df with candles fetched from its timestamp on"""
+        new_df = self._build_ohlcv_dataframe(ohlcv, symbol, timeframe)
+        if new_df is None:
+            return None
+        
+        df = pd.concat([existing_df.iloc[:-1], new_df])
+        df = df[~df.index.duplicated(keep='last')]
+        
+        self.logger.debug(f"Appended {len(new_df)} candles for {symbol} ({timeframe})")
+        return df.iloc[-len(existing_df):]
+    
+    @staticmethod
+    def _can_extend(previous: Optional[pd.DataFrame], timeframe: str, limit: int) -> bool:
+        """Whether a cached frame is recent enough to be extended instead of refetched"""
+        if previous is None or len(previous) != limit:
+            return False
+        
+        # Frames cached before the index became UTC-aware cannot be merged
+        if getattr(previous.index, 'tz', None) is None:
+            return False
+        
+        timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        age_ms = time.time() * 1000 - previous.index[-1].value // 1_000_000
+        return age_ms < timeframe_ms * limit
+    
+    async def _fetch_ohlcv_async(self, exchange, symbol: str, timeframe: str,
+                                 limit: int) -> Optional[pd.DataFrame]:
+        """
+        Fetch OHLCV data through an async exchange instance
+        
+        Args:
+            exchange: ccxt.async_support exchange instance
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            limit: Number of candles to fetch
+        
+        Returns:
+            DataFrame with OHLCV data or None
+        """
+        cache_key, previous = self._read_ohlcv_cache(symbol, timeframe, limit)
+        
+        try:
+            if time.monotonic() < self._breaker['open_until']:
+                raise CircuitOpenError(f"{self.primary_source} circuit open, skipping fetch_ohlcv")
             
-            self.logger.debug(f"Fetched {len(df)} candles for {symbol} ({timeframe})")
-            return df
+            wait = self.rate_limiters[self.primary_source].reserve(self.REQUEST_WEIGHTS['fetch_ohlcv'])
+            if wait > 0:
+                await asyncio.sleep(wait)
+            
+            if self._can_extend(previous, timeframe, limit):
+                since = previous.index[-1].value // 1_000_000  # ns -> ms
+                ohlcv = await exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+                self._breaker['fails'] = 0
+                df = self._merge_ohlcv(previous, ohlcv, symbol, timeframe)
+            else:
+                ohlcv = await exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+                self._breaker['fails'] = 0
+                df = self._build_ohlcv_dataframe(ohlcv, symbol, timeframe)
             
         except ccxt.NetworkError as e:
+            if not isinstance(e, CircuitOpenError):
+                self._record_primary_failure()
             self.logger.error(f"Network error fetching OHLCV for {symbol}: {e}")
-            return self._fetch_ohlcv_backup(symbol, timeframe, limit)
+            return await asyncio.to_thread(self._fetch_ohlcv_backup, symbol, timeframe, limit)
         except ccxt.ExchangeError as e:
             self.logger.error(f"Exchange error fetching OHLCV for {symbol}: {e}")
             return None
         except Exception as e:
             self.logger.error(f"Unexpected error fetching OHLCV for {symbol}: {e}")
             return None
+        
+        self._write_ohlcv_cache(cache_key, df, symbol)
+        return df
+    
+    def _build_ohlcv_dataframe(self, ohlcv: List[List], symbol: str,
+                               timeframe: str) -> Optional[pd.DataFrame]:
+        """
+        Convert raw exchange candles into a validated OHLCV DataFrame
+        
+        Args:
+            ohlcv: List of [timestamp, open, high, low, close, volume] rows
+            symbol: Trading pair
+            timeframe: Candle timeframe
+        
+        Returns:
+            DataFrame with OHLCV data or None
+        """
+        if not ohlcv:
+            self.logger.warning(f"No OHLCV data returned for {symbol}")
+            return None
+        
+        # Convert to DataFrame from pre-typed column slices
+        arr = np.asarray(ohlcv, dtype=np.float64)
+        index = self._ms_to_index(arr[:, 0])
+        df = pd.DataFrame({
+            'open': arr[:, 1].astype(self.price_dtype),
+            'high': arr[:, 2].astype(self.price_dtype),
+            'low': arr[:, 3].astype(self.price_dtype),
+            'close': arr[:, 4].astype(self.price_dtype),
+            'volume': arr[:, 5]
+        }, index=index)
+        
+        # Validate data
+        if not self._validate_ohlcv(df):
+            self.logger.warning(f"OHLCV data validation failed for {symbol}")
+            return None
+        
+        self.logger.debug(f"Fetched {len(df)} candles for {symbol} ({timeframe})")
+        return df
+    
+    @staticmethod
+    def _ms_to_index(timestamps_ms: np.ndarray) -> pd.DatetimeIndex:
+        """Build a UTC 'timestamp' index from epoch milliseconds with one int64 multiply"""
+        ns = timestamps_ms.astype(np.int64) * 1_000_000
+        return pd.DatetimeIndex(ns.view('datetime64[ns]'), name='timestamp').tz_localize('UTC')
+    
+    def _ohlcv_cache_key(self, symbol: str, timeframe: str, limit: int) -> Tuple[Tuple, float]:
+        """
+        Build the OHLCV cache key for the current candle interval
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            limit: Number of candles
+        
+        Returns:
+            Tuple of (cache key, TTL in seconds)
+        """
+        timeframe_seconds = ccxt.Exchange.parse_timeframe(timeframe)
+        bucket = int(time.time() // timeframe_seconds)
+        ttl = self.cache_ttl if self.cache_ttl is not None else timeframe_seconds
+        return (symbol, timeframe, limit, bucket), ttl
+    
+    def _read_ohlcv_cache(self, symbol: str, timeframe: str, limit: int) -> Tuple:
+        """
+        Look up the base frame for an OHLCV fetch; cache failures only log a warning
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            limit: Number of candles
+        
+        Returns:
+            Tuple of (cache key or None, frame of this candle interval, else the
+            newest frame of an earlier one, or None)
+        """
+        if not self.use_cache:
+            return None, None
+        
+        cache_key = None
+        try:
+            cache_key, cache_ttl = self._ohlcv_cache_key(symbol, timeframe, limit)
+            cached = self.cache.get(cache_key, ttl=cache_ttl)
+            if cached is None:
+                cached = self.cache.latest(cache_key)
+            return cache_key, cached
+        except Exception as e:
+            self.logger.warning(f"Could not read OHLCV cache for {symbol}: {e}")
+            return cache_key, None
+    
+    def _write_ohlcv_cache(self, cache_key: Optional[Tuple], df: Optional[pd.DataFrame], symbol: str):
+        """
+        Store a fetched frame in the disk cache; failures only log a warning
+        
+        Args:
+            cache_key: Key from _read_ohlcv_cache (None skips the write)
+            df: Fetched OHLCV data
+            symbol: Trading pair
+        """
+        if cache_key is None or df is None:
+            return
+        try:
+            self.cache.set(cache_key, df)
+        except Exception as e:
+            self.logger.warning(f"Could not write OHLCV cache for {symbol}: {e}")
+    
+    def _create_async_exchange(self):
+        """
+        Create an async twin of the primary exchange
+        
+        Markets already loaded by the sync client are shared so the async
+        instance does not repeat the metadata round-trip.
+        
+        Returns:
+            ccxt.async_support exchange instance
+        """
+        exchange_class = getattr(ccxt_async, self.primary_source.lower())
+        exchange = exchange_class({
+            'enableRateLimit': self.builtin_rate_limit,
+            'options': {
+                'defaultType': 'spot'
+            }
+        })
+        if not self.builtin_rate_limit:
+            exchange.rateLimit = 50
+        
+        if self.exchange is not None and self.exchange.markets:
+            exchange.set_markets(self.exchange.markets, self.exchange.currencies)
+        
+        return exchange
     
     def _fetch_ohlcv_backup(self, symbol: str, timeframe: str, limit: int) -> Optional[pd.DataFrame]:
         """
@@ -158,26 +784,27 @@ class DataFetcher:
                 'interval': 'hourly' if timeframe in ['1h', '4h'] else 'daily'
             }
             
-            self._rate_limit('coingecko')
-            response = requests.get(url, params=params, timeout=10)
+            self._consume('coingecko')
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = _json_loads(response.content)
             prices = data.get('prices', [])
             
             if not prices:
                 return None
             
-            # Convert to DataFrame
-            df = pd.DataFrame(prices, columns=['timestamp', 'close'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            
-            # For simplified OHLCV, use close price
-            df['open'] = df['close']
-            df['high'] = df['close']
-            df['low'] = df['close']
-            df['volume'] = 0  # Volume not available in simple endpoint
+            # Convert to DataFrame (simplified OHLCV: every price column is the close)
+            arr = np.asarray(prices, dtype=np.float64)
+            index = self._ms_to_index(arr[:, 0])
+            close = arr[:, 1].astype(self.price_dtype)
+            df = pd.DataFrame({
+                'close': close,
+                'open': close,
+                'high': close,
+                'low': close,
+                'volume': np.zeros(len(close))  # Volume not available in simple endpoint
+            }, index=index)
             
             self.logger.info(f"Successfully fetched {len(df)} candles from backup source")
             return df
@@ -190,23 +817,31 @@ class DataFetcher:
         """
         Fetch current market price
         
+        Served from the background poller when its price is fresh; otherwise
+        fetched inline and the symbol is added to the poller's watch list.
+        
         Args:
             symbol: Trading pair
         
         Returns:
             Current price or None
         """
+        cached = self._price_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[1] < self.poll_interval * 2:
+            return cached[0]
+        
         try:
-            self._rate_limit(self.primary_source)
-            
             if self.exchange is None:
                 raise Exception("Exchange not initialized")
             
-            ticker = self.exchange.fetch_ticker(symbol)
+            ticker = self._call_with_backoff('fetch_ticker', self.exchange.fetch_ticker, symbol)
             price = ticker.get('last') or ticker.get('close')
             
             if price:
                 self.logger.debug(f"Current price for {symbol}: {price}")
+                self._price_cache[symbol] = (float(price), time.monotonic())
+                self._watched.add(symbol)
+                self._start_price_poller()
                 return float(price)
             
             return None
@@ -215,6 +850,46 @@ class DataFetcher:
             self.logger.error(f"Error fetching current price for {symbol}: {e}")
             return None
     
+    def fetch_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Fetch current prices for several symbols with one batched request
+        
+        A single 24hr-ticker call costs Binance weight 2 for up to 20 symbols
+        (the same as one fetch_current_price call) and 40 for up to 100, so
+        batching wins from 2 symbols on round-trips and stays cheaper in
+        weight below ~20 symbols per batch.
+        
+        Args:
+            symbols: List of trading pairs
+        
+        Returns:
+            Dictionary mapping symbols to prices (missing symbols omitted)
+        """
+        if not symbols:
+            return {}
+        
+        try:
+            if self.exchange is None:
+                raise Exception("Exchange not initialized")
+            
+            tickers = self._call_with_backoff('fetch_tickers', self.exchange.fetch_tickers,
+                                              list(symbols), weight=self._tickers_weight(len(symbols)))
+            
+            prices = {}
+            now = time.monotonic()
+            for symbol in symbols:
+                ticker = tickers.get(symbol)
+                price = (ticker.get('last') or ticker.get('close')) if ticker else None
+                if price:
+                    prices[symbol] = float(price)
+                    self._price_cache[symbol] = (float(price), now)
+            
+            return prices
+            
+        except Exception as e:
+            self.logger.error(f"Error fetching prices for {symbols}: {e}")
+            return {}
+    
     def fetch_ticker_info(self, symbol: str) -> Optional[Dict]:
         """
         Fetch comprehensive ticker information
@@ -226,12 +901,10 @@ class DataFetcher:
             Dictionary with ticker data or None
         """
         try:
-            self._rate_limit(self.primary_source)
-            
             if self.exchange is None:
                 raise Exception("Exchange not initialized")
             
-            ticker = self.exchange.fetch_ticker(symbol)
+            ticker = self._call_with_backoff('fetch_ticker', self.exchange.fetch_ticker, symbol)
             
             return {
                 'symbol': symbol,
@@ -250,29 +923,39 @@ class DataFetcher:
             self.logger.error(f"Error fetching ticker info for {symbol}: {e}")
             return None
     
-    def fetch_order_book(self, symbol: str, limit: int = 20) -> Optional[Dict]:
+    def fetch_order_book(self, symbol: str, limit: int = 20,
+                         as_numpy: bool = False) -> Optional[Dict]:
         """
         Fetch order book data
         
         Args:
             symbol: Trading pair
             limit: Number of orders to fetch per side
+            as_numpy: Return bids/asks as float64 arrays of shape (n, 2)
+                ([price, amount] rows) instead of lists
         
         Returns:
             Dictionary with bids and asks or None
         """
         try:
-            self._rate_limit(self.primary_source)
-            
             if self.exchange is None:
                 raise Exception("Exchange not initialized")
             
-            order_book = self.exchange.fetch_order_book(symbol, limit=limit)
+            order_book = self._call_with_backoff('fetch_order_book', self.exchange.fetch_order_book,
+                                                 symbol, limit=limit,
+                                                 weight=self._order_book_weight(limit))
+            
+            # The exchange already honours limit, so no re-slicing is needed
+            bids = order_book['bids']
+            asks = order_book['asks']
+            if as_numpy:
+                bids = self._book_side_to_array(bids)
+                asks = self._book_side_to_array(asks)
             
             return {
                 'symbol': symbol,
-                'bids': order_book['bids'][:limit],
-                'asks': order_book['asks'][:limit],
+                'bids': bids,
+                'asks': asks,
                 'timestamp': order_book.get('timestamp')
             }
             
@@ -280,32 +963,128 @@ class DataFetcher:
             self.logger.error(f"Error fetching order book for {symbol}: {e}")
             return None
     
+    @staticmethod
+    def _book_side_to_array(levels: List[List[float]]) -> np.ndarray:
+        """Convert order-book levels to a float64 (n, 2) [price, amount] array"""
+        arr = np.asarray(levels, dtype=np.float64)
+        if arr.ndim != 2:
+            return np.empty((0, 2), dtype=np.float64)
+        return arr[:, :2]
+    
     def fetch_multiple_symbols(self, symbols: List[str], timeframe: str = '15m',
-                              limit: int = 500) -> Dict[str, pd.DataFrame]:
+                              limit: int = 500, use_threads: Optional[bool] = None,
+                              max_workers: int = 8) -> Dict[str, pd.DataFrame]:
         """
         Fetch OHLCV data for multiple symbols
         
+        Synchronous entry point: runs fetch_multiple_symbols_async() under
+        asyncio.run(), or fans out fetch_ohlcv() over a thread pool when
+        use_threads is set. With use_threads=None, threads are used when the
+        caller is already inside a running event loop (e.g. a Telegram
+        handler), where asyncio.run() is not allowed.
+        
         Args:
             symbols: List of trading pairs
             timeframe: Candle timeframe
             limit: Number of candles per symbol
+            use_threads: Force (True) or disable (False) the thread pool path
+            max_workers: Maximum worker threads for the thread pool path
+        
+        Returns:
+            Dictionary mapping symbols to DataFrames
+        """
+        if use_threads is None:
+            try:
+                asyncio.get_running_loop()
+                use_threads = True
+            except RuntimeError:
+                use_threads = False
+        
+        if use_threads:
+            return self._fetch_multiple_symbols_threaded(symbols, timeframe, limit, max_workers)
+        
+        return asyncio.run(self.fetch_multiple_symbols_async(symbols, timeframe, limit))
+    
+    def _fetch_multiple_symbols_threaded(self, symbols: List[str], timeframe: str,
+                                         limit: int, max_workers: int) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLCV data for multiple symbols on a thread pool
+        
+        The sync ccxt client releases the GIL during network I/O, so requests
+        overlap; the shared token bucket keeps them within the weight budget.
+        
+        Args:
+            symbols: List of trading pairs
+            timeframe: Candle timeframe
+            limit: Number of candles per symbol
+            max_workers: Maximum worker threads
         
         Returns:
             Dictionary mapping symbols to DataFrames
         """
         results = {}
+        if not symbols:
+            return results
         
-        for symbol in symbols:
-            self.logger.info(f"Fetching data for {symbol}...")
-            df = self.fetch_ohlcv(symbol, timeframe, limit)
-            
-            if df is not None:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as executor:
+            futures = {
+                executor.submit(self.fetch_ohlcv, symbol, timeframe, limit): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    df = future.result()
+                except Exception as e:
+                    self.logger.warning(f"Failed to fetch data for {symbol}: {e}")
+                    continue
+                
+                if df is not None:
+                    results[symbol] = df
+                else:
+                    self.logger.warning(f"Failed to fetch data for {symbol}")
+        
+        # Keep the caller's symbol order
+        results = {symbol: results[symbol] for symbol in symbols if symbol in results}
+        
+        self.logger.info(f"Successfully fetched data for {len(results)}/{len(symbols)} symbols")
+        return results
+    
+    async def fetch_multiple_symbols_async(self, symbols: List[str], timeframe: str = '15m',
+                                           limit: int = 500) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLCV data for multiple symbols concurrently
+        
+        Requests overlap on a single async exchange; the shared token bucket
+        keeps the burst within the exchange weight budget.
+        
+        Args:
+            symbols: List of trading pairs
+            timeframe: Candle timeframe
+            limit: Number of candles per symbol
+        
+        Returns:
+            Dictionary mapping symbols to DataFrames
+        """
+        results = {}
+        
+        exchange = self._create_async_exchange()
+        try:
+            tasks = [
+                asyncio.create_task(self._fetch_ohlcv_async(exchange, symbol, timeframe, limit))
+                for symbol in symbols
+            ]
+            dataframes = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            await exchange.close()
+        
+        for symbol, df in zip(symbols, dataframes):
+            if isinstance(df, Exception):
+                self.logger.warning(f"Failed to fetch data for {symbol}: {df}")
+            elif df is not None:
                 results[symbol] = df
             else:
                 self.logger.warning(f"Failed to fetch data for {symbol}")
-            
-            # Small delay between requests
-            time.sleep(0.5)
         
         self.logger.info(f"Successfully fetched data for {len(results)}/{len(symbols)} symbols")
         return results
@@ -328,33 +1107,39 @@ class DataFetcher:
         if not all(col in df.columns for col in required_columns):
             return False
         
+        # Single contiguous float64 view; each check exits early on failure
+        arr = df[required_columns].to_numpy(dtype=np.float64, copy=False)
+        o, h, l, c, v = arr.T
+        
         # Check for null values
-        if df[required_columns].isnull().any().any():
+        if np.isnan(arr).any():
             self.logger.warning("OHLCV data contains null values")
             return False
         
         # Check for negative values
-        if (df[required_columns] < 0).any().any():
+        if (arr < 0).any():
             self.logger.warning("OHLCV data contains negative values")
             return False
         
         # Check high >= low
-        if (df['high'] < df['low']).any():
+        if (h < l).any():
             self.logger.warning("OHLCV data has high < low")
             return False
         
         # Check high >= open, close and low <= open, close
-        if not ((df['high'] >= df['open']).all() and (df['high'] >= df['close']).all()):
+        if not (np.maximum(o, c) <= h).all():
             self.logger.warning("OHLCV data has invalid high prices")
             return False
         
-        if not ((df['low'] <= df['open']).all() and (df['low'] <= df['close']).all()):
+        if not (np.minimum(o, c) >= l).all():
             self.logger.warning("OHLCV data has invalid low prices")
             return False
         
         return True
     
-    def _symbol_to_coingecko_id(self, symbol: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _symbol_to_coingecko_id(symbol: str) -> str:
         """
         Convert trading pair to CoinGecko coin ID
         
@@ -364,24 +1149,12 @@ class DataFetcher:
         Returns:
             CoinGecko coin ID
         """
-        # Simple mapping (expand as needed)
-        mapping = {
-            'BTC': 'bitcoin',
-            'ETH': 'ethereum',
-            'BNB': 'binancecoin',
-            'SOL': 'solana',
-            'ADA': 'cardano',
-            'XRP': 'ripple',
-            'DOT': 'polkadot',
-            'DOGE': 'dogecoin',
-            'MATIC': 'matic-network',
-            'AVAX': 'avalanche-2'
-        }
-        
         base = symbol.split('/')[0]
-        return mapping.get(base, base.lower())
+        return DataFetcher._COINGECKO_IDS.get(base, base.lower())
     
-    def _calculate_days_from_timeframe(self, timeframe: str, limit: int) -> int:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _calculate_days_from_timeframe(timeframe: str, limit: int) -> int:
         """
         Calculate number of days based on timeframe and limit
         
@@ -392,18 +1165,255 @@ class DataFetcher:
         Returns:
             Number of days
         """
-        timeframe_minutes = {
-            '1m': 1, '5m': 5, '15m': 15, '30m': 30,
-            '1h': 60, '4h': 240, '1d': 1440
-        }
-        
-        minutes = timeframe_minutes.get(timeframe, 15)
+        minutes = DataFetcher._TIMEFRAME_MINUTES.get(timeframe, 15)
         total_minutes = minutes * limit
         days = max(1, total_minutes // 1440)
         
         return min(days, 365)  # CoinGecko max is 365 days
 
 
+class WebSocketDataFetcher(DataFetcher):
+    """
+    Data fetcher that serves live prices and order books from WebSocket streams
+    
+    Each subscribed symbol gets ticker and order-book watchers (ccxt.pro) on a
+    background event loop. fetch_current_price() and fetch_order_book() read
+    the latest pushed values; historical OHLCV still comes over REST.
+    """
+    
+    # Stream error handling: exponential reconnect delay and log throttling (seconds)
+    RETRY_MIN = 1.0
+    RETRY_MAX = 60.0
+    WARNING_INTERVAL = 60.0
+    
+    def __init__(self, *args, symbols: Optional[List[str]] = None,
+                 order_book_limit: int = 20, stale_after: float = 5.0, **kwargs):
+        """
+        Initialize WebSocket data fetcher
+        
+        Args:
+            symbols: Trading pairs to subscribe to immediately (optional)
+            order_book_limit: Depth kept for streamed order books
+            stale_after: Seconds after which a streamed value falls back to REST
+            *args, **kwargs: Passed to DataFetcher
+        """
+        if not CCXTPRO_AVAILABLE:
+            raise ImportError("ccxt.pro is required for WebSocket streaming (ccxt>=4)")
+        
+        super().__init__(*args, **kwargs)
+        
+        self.order_book_limit = order_book_limit
+        self.stale_after = stale_after
+        
+        # symbol -> (order book dict, monotonic timestamp)
+        self._books: Dict[str, Tuple[Dict, float]] = {}
+        self._subscribed: set = set()
+        
+        self.ws = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws_thread: Optional[threading.Thread] = None
+        self._stream_retry_at = 0.0  # monotonic time before which a failed client start isn't retried
+        
+        try:
+            for symbol in symbols or []:
+                self.subscribe(symbol)
+        except Exception:
+            self.close()
+            raise
+    
+    def _start_price_poller(self):
+        """Streams replace REST polling"""
+        pass
+    
+    def _ensure_stream_loop(self):
+        """Start the background event loop and WebSocket client if needed"""
+        if self._ws_thread is not None:
+            return
+        
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name='ws-streams', daemon=True)
+        thread.start()
+        
+        async def create_client():
+            exchange_class = getattr(ccxtpro, self.primary_source.lower())
+            ws = exchange_class({'enableRateLimit': True, 'options': {'defaultType': 'spot'}})
+            if self.exchange is not None and self.exchange.markets:
+                ws.set_markets(self.exchange.markets, self.exchange.currencies)
+            return ws
+        
+        try:
+            self.ws = asyncio.run_coroutine_threadsafe(create_client(), loop).result()
+        except Exception:
+            # Leave no half-started loop behind so the next subscribe() can retry
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+            raise
+        
+        self._loop = loop
+        self._ws_thread = thread
+    
+    def subscribe(self, symbol: str):
+        """
+        Start streaming ticker and order-book updates for a symbol
+        
+        Args:
+            symbol: Trading pair
+        """
+        if symbol in self._subscribed or time.monotonic() < self._stream_retry_at:
+            return
+        
+        try:
+            self._ensure_stream_loop()
+        except Exception:
+            self._stream_retry_at = time.monotonic() + self.RETRY_MAX
+            raise
+        self._subscribed.add(symbol)
+        asyncio.run_coroutine_threadsafe(self._watch_ticker(symbol), self._loop)
+        asyncio.run_coroutine_threadsafe(self._watch_order_book(symbol), self._loop)
+        self.logger.info(f"Subscribed to WebSocket streams for {symbol}")
+    
+    def _subscribe_or_rest(self, symbol: str):
+        """Subscribe to a symbol's streams; on failure the caller falls back to REST"""
+        try:
+            self.subscribe(symbol)
+        except Exception as e:
+            self.logger.warning(f"WebSocket streams unavailable for {symbol}, using REST: {e}")
+    
+    async def _watch(self, stream: str, symbol: str, receive):
+        """
+        Run a stream watcher until close(), backing off exponentially on errors
+        
+        Stale streamed values fall back to REST meanwhile, so after the first
+        warning further errors are only logged once per WARNING_INTERVAL.
+        
+        Args:
+            stream: Stream name for log messages
+            symbol: Trading pair
+            receive: Coroutine function that awaits and stores one update
+        """
+        if self.ws is None:
+            self.logger.error(f"No WebSocket client, not streaming {stream.lower()} for {symbol}")
+            return
+        
+        delay = 0.0
+        last_warning = float('-inf')
+        while not self._stop_polling.is_set():
+            try:
+                await receive()
+                delay = 0.0
+            except Exception as e:
+                delay = min(self.RETRY_MAX, delay * 2 or self.RETRY_MIN)
+                now = time.monotonic()
+                if now - last_warning >= self.WARNING_INTERVAL:
+                    last_warning = now
+                    self.logger.warning(f"{stream} stream error for {symbol}: {e} (retrying in {delay:g}s)")
+                else:
+                    self.logger.debug(f"{stream} stream error for {symbol}: {e}")
+                await asyncio.sleep(delay)
+    
+    async def _watch_ticker(self, symbol: str):
+        """Keep the price cache updated from the ticker stream"""
+        async def receive():
+            ticker = await self.ws.watch_ticker(symbol)
+            price = ticker.get('last') or ticker.get('close')
+            if price:
+                self._price_cache[symbol] = (float(price), time.monotonic())
+        
+        await self._watch('Ticker', symbol, receive)
+    
+    async def _watch_order_book(self, symbol: str):
+        """Keep a live order book from the depth stream"""
+        async def receive():
+            book = await self.ws.watch_order_book(symbol, self.order_book_limit)
+            self._books[symbol] = ({
+                'symbol': symbol,
+                'bids': book['bids'][:self.order_book_limit],
+                'asks': book['asks'][:self.order_book_limit],
+                'timestamp': book.get('timestamp')
+            }, time.monotonic())
+        
+        await self._watch('Order book', symbol, receive)
+    
+    def fetch_current_price(self, symbol: str) -> Optional[float]:
+        """
+        Get the latest streamed price, falling back to REST when stale
+        
+        Args:
+            symbol: Trading pair
+        
+        Returns:
+            Current price or None
+        """
+        self._subscribe_or_rest(symbol)
+        
+        cached = self._price_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[1] < self.stale_after:
+            return cached[0]
+        
+        return super().fetch_current_price(symbol)
+    
+    def fetch_order_book(self, symbol: str, limit: int = 20,
+                         as_numpy: bool = False) -> Optional[Dict]:
+        """
+        Get the latest streamed order book, falling back to REST when stale
+        
+        Args:
+            symbol: Trading pair
+            limit: Number of orders per side
+            as_numpy: Return bids/asks as float64 (n, 2) arrays
+        
+        Returns:
+            Dictionary with bids and asks or None
+        """
+        self._subscribe_or_rest(symbol)
+        
+        cached = self._books.get(symbol)
+        if (cached is not None and limit <= self.order_book_limit
+                and time.monotonic() - cached[1] < self.stale_after):
+            book = cached[0]
+            bids = book['bids'][:limit]
+            asks = book['asks'][:limit]
+            if as_numpy:
+                bids = self._book_side_to_array(bids)
+                asks = self._book_side_to_array(asks)
+            return {
+                'symbol': symbol,
+                'bids': bids,
+                'asks': asks,
+                'timestamp': book['timestamp']
+            }
+        
+        return super().fetch_order_book(symbol, limit, as_numpy)
+    
+    def close(self):
+        """Close WebSocket streams, stop the event loop and release REST resources"""
+        self._stop_polling.set()
+        
+        if self._loop is not None:
+            async def shutdown():
+                tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                if self.ws is not None:
+                    await self.ws.close()
+                # DNS lookups of reconnect attempts run on the loop's default executor
+                await asyncio.get_running_loop().shutdown_default_executor()
+            
+            try:
+                asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=5)
+            except Exception as e:
+                self.logger.warning(f"Error closing WebSocket client: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._ws_thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._ws_thread = None
+        
+        super().close()
+
+
 if __name__ == "__main__":
     # Test the data fetcher
     fetcher = DataFetcher(primary_source='binance')
@@ -1,12 +1,330 @@
 """
 Database Module - SQLite database for storing trades, signals, and historical data
 """
+import asyncio
 import sqlite3
+import functools
+import glob
 import json
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+import numbers
+import re
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Sequence, Tuple, Union
 import os
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import Future
 from contextlib import contextmanager
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+    _json_dumps = functools.partial(orjson.dumps,
+                                    option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Applied on every connection open; journal_mode=WAL is persistent and set on the writer
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+)
+
+# Compiled statements kept per pooled connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Converts ISO text written by older versions (naive local time) to epoch ms
+_SQL_ISO_TO_EPOCH_MS = (
+    "CASE WHEN {column} IS NULL OR {column} NOT GLOB '*[^0-9]*' THEN CAST({column} AS INTEGER) "
+    "ELSE CAST(ROUND((julianday({column}, 'utc') - 2440587.5) * 86400000) AS INTEGER) END"
+)
+
+# Selectable columns for get_trades/get_signals projections
+TRADE_COLUMNS = ('id', 'timestamp', 'symbol', 'action', 'price', 'amount', 'total_value',
+                 'commission', 'profit_loss', 'reason', 'status', 'order_id', 'metadata')
+SIGNAL_COLUMNS = ('id', 'timestamp', 'symbol', 'signal_type', 'price', 'strength',
+                  'indicators', 'executed', 'metadata')
+
+# Write statements are module constants so every call hits the connection's statement cache
+# Current time in epoch ms, evaluated by SQLite (unixepoch('subsec') needs 3.42+)
+_SQL_NOW_MS = "CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)"
+
+_SQL_INSERT_TRADE = f'''
+    INSERT INTO trades (timestamp, symbol, action, price, amount,
+                        total_value, commission, profit_loss, reason, order_id, metadata)
+    VALUES ({_SQL_NOW_MS}, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_INSERT_SIGNAL = f'''
+    INSERT INTO signals (timestamp, symbol, signal_type, price,
+                         strength, indicators, metadata)
+    VALUES ({_SQL_NOW_MS}, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_UPSERT_PORTFOLIO = f'''
+    INSERT INTO portfolio (symbol, amount, avg_buy_price, current_price, last_updated)
+    VALUES (?, ?, ?, ?, {_SQL_NOW_MS})
+    ON CONFLICT(symbol) DO UPDATE SET
+        amount = excluded.amount,
+        avg_buy_price = excluded.avg_buy_price,
+        current_price = excluded.current_price,
+        last_updated = excluded.last_updated
+'''
+_SQL_INSERT_BALANCE = f'''
+    INSERT INTO balance (timestamp, balance, equity, profit_loss, profit_loss_percent)
+    VALUES ({_SQL_NOW_MS}, ?, ?, ?, ?)
+'''
+_SQL_CREATE_MARKET_DATA = '''
+    CREATE TABLE IF NOT EXISTS market_data (
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        timestamp INTEGER NOT NULL,
+        open REAL NOT NULL,
+        high REAL NOT NULL,
+        low REAL NOT NULL,
+        close REAL NOT NULL,
+        volume REAL NOT NULL,
+        PRIMARY KEY (symbol, timeframe, timestamp)
+    ) WITHOUT ROWID
+'''
+_SQL_INSERT_MARKET_DATA = '''
+    INSERT OR IGNORE INTO market_data (timestamp, symbol, timeframe, open, high, low, close, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+class ConnectionPool:
+    """
+    One read-write connection plus a pool of read-only connections to a SQLite file
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize connection pool
+        
+        Args:
+            path: Path to SQLite database file
+        """
+        self.path = path
+        
+        # One shared writer, up to one reader per CPU
+        self._rw_conn = None
+        self._rw_lock = threading.Lock()
+        self._ro_pool = queue.Queue(maxsize=os.cpu_count() or 4)
+    
+    def _connect(self, readonly: bool = False) -> sqlite3.Connection:
+        """
+        Open a connection with the per-connection PRAGMAs applied
+        
+        Connections run in autocommit mode; connection() opens transactions
+        explicitly so writers can take the write lock up front.
+        
+        Args:
+            readonly: Open the file in read-only mode
+        """
+        if readonly:
+            conn = sqlite3.connect(f"{Path(self.path).resolve().as_uri()}?mode=ro", uri=True,
+                                   isolation_level=None, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+        else:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def connection(self, readonly: bool = False):
+        """
+        Context manager for pooled connections
+        
+        Writes share a single connection guarded by a lock; reads check a
+        connection out of the read-only pool so its page cache is reused.
+        
+        Args:
+            readonly: Use a read-only connection (reads never block in WAL mode)
+        """
+        if readonly:
+            try:
+                conn = self._ro_pool.get_nowait()
+            except queue.Empty:
+                conn = self._connect(readonly=True)
+            try:
+                yield conn
+            finally:
+                try:
+                    self._ro_pool.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+            return
+        
+        with self._rw_lock:
+            if self._rw_conn is None:
+                self._rw_conn = self._connect()
+                # WAL lets readers run alongside the writer; the mode is stored in the file
+                self._rw_conn.execute('PRAGMA journal_mode=WAL')
+            conn = self._rw_conn
+            
+            # Take the write lock now rather than upgrading mid-transaction,
+            # which can fail with SQLITE_BUSY
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                if conn.in_transaction:
+                    conn.commit()
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise e
+    
+    def close(self):
+        """Close all pooled connections"""
+        with self._rw_lock:
+            if self._rw_conn is not None:
+                self._rw_conn.close()
+                self._rw_conn = None
+        
+        while True:
+            try:
+                self._ro_pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class ArrowMarketDataStore:
+    """
+    Append-only columnar OHLCV store in Arrow IPC files
+    
+    Each write adds one file per (symbol, timeframe, UTC day) under
+    <root>/<SYMBOL>/<timeframe>/<YYYY-MM-DD>/, so reads are memory-mapped
+    column scans and retention drops whole day directories.
+    """
+    
+    def __init__(self, root: str):
+        """
+        Initialize Arrow store
+        
+        Args:
+            root: Directory holding the Arrow files
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for the Arrow market data store")
+        
+        self.root = root
+        self.schema = pa.schema([
+            ('timestamp', pa.int64()),
+            ('open', pa.float64()),
+            ('high', pa.float64()),
+            ('low', pa.float64()),
+            ('close', pa.float64()),
+            ('volume', pa.float64()),
+        ])
+    
+    def _series_dir(self, symbol: str, timeframe: str) -> str:
+        """Directory holding one symbol/timeframe series"""
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9]', '', symbol), timeframe)
+    
+    def write(self, rows: List[Tuple]) -> int:
+        """
+        Append OHLCV rows
+        
+        Args:
+            rows: Tuples of (timestamp_ms, symbol, timeframe, open, high, low, close, volume)
+        
+        Returns:
+            Number of rows written
+        """
+        groups = {}
+        for row in rows:
+            day = time.strftime('%Y-%m-%d', time.gmtime(row[0] / 1000))
+            groups.setdefault((row[1], row[2], day), []).append(row)
+        
+        for (symbol, timeframe, day), group in groups.items():
+            directory = os.path.join(self._series_dir(symbol, timeframe), day)
+            os.makedirs(directory, exist_ok=True)
+            
+            columns = list(zip(*group))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(columns[0], pa.int64())] +
+                [pa.array(column, pa.float64()) for column in columns[3:]],
+                schema=self.schema)
+            
+            # Dot-prefixed temp files are ignored by dataset discovery until renamed
+            name = f"part-{time.time_ns()}-{threading.get_ident()}.arrow"
+            tmp_path = os.path.join(directory, f".{name}.tmp")
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, self.schema) as writer:
+                    writer.write_batch(batch)
+            os.replace(tmp_path, os.path.join(directory, name))
+        
+        return len(rows)
+    
+    def read(self, symbol: str, timeframe: str, start_ms: int = None,
+             end_ms: int = None, limit: int = None) -> List[Dict]:
+        """
+        Read candles in ascending time order
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            start_ms: Earliest candle open time in epoch ms (optional)
+            end_ms: Latest candle open time in epoch ms (optional)
+            limit: Maximum number of records (optional)
+        
+        Returns:
+            List of candle records
+        """
+        directory = self._series_dir(symbol, timeframe)
+        if not os.path.isdir(directory):
+            return []
+        
+        condition = None
+        if start_ms is not None:
+            condition = ds.field('timestamp') >= start_ms
+        if end_ms is not None:
+            upper = ds.field('timestamp') <= end_ms
+            condition = upper if condition is None else condition & upper
+        
+        table = ds.dataset(directory, schema=self.schema, format='ipc').to_table(filter=condition)
+        if table.num_rows == 0:
+            return []
+        
+        # Files are append-only, so a re-ingested candle may appear twice; keep the latest write
+        timestamps = table.column('timestamp').to_numpy()
+        _, last = np.unique(timestamps[::-1], return_index=True)
+        table = table.take(pa.array(len(timestamps) - 1 - last))
+        
+        if limit is not None and limit >= 0:
+            table = table.slice(0, limit)
+        return table.to_pylist()
+    
+    def clear_before(self, cutoff_ms: int):
+        """
+        Drop whole days that end before the cutoff
+        
+        Args:
+            cutoff_ms: Epoch ms; days entirely older than this are removed
+        """
+        cutoff_day = time.strftime('%Y-%m-%d', time.gmtime(cutoff_ms / 1000))
+        for day_dir in glob.glob(os.path.join(glob.escape(self.root), '*', '*', '*')):
+            if os.path.basename(day_dir) < cutoff_day:
+                shutil.rmtree(day_dir, ignore_errors=True)
 
 
 class TradingDatabase:
@@ -14,34 +332,173 @@ class TradingDatabase:
     Database manager for the trading bot
     """
     
-    def __init__(self, db_path='data/trading_bot.db'):
+    def __init__(self, db_path='data/trading_bot.db', group_commit: bool = False,
+                 batch_size: int = 100, batch_window: float = 0.005,
+                 shard_market_data: bool = False, arrow_market_data: bool = False):
         """
         Initialize database connection
         
         Args:
             db_path: Path to SQLite database file
+            group_commit: Queue trade/signal inserts to a background writer that
+                commits them in batches (inserts then return Futures)
+            batch_size: Maximum inserts per group commit
+            batch_window: Seconds to wait for more inserts before committing
+            shard_market_data: Keep each symbol's candles in its own database file
+            arrow_market_data: Keep candles in append-only Arrow files under
+                <db dir>/md instead of SQLite (requires pyarrow)
         """
         self.db_path = db_path
         
         # Create data directory if it doesn't exist
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
+        self._pool = ConnectionPool(db_path)
+        
+        # Per-symbol market data files, keyed by path
+        self.shard_market_data = shard_market_data
+        self._shards: Dict[str, ConnectionPool] = {}
+        self._shards_lock = threading.Lock()
+        self._arrow_store = None
+        if arrow_market_data:
+            self._arrow_store = ArrowMarketDataStore(os.path.join(os.path.dirname(db_path), 'md'))
+        
         # Initialize database schema
         self._init_db()
+        
+        # Group-commit writer for high-frequency inserts
+        self.group_commit = group_commit
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._write_q = queue.Queue()
+        self._writer_thread = None
+        if group_commit:
+            self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer_thread.start()
     
     @contextmanager
-    def get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
+    def get_connection(self, readonly: bool = False):
+        """
+        Context manager for pooled database connections
+        
+        Args:
+            readonly: Use a read-only connection (reads never block in WAL mode)
+        """
+        with self._pool.connection(readonly) as conn:
             yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+    
+    def _writer_loop(self):
+        """Drain queued inserts, committing each batch in one transaction"""
+        while True:
+            item = self._write_q.get()
+            if item is None:
+                return
+            
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._write_q.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            try:
+                with self.get_connection() as conn:
+                    cursor = conn.cursor()
+                    # Executed one by one so each Future gets its row ID;
+                    # the single commit is what amortizes the fsync. A savepoint
+                    # per insert rolls back only a failing row, not the batch
+                    results = []
+                    for sql, params, _ in batch:
+                        cursor.execute('SAVEPOINT batch_item')
+                        try:
+                            cursor.execute(sql, params)
+                            results.append(cursor.lastrowid)
+                        except Exception as e:
+                            cursor.execute('ROLLBACK TO batch_item')
+                            results.append(e)
+                        cursor.execute('RELEASE batch_item')
+                for (_, _, future), result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+            
+            for _ in batch:
+                self._write_q.task_done()
+            
+            if stop:
+                return
+    
+    def _write(self, sql: str, params: Tuple) -> Union[int, Future]:
+        """Execute an insert now, or queue it for the group-commit writer"""
+        if self.group_commit:
+            future = Future()
+            self._write_q.put((sql, params, future))
+            return future
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return cursor.lastrowid
+    
+    def flush(self):
+        """Block until all queued inserts are committed"""
+        if self.group_commit:
+            self._write_q.join()
+    
+    def close(self):
+        """Flush queued inserts and close all pooled connections"""
+        if self._writer_thread is not None:
+            self._write_q.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+            self.group_commit = False
+        
+        self._pool.close()
+        with self._shards_lock:
+            for pool in self._shards.values():
+                pool.close()
+            self._shards.clear()
+    
+    @staticmethod
+    def _column_type(cursor: sqlite3.Cursor, table: str, column: str) -> Optional[str]:
+        """Get the declared type of a column, or None if the table/column does not exist"""
+        cursor.execute('SELECT type FROM pragma_table_info(?) WHERE name = ?', (table, column))
+        row = cursor.fetchone()
+        return row[0].upper() if row else None
+    
+    @staticmethod
+    def _copy_legacy_rows(cursor: sqlite3.Cursor, table: str, epoch_columns: Tuple[str, ...] = ()):
+        """
+        Move rows from <table>_legacy into the freshly created table, then drop it
+        
+        Args:
+            cursor: Cursor inside the schema transaction
+            table: Table name
+            epoch_columns: Columns to convert from ISO text to epoch milliseconds
+        """
+        legacy = f"{table}_legacy"
+        cursor.execute('SELECT name FROM pragma_table_info(?)', (legacy,))
+        legacy_columns = {row[0] for row in cursor.fetchall()}
+        cursor.execute('SELECT name FROM pragma_table_info(?)', (table,))
+        columns = [row[0] for row in cursor.fetchall() if row[0] in legacy_columns]
+        
+        select = [_SQL_ISO_TO_EPOCH_MS.format(column=c) if c in epoch_columns else c for c in columns]
+        cursor.execute(f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) "
+                       f"SELECT {', '.join(select)} FROM {legacy}")
+        cursor.execute(f"DROP TABLE {legacy}")
     
     def _init_db(self):
         """Initialize database schema"""
@@ -49,10 +506,14 @@ class TradingDatabase:
             cursor = conn.cursor()
             
             # Trades table
+            legacy_trades = self._column_type(cursor, 'trades', 'timestamp') == 'TEXT'
+            if legacy_trades:
+                cursor.execute('ALTER TABLE trades RENAME TO trades_legacy')
+            
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS trades (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     symbol TEXT NOT NULL,
                     action TEXT NOT NULL,
                     price REAL NOT NULL,
@@ -67,11 +528,18 @@ class TradingDatabase:
                 )
             ''')
             
+            if legacy_trades:
+                self._copy_legacy_rows(cursor, 'trades', epoch_columns=('timestamp',))
+            
             # Signals table
+            legacy_signals = self._column_type(cursor, 'signals', 'timestamp') == 'TEXT'
+            if legacy_signals:
+                cursor.execute('ALTER TABLE signals RENAME TO signals_legacy')
+            
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS signals (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     symbol TEXT NOT NULL,
                     signal_type TEXT NOT NULL,
                     price REAL NOT NULL,
@@ -82,25 +550,45 @@ class TradingDatabase:
                 )
             ''')
             
-            # Portfolio table (current holdings)
+            if legacy_signals:
+                self._copy_legacy_rows(cursor, 'signals', epoch_columns=('timestamp',))
+            
+            # Portfolio table (current holdings); valuation columns are computed by SQLite
+            cursor.execute("SELECT hidden FROM pragma_table_xinfo('portfolio') WHERE name = 'total_value'")
+            row = cursor.fetchone()
+            legacy_portfolio = row is not None and (
+                row[0] == 0 or self._column_type(cursor, 'portfolio', 'last_updated') == 'TEXT')
+            if legacy_portfolio:
+                cursor.execute('ALTER TABLE portfolio RENAME TO portfolio_legacy')
+            
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS portfolio (
                     symbol TEXT PRIMARY KEY,
                     amount REAL NOT NULL,
                     avg_buy_price REAL NOT NULL,
                     current_price REAL,
-                    total_value REAL,
-                    profit_loss REAL,
-                    profit_loss_percent REAL,
-                    last_updated TEXT
+                    total_value REAL GENERATED ALWAYS AS
+                        (amount * COALESCE(NULLIF(current_price, 0), avg_buy_price)) STORED,
+                    profit_loss REAL GENERATED ALWAYS AS
+                        (total_value - amount * avg_buy_price) STORED,
+                    profit_loss_percent REAL GENERATED ALWAYS AS
+                        (CASE WHEN amount > 0 THEN profit_loss / (amount * avg_buy_price) * 100 ELSE 0 END) STORED,
+                    last_updated INTEGER
                 )
             ''')
             
+            if legacy_portfolio:
+                self._copy_legacy_rows(cursor, 'portfolio', epoch_columns=('last_updated',))
+            
             # Balance table
+            legacy_balance = self._column_type(cursor, 'balance', 'timestamp') == 'TEXT'
+            if legacy_balance:
+                cursor.execute('ALTER TABLE balance RENAME TO balance_legacy')
+            
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS balance (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     balance REAL NOT NULL,
                     equity REAL NOT NULL,
                     profit_loss REAL,
@@ -108,11 +596,18 @@ class TradingDatabase:
                 )
             ''')
             
+            if legacy_balance:
+                self._copy_legacy_rows(cursor, 'balance', epoch_columns=('timestamp',))
+            
             # Performance metrics table
+            legacy_performance = self._column_type(cursor, 'performance', 'timestamp') == 'TEXT'
+            if legacy_performance:
+                cursor.execute('ALTER TABLE performance RENAME TO performance_legacy')
+            
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS performance (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     total_trades INTEGER,
                     winning_trades INTEGER,
                     losing_trades INTEGER,
@@ -127,35 +622,86 @@ class TradingDatabase:
                 )
             ''')
             
-            # Market data cache table
+            if legacy_performance:
+                self._copy_legacy_rows(cursor, 'performance', epoch_columns=('timestamp',))
+            
+            # Market data cache table (timestamps are epoch milliseconds). Clustered on
+            # (symbol, timeframe, timestamp) so range reads are a single B-tree walk
+            # and the key doubles as the uniqueness constraint.
+            cursor.execute("SELECT name FROM pragma_table_info('market_data') WHERE name = 'id'")
+            legacy_market_data = cursor.fetchone() is not None
+            if legacy_market_data:
+                cursor.execute('ALTER TABLE market_data RENAME TO market_data_legacy')
+            
+            cursor.execute(_SQL_CREATE_MARKET_DATA)
+            
+            if legacy_market_data:
+                self._copy_legacy_rows(cursor, 'market_data', epoch_columns=('timestamp',))
+            
+            # Running trade totals kept by triggers so the summary is a single-row read
             cursor.execute('''
-                CREATE TABLE IF NOT EXISTS market_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    symbol TEXT NOT NULL,
-                    timeframe TEXT NOT NULL,
-                    open REAL NOT NULL,
-                    high REAL NOT NULL,
-                    low REAL NOT NULL,
-                    close REAL NOT NULL,
-                    volume REAL NOT NULL,
-                    UNIQUE(timestamp, symbol, timeframe)
+                CREATE TABLE IF NOT EXISTS perf_cache (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    total_trades INTEGER NOT NULL,
+                    winning INTEGER NOT NULL,
+                    losing INTEGER NOT NULL,
+                    total_pnl REAL NOT NULL
                 )
             ''')
+            cursor.execute('''
+                INSERT OR IGNORE INTO perf_cache (id, total_trades, winning, losing, total_pnl)
+                SELECT 1, COUNT(*),
+                       COALESCE(SUM(profit_loss > 0), 0),
+                       COALESCE(SUM(profit_loss < 0), 0),
+                       COALESCE(SUM(profit_loss), 0)
+                FROM trades
+            ''')
+            # Recreated on every start so databases with older trigger bodies pick up fixes
+            # (a NULL profit_loss counts as neither a win nor a loss)
+            for trigger in ('trg_trades_insert', 'trg_trades_delete', 'trg_trades_update_pnl'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            cursor.execute('''
+                CREATE TRIGGER trg_trades_insert AFTER INSERT ON trades BEGIN
+                    UPDATE perf_cache SET
+                        total_trades = total_trades + 1,
+                        winning = winning + COALESCE(NEW.profit_loss > 0, 0),
+                        losing = losing + COALESCE(NEW.profit_loss < 0, 0),
+                        total_pnl = total_pnl + COALESCE(NEW.profit_loss, 0)
+                    WHERE id = 1;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER trg_trades_delete AFTER DELETE ON trades BEGIN
+                    UPDATE perf_cache SET
+                        total_trades = total_trades - 1,
+                        winning = winning - COALESCE(OLD.profit_loss > 0, 0),
+                        losing = losing - COALESCE(OLD.profit_loss < 0, 0),
+                        total_pnl = total_pnl - COALESCE(OLD.profit_loss, 0)
+                    WHERE id = 1;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER trg_trades_update_pnl AFTER UPDATE OF profit_loss ON trades BEGIN
+                    UPDATE perf_cache SET
+                        winning = winning - COALESCE(OLD.profit_loss > 0, 0) + COALESCE(NEW.profit_loss > 0, 0),
+                        losing = losing - COALESCE(OLD.profit_loss < 0, 0) + COALESCE(NEW.profit_loss < 0, 0),
+                        total_pnl = total_pnl - COALESCE(OLD.profit_loss, 0) + COALESCE(NEW.profit_loss, 0)
+                    WHERE id = 1;
+                END
+            ''')
+            cursor.execute('DROP INDEX IF EXISTS idx_trades_pnl')
             
             # Create indexes for better performance
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_signals_symbol ON signals(symbol)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_signals_timestamp ON signals(timestamp)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_market_data_symbol ON market_data(symbol)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_market_data_timestamp ON market_data(timestamp)')
             
             conn.commit()
     
     def insert_trade(self, symbol: str, action: str, price: float, amount: float,
                      commission: float = 0, profit_loss: float = 0, reason: str = '', 
-                     order_id: str = '', metadata: Dict = None) -> int:
+                     order_id: str = '', metadata: Dict = None) -> Union[int, Future]:
         """
         Insert a new trade record
         
@@ -171,25 +717,22 @@ class TradingDatabase:
             metadata: Additional metadata
         
         Returns:
-            Trade ID
+            Trade ID (a Future resolving to it when group_commit is enabled)
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            total_value = price * amount
-            timestamp = datetime.now().isoformat()
-            
-            cursor.execute('''
-                INSERT INTO trades (timestamp, symbol, action, price, amount, 
-                                  total_value, commission, profit_loss, reason, order_id, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (timestamp, symbol, action, price, amount, total_value, 
-                  commission, profit_loss, reason, order_id, json.dumps(metadata) if metadata else None))
-            
-            return cursor.lastrowid
+        return self._write(_SQL_INSERT_TRADE, self._trade_params(
+            symbol, action, price, amount, commission, profit_loss, reason, order_id, metadata))
+    
+    @staticmethod
+    def _trade_params(symbol: str, action: str, price: float, amount: float,
+                      commission: float = 0, profit_loss: float = 0, reason: str = '',
+                      order_id: str = '', metadata: Dict = None) -> Tuple:
+        """Build the bind parameters for _SQL_INSERT_TRADE"""
+        return (symbol, action, price, amount, price * amount,
+                commission, profit_loss, reason, order_id,
+                _json_dumps(metadata) if metadata else None)
     
     def insert_signal(self, symbol: str, signal_type: str, price: float,
-                     indicators: Dict, strength: int = None, metadata: Dict = None) -> int:
+                     indicators: Dict, strength: int = None, metadata: Dict = None) -> Union[int, Future]:
         """
         Insert a new signal record
         
@@ -202,21 +745,11 @@ class TradingDatabase:
             metadata: Additional metadata
         
         Returns:
-            Signal ID
+            Signal ID (a Future resolving to it when group_commit is enabled)
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            timestamp = datetime.now().isoformat()
-            
-            cursor.execute('''
-                INSERT INTO signals (timestamp, symbol, signal_type, price, 
-                                   strength, indicators, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (timestamp, symbol, signal_type, price, strength,
-                  json.dumps(indicators), json.dumps(metadata) if metadata else None))
-            
-            return cursor.lastrowid
+        return self._write(_SQL_INSERT_SIGNAL, (symbol, signal_type, price, strength,
+                                                _json_dumps(indicators),
+                                                _json_dumps(metadata) if metadata else None))
     
     def update_portfolio(self, symbol: str, amount: float, avg_buy_price: float,
                         current_price: float = None):
@@ -232,17 +765,8 @@ class TradingDatabase:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            total_value = amount * (current_price or avg_buy_price)
-            profit_loss = total_value - (amount * avg_buy_price)
-            profit_loss_percent = (profit_loss / (amount * avg_buy_price)) * 100 if amount > 0 else 0
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO portfolio 
-                (symbol, amount, avg_buy_price, current_price, total_value, 
-                 profit_loss, profit_loss_percent, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (symbol, amount, avg_buy_price, current_price, total_value,
-                  profit_loss, profit_loss_percent, datetime.now().isoformat()))
+            # total_value and profit/loss columns are generated by SQLite
+            cursor.execute(_SQL_UPSERT_PORTFOLIO, (symbol, amount, avg_buy_price, current_price))
     
     def update_balance(self, balance: float, equity: float, profit_loss: float = None,
                       profit_loss_percent: float = None):
@@ -254,16 +778,45 @@ class TradingDatabase:
             equity: Total equity (balance + holdings value)
             profit_loss: Total profit/loss
             profit_loss_percent: Total profit/loss percentage
+        
+        Returns:
+            Snapshot ID (a Future resolving to it when group_commit is enabled)
+        """
+        return self._write(_SQL_INSERT_BALANCE, (balance, equity, profit_loss, profit_loss_percent))
+    
+    def record_trade_atomic(self, trade: Dict, portfolio: Dict = None, balance: Dict = None) -> int:
+        """
+        Record a trade together with its portfolio and balance updates in one transaction
+        
+        Either all rows are written or none are, and the event costs a single commit.
+        
+        Args:
+            trade: insert_trade arguments (symbol, action, price, amount, ...)
+            portfolio: update_portfolio arguments (symbol, amount, avg_buy_price, current_price)
+            balance: update_balance arguments (balance, equity, profit_loss, profit_loss_percent)
+        
+        Returns:
+            Trade ID
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT INTO balance (timestamp, balance, equity, profit_loss, profit_loss_percent)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (datetime.now().isoformat(), balance, equity, profit_loss, profit_loss_percent))
+            cursor.execute(_SQL_INSERT_TRADE, self._trade_params(**trade))
+            trade_id = cursor.lastrowid
+            
+            if portfolio:
+                cursor.execute(_SQL_UPSERT_PORTFOLIO, (
+                    portfolio['symbol'], portfolio['amount'], portfolio['avg_buy_price'],
+                    portfolio.get('current_price')))
+            
+            if balance:
+                cursor.execute(_SQL_INSERT_BALANCE, (
+                    balance['balance'], balance['equity'],
+                    balance.get('profit_loss'), balance.get('profit_loss_percent')))
+            
+            return trade_id
     
-    def insert_market_data(self, symbol: str, timeframe: str, timestamp: str,
+    def insert_market_data(self, symbol: str, timeframe: str, timestamp: Union[int, str, datetime],
                           open_price: float, high: float, low: float, 
                           close: float, volume: float):
         """
@@ -272,52 +825,158 @@ class TradingDatabase:
         Args:
             symbol: Trading pair
             timeframe: Candle timeframe
-            timestamp: Candle timestamp
+            timestamp: Candle open time (epoch ms, ISO string or datetime)
             open_price: Open price
             high: High price
             low: Low price
             close: Close price
             volume: Volume
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            try:
-                cursor.execute('''
-                    INSERT INTO market_data (timestamp, symbol, timeframe, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (timestamp, symbol, timeframe, open_price, high, low, close, volume))
-            except sqlite3.IntegrityError:
-                # Data already exists, skip
-                pass
+        self.insert_market_data_many([
+            (self._to_epoch_ms(timestamp), symbol, timeframe, open_price, high, low, close, volume)
+        ])
+    
+    @staticmethod
+    def _to_epoch_ms(timestamp: Union[int, str, datetime]) -> int:
+        """Convert a candle timestamp to epoch milliseconds"""
+        if isinstance(timestamp, numbers.Integral):
+            return int(timestamp)
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return int(timestamp.timestamp() * 1000)
+    
+    def _shard_pool(self, path: str) -> ConnectionPool:
+        """Get (creating if needed) the connection pool for a market data shard file"""
+        with self._shards_lock:
+            pool = self._shards.get(path)
+            if pool is None:
+                pool = ConnectionPool(path)
+                with pool.connection() as conn:
+                    conn.execute(_SQL_CREATE_MARKET_DATA)
+                self._shards[path] = pool
+            return pool
+    
+    def _market_data_pool(self, symbol: str) -> ConnectionPool:
+        """Get the connection pool holding a symbol's candles"""
+        if not self.shard_market_data:
+            return self._pool
+        name = re.sub(r'[^A-Za-z0-9]', '', symbol)
+        return self._shard_pool(os.path.join(os.path.dirname(self.db_path), f"md_{name}.db"))
+    
+    def insert_market_data_many(self, rows: List[Tuple]) -> int:
+        """
+        Insert many OHLCV rows in a single transaction
+        
+        Rows that already exist (same timestamp, symbol and timeframe) are skipped.
+        
+        Args:
+            rows: Tuples of (timestamp_ms, symbol, timeframe, open, high, low, close, volume)
+        
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+        
+        if self._arrow_store is not None:
+            return self._arrow_store.write(rows)
+        
+        # Group rows by symbol so each shard gets one transaction
+        by_symbol = {}
+        for row in rows:
+            by_symbol.setdefault(row[1], []).append(row)
+        
+        inserted = 0
+        for symbol, symbol_rows in by_symbol.items():
+            with self._market_data_pool(symbol).connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(_SQL_INSERT_MARKET_DATA, symbol_rows)
+                inserted += cursor.rowcount
+        return inserted
+    
+    def insert_market_data_df(self, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+        """
+        Insert an OHLCV DataFrame (as returned by DataFetcher.fetch_ohlcv)
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            df: DataFrame indexed by candle open time with OHLCV columns
+        
+        Returns:
+            Number of rows inserted
+        """
+        if df is None or df.empty:
+            return 0
+        
+        # Convert whole columns at once instead of marshalling per row
+        timestamps = df.index.as_unit('ms').asi8.tolist()
+        columns = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype='float64').T.tolist()
+        rows = list(zip(timestamps, repeat(symbol), repeat(timeframe), *columns))
+        
+        return self.insert_market_data_many(rows)
+    
+    @staticmethod
+    def _fetch_records(cursor: sqlite3.Cursor, json_columns: Tuple[str, ...] = ()) -> List[Dict]:
+        """
+        Fetch all rows as dicts, parsing JSON columns
+        
+        Column names are read from cursor.description once per query rather
+        than once per row.
+        """
+        columns = [d[0] for d in cursor.description]
+        records = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        
+        json_columns = [c for c in json_columns if c in columns]
+        if json_columns:
+            for record in records:
+                for column in json_columns:
+                    if record[column]:
+                        record[column] = _json_loads(record[column])
+        return records
+    
+    @staticmethod
+    def _projection(columns: Optional[Sequence[str]], allowed: Tuple[str, ...]) -> str:
+        """Build the SELECT column list, rejecting unknown column names"""
+        if not columns:
+            return '*'
+        unknown = set(columns) - set(allowed)
+        if unknown:
+            raise ValueError(f"Unknown columns: {sorted(unknown)}")
+        return ', '.join(columns)
     
-    def get_trades(self, symbol: str = None, limit: int = 100) -> List[Dict]:
+    def get_trades(self, symbol: str = None, limit: int = 100,
+                   columns: Sequence[str] = None) -> List[Dict]:
         """
         Retrieve trade history
         
         Args:
             symbol: Filter by symbol (optional)
             limit: Maximum number of records
+            columns: Only select these columns (optional, default all)
         
         Returns:
             List of trade records
         """
-        with self.get_connection() as conn:
+        projection = self._projection(columns, TRADE_COLUMNS)
+        
+        with self.get_connection(readonly=True) as conn:
             cursor = conn.cursor()
             
             if symbol:
-                cursor.execute('''
-                    SELECT * FROM trades WHERE symbol = ? 
+                cursor.execute(f'''
+                    SELECT {projection} FROM trades WHERE symbol = ? 
                     ORDER BY timestamp DESC LIMIT ?
                 ''', (symbol, limit))
             else:
-                cursor.execute('''
-                    SELECT * FROM trades ORDER BY timestamp DESC LIMIT ?
+                cursor.execute(f'''
+                    SELECT {projection} FROM trades ORDER BY timestamp DESC LIMIT ?
                 ''', (limit,))
             
-            return [dict(row) for row in cursor.fetchall()]
+            return self._fetch_records(cursor, ('metadata',))
     
-    def get_signals(self, symbol: str = None, executed: bool = None, limit: int = 100) -> List[Dict]:
+    def get_signals(self, symbol: str = None, executed: bool = None, limit: int = 100,
+                    columns: Sequence[str] = None) -> List[Dict]:
         """
         Retrieve signal history
         
@@ -325,14 +984,17 @@ class TradingDatabase:
             symbol: Filter by symbol (optional)
             executed: Filter by execution status (optional)
             limit: Maximum number of records
+            columns: Only select these columns (optional, default all)
         
         Returns:
             List of signal records
         """
-        with self.get_connection() as conn:
+        projection = self._projection(columns, SIGNAL_COLUMNS)
+        
+        with self.get_connection(readonly=True) as conn:
             cursor = conn.cursor()
             
-            query = 'SELECT * FROM signals WHERE 1=1'
+            query = f'SELECT {projection} FROM signals WHERE 1=1'
             params = []
             
             if symbol:
@@ -347,7 +1009,39 @@ class TradingDatabase:
             params.append(limit)
             
             cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            return self._fetch_records(cursor, ('indicators', 'metadata'))
+    
+    def get_market_data(self, symbol: str, timeframe: str, start_ms: int = None,
+                        end_ms: int = None, limit: int = None) -> List[Dict]:
+        """
+        Retrieve cached OHLCV candles in ascending time order
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            start_ms: Earliest candle open time in epoch ms (optional)
+            end_ms: Latest candle open time in epoch ms (optional)
+            limit: Maximum number of records (optional)
+        
+        Returns:
+            List of candle records
+        """
+        if self._arrow_store is not None:
+            return self._arrow_store.read(symbol, timeframe, start_ms, end_ms, limit)
+        
+        with self._market_data_pool(symbol).connection(readonly=True) as conn:
+            cursor = conn.cursor()
+            
+            query = '''
+                SELECT timestamp, open, high, low, close, volume FROM market_data
+                WHERE symbol = ? AND timeframe = ? AND timestamp BETWEEN ? AND ?
+                ORDER BY timestamp LIMIT ?
+            '''
+            cursor.execute(query, (symbol, timeframe,
+                                   start_ms if start_ms is not None else 0,
+                                   end_ms if end_ms is not None else 2 ** 63 - 1,
+                                   limit if limit is not None else -1))
+            return self._fetch_records(cursor)
     
     def get_portfolio(self) -> List[Dict]:
         """
@@ -356,10 +1050,10 @@ class TradingDatabase:
         Returns:
             List of portfolio records
         """
-        with self.get_connection() as conn:
+        with self.get_connection(readonly=True) as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM portfolio WHERE amount > 0')
-            return [dict(row) for row in cursor.fetchall()]
+            return self._fetch_records(cursor)
     
     def get_latest_balance(self) -> Optional[Dict]:
         """
@@ -368,11 +1062,11 @@ class TradingDatabase:
         Returns:
             Balance record or None
         """
-        with self.get_connection() as conn:
+        with self.get_connection(readonly=True) as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM balance ORDER BY timestamp DESC LIMIT 1')
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            records = self._fetch_records(cursor)
+            return records[0] if records else None
     
     def get_performance_summary(self) -> Dict:
         """
@@ -381,27 +1075,16 @@ class TradingDatabase:
         Returns:
             Dictionary with performance metrics
         """
-        with self.get_connection() as conn:
+        with self.get_connection(readonly=True) as conn:
             cursor = conn.cursor()
             
-            # Total trades
-            cursor.execute('SELECT COUNT(*) as total FROM trades')
-            total_trades = cursor.fetchone()['total']
-            
-            # Winning/losing trades
-            cursor.execute('SELECT COUNT(*) as winning FROM trades WHERE profit_loss > 0')
-            winning_trades = cursor.fetchone()['winning']
-            
-            cursor.execute('SELECT COUNT(*) as losing FROM trades WHERE profit_loss < 0')
-            losing_trades = cursor.fetchone()['losing']
+            # Trade counts and total profit/loss, maintained by the trades triggers
+            cursor.execute('SELECT total_trades, winning, losing, total_pnl FROM perf_cache WHERE id = 1')
+            total_trades, winning_trades, losing_trades, total_pnl = cursor.fetchone()
             
             # Win rate
             win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
             
-            # Total profit/loss
-            cursor.execute('SELECT SUM(profit_loss) as total_pnl FROM trades')
-            total_pnl = cursor.fetchone()['total_pnl'] or 0
-            
             # Current balance
             latest_balance = self.get_latest_balance()
             
@@ -422,11 +1105,102 @@ class TradingDatabase:
         Args:
             days: Keep data newer than this many days
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cutoff_date = datetime.now().replace(day=datetime.now().day - days).isoformat()
-            cursor.execute('DELETE FROM market_data WHERE timestamp < ?', (cutoff_date,))
-            conn.commit()
+        cutoff = int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
+        
+        if self._arrow_store is not None:
+            self._arrow_store.clear_before(cutoff)
+        
+        pools = [self._pool]
+        if self.shard_market_data:
+            pattern = os.path.join(glob.escape(os.path.dirname(self.db_path)), 'md_*.db')
+            pools += [self._shard_pool(path) for path in glob.glob(pattern)]
+        
+        for pool in pools:
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('DELETE FROM market_data WHERE timestamp < ?', (cutoff,))
+
+
+class AsyncTradingDatabase:
+    """
+    Asyncio facade over TradingDatabase
+    
+    Each call runs in a worker thread via asyncio.to_thread so SQLite commits
+    never block the event loop. With group_commit enabled, inserts only put a
+    job on the writer queue, so they are issued directly and return the
+    writer's Future without a thread hop.
+    """
+    
+    def __init__(self, db: TradingDatabase):
+        """
+        Initialize async facade
+        
+        Args:
+            db: Database to wrap
+        """
+        self._db = db
+    
+    async def _insert(self, method, *args, **kwargs):
+        """Queue an insert on the group-commit writer, or run it in a thread"""
+        if self._db.group_commit:
+            return method(*args, **kwargs)
+        return await asyncio.to_thread(method, *args, **kwargs)
+    
+    async def insert_trade(self, *args, **kwargs):
+        """See TradingDatabase.insert_trade"""
+        return await self._insert(self._db.insert_trade, *args, **kwargs)
+    
+    async def insert_signal(self, *args, **kwargs):
+        """See TradingDatabase.insert_signal"""
+        return await self._insert(self._db.insert_signal, *args, **kwargs)
+    
+    async def update_portfolio(self, *args, **kwargs):
+        """See TradingDatabase.update_portfolio"""
+        return await asyncio.to_thread(self._db.update_portfolio, *args, **kwargs)
+    
+    async def update_balance(self, *args, **kwargs):
+        """See TradingDatabase.update_balance"""
+        return await self._insert(self._db.update_balance, *args, **kwargs)
+    
+    async def record_trade_atomic(self, *args, **kwargs) -> int:
+        """See TradingDatabase.record_trade_atomic"""
+        return await asyncio.to_thread(self._db.record_trade_atomic, *args, **kwargs)
+    
+    async def insert_market_data_many(self, rows: List[Tuple]) -> int:
+        """See TradingDatabase.insert_market_data_many"""
+        return await asyncio.to_thread(self._db.insert_market_data_many, rows)
+    
+    async def insert_market_data_df(self, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+        """See TradingDatabase.insert_market_data_df"""
+        return await asyncio.to_thread(self._db.insert_market_data_df, symbol, timeframe, df)
+    
+    async def get_trades(self, *args, **kwargs) -> List[Dict]:
+        """See TradingDatabase.get_trades"""
+        return await asyncio.to_thread(self._db.get_trades, *args, **kwargs)
+    
+    async def get_signals(self, *args, **kwargs) -> List[Dict]:
+        """See TradingDatabase.get_signals"""
+        return await asyncio.to_thread(self._db.get_signals, *args, **kwargs)
+    
+    async def get_market_data(self, *args, **kwargs) -> List[Dict]:
+        """See TradingDatabase.get_market_data"""
+        return await asyncio.to_thread(self._db.get_market_data, *args, **kwargs)
+    
+    async def get_portfolio(self) -> List[Dict]:
+        """See TradingDatabase.get_portfolio"""
+        return await asyncio.to_thread(self._db.get_portfolio)
+    
+    async def get_latest_balance(self) -> Optional[Dict]:
+        """See TradingDatabase.get_latest_balance"""
+        return await asyncio.to_thread(self._db.get_latest_balance)
+    
+    async def get_performance_summary(self) -> Dict:
+        """See TradingDatabase.get_performance_summary"""
+        return await asyncio.to_thread(self._db.get_performance_summary)
+    
+    async def close(self):
+        """See TradingDatabase.close"""
+        await asyncio.to_thread(self._db.close)
 
 
 if __name__ == "__main__":
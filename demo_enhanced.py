@@ -5,6 +5,8 @@ import asyncio
 import sys
 from pathlib import Path
 
+import pandas as pd
+
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -54,20 +56,26 @@ async def demo_run():
         print("✅ Data fetcher initialized!")
         print()
         
-        # Fetch sample data
-        symbol = config.trading.symbols[0]
-        logger.info(f"Fetching data for {symbol}...")
-        df = await data_fetcher.fetch_ohlcv_async(
-            symbol=symbol,
-            timeframe=config.trading.timeframe,
-            limit=100
-        )
+        # Fetch sample data for all symbols concurrently
+        symbols = config.trading.symbols
+        logger.info(f"Fetching data for {', '.join(symbols)}...")
+        frames = await asyncio.gather(*(
+            data_fetcher.fetch_ohlcv_async(symbol=symbol, timeframe=config.trading.timeframe, limit=100)
+            for symbol in symbols
+        ))
+        frames = {symbol: df for symbol, df in zip(symbols, frames) if df is not None and not df.empty}
         
-        if df is not None and not df.empty:
-            print(f"✅ Data fetched successfully for {symbol}!")
-            print(f"   Candles: {len(df)}")
-            print(f"   Latest price: ${df['close'].iloc[-1]:,.2f}")
-            print(f"   24h change: {((df['close'].iloc[-1] / df['close'].iloc[-24] - 1) * 100):.2f}%")
+        if frames:
+            # One wide frame of closes so the change is computed for every symbol at once
+            closes = pd.concat({symbol: df['close'] for symbol, df in frames.items()}, axis=1)
+            latest = closes.iloc[-1]
+            change_24 = closes.pct_change(24, fill_method=None).iloc[-1] * 100
+            
+            for symbol in closes.columns:
+                print(f"✅ Data fetched successfully for {symbol}!")
+                print(f"   Candles: {closes[symbol].count()}")
+                print(f"   Latest price: ${latest[symbol]:,.2f}")
+                print(f"   24h change: {change_24[symbol]:.2f}%")
             print()
         
         # Initialize strategy
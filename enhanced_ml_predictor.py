@@ -5,16 +5,25 @@ Combines Random Forest, XGBoost with technical indicators for robust predictions
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+import hashlib
 import joblib
+from joblib import Parallel, delayed
 import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import TimeSeriesSplit, cross_val_score
+from sklearn.utils.class_weight import compute_class_weight
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 
 try:
@@ -22,11 +31,119 @@ try:
     XGBOOST_AVAILABLE = True
 except ImportError:
     XGBOOST_AVAILABLE = False
+
+try:
+    import lz4  # noqa: F401  (enables joblib's lz4 compressor)
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
     
 from logger import setup_logger
 
 logger = setup_logger('enhanced_ml_predictor')
 
+# Ensemble members in the order of the weight and vote vectors
+ENSEMBLE_MEMBERS = ('random_forest', 'xgboost', 'technical_score')
+
+# Boosting rounds one XGBoost fit may add (early stopping usually ends it sooner)
+XGB_ROUNDS = 200
+
+# Single joblib artifact holding the whole ensemble
+MODEL_ARTIFACT = 'ensemble.joblib'
+MODEL_COMPRESSION = ('lz4', 3) if LZ4_AVAILABLE else ('zlib', 3)
+
+# Leading rows prepare_features can never complete: the 20-bar rolling
+# stats of returns first exist on the 21st bar
+FEATURE_WARMUP = 20
+
+# Bars of history prepare_features_last uses for one complete row, with
+# headroom over FEATURE_WARMUP for gaps in the indicator columns
+FEATURE_LOOKBACK = 64
+
+
+def _technical_score(values) -> float:
+    """Technical score of one bar (dict or row Series) from its indicator values (-1 to 1)"""
+    score = 0.0
+    count = 0
+    
+    # RSI
+    if 'rsi' in values:
+        rsi = values['rsi']
+        if rsi < 30:
+            score += 1
+        elif rsi > 70:
+            score -= 1
+        else:
+            score += (50 - rsi) / 20  # Linear between 30-70
+        count += 1
+    
+    # MACD
+    if 'macd' in values and 'macd_signal' in values:
+        score += 0.5 if values['macd'] > values['macd_signal'] else -0.5
+        count += 1
+    
+    # EMA trend
+    if 'ema_12' in values and 'ema_26' in values:
+        score += 0.5 if values['ema_12'] > values['ema_26'] else -0.5
+        count += 1
+    
+    return score / count if count > 0 else 0.0
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """Shift an array forward by `periods`, padding the head with NaN"""
+    shifted = np.full_like(values, np.nan, dtype=np.float64)
+    if periods < len(values):
+        shifted[periods:] = values[:-periods]
+    return shifted
+
+
+def _pct_change(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """NumPy equivalent of Series.pct_change(periods)"""
+    change = np.full_like(values, np.nan, dtype=np.float64)
+    if periods < len(values):
+        change[periods:] = values[periods:] / values[:-periods] - 1
+    return change
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """NumPy equivalent of Series.rolling(window).mean()"""
+    result = np.full_like(values, np.nan, dtype=np.float64)
+    if window <= len(values):
+        result[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return result
+
+
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """NumPy equivalent of Series.rolling(window).std()"""
+    result = np.full_like(values, np.nan, dtype=np.float64)
+    if window <= len(values):
+        result[window - 1:] = sliding_window_view(values, window).std(axis=1, ddof=1)
+    return result
+
+
+def _best_booster(xgb_model):
+    """
+    Booster of a fitted XGBClassifier truncated to its early-stopping best round
+    
+    predict_proba only scores rounds up to best_iteration; slicing gives
+    inplace_predict the same model.
+    
+    Args:
+        xgb_model: Fitted or loaded XGBClassifier
+        
+    Returns:
+        xgboost Booster
+    """
+    booster = xgb_model.get_booster()
+    try:
+        best_iteration = xgb_model.best_iteration
+    except AttributeError:  # no early stopping: every round counts
+        return booster
+    if best_iteration + 1 < booster.num_boosted_rounds():
+        booster = booster[:best_iteration + 1]
+    return booster
+
 
 @dataclass
 class ModelPerformance:
@@ -53,6 +170,285 @@ class PredictionResult:
     reasoning: List[str]
 
 
+class CompiledForest:
+    """
+    Flattened copy of a fitted RandomForestClassifier for fast inference
+
+    All trees are concatenated into single node arrays and traversed in
+    lockstep with NumPy, one vectorized step per tree level, instead of
+    dispatching every tree separately through sklearn.
+    """
+
+    def __init__(self, model: RandomForestClassifier):
+        """
+        Flatten a fitted forest
+
+        Args:
+            model: Fitted RandomForestClassifier
+        """
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+        left = np.concatenate([tree.children_left for tree in trees])
+        right = np.concatenate([tree.children_right for tree in trees])
+        is_leaf = left == -1
+        node_offsets = np.repeat(offsets, sizes)
+
+        # Leaves point at themselves so finished trees stay put
+        nodes = np.arange(len(left))
+        self.left = np.where(is_leaf, nodes, left + node_offsets)
+        self.right = np.where(is_leaf, nodes, right + node_offsets)
+        self.feature = np.where(is_leaf, 0, np.concatenate([tree.feature for tree in trees]))
+        self.threshold = np.concatenate([tree.threshold for tree in trees])
+
+        values = np.concatenate([tree.value[:, 0, :] for tree in trees])
+        totals = values.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1
+        self.value = values / totals
+
+        self.roots = offsets
+        self.depth = max(tree.max_depth for tree in trees)
+        self.classes_ = model.classes_
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities averaged over all trees
+
+        Args:
+            X: Feature matrix of shape (n_samples, n_features)
+
+        Returns:
+            Array of shape (n_samples, n_classes)
+        """
+        # sklearn trees compare float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return self.value[nodes].mean(axis=1)
+
+
+class OnlineFeatures:
+    """
+    Streaming counterpart of EnhancedMLPredictor.prepare_features
+
+    Keeps the short histories and running sums the features depend on so a
+    new bar updates the feature vector in O(1) instead of recomputing every
+    rolling window over the whole frame. The volume and RSI means are summed
+    from their 20/5-item deques, so NaN warm-up values of the indicator
+    columns drop out with the window instead of poisoning a running sum.
+    """
+
+    def __init__(self):
+        """Initialize empty streaming state"""
+        self.closes = deque(maxlen=11)  # current close + 10 back for momentum_10
+        self.volumes = deque(maxlen=20)
+        self.returns = deque(maxlen=20)
+        self.returns_sum = {5: 0.0, 20: 0.0}
+        self.returns_sumsq = {5: 0.0, 20: 0.0}
+        self.volume_changes = deque(maxlen=4)
+        self.rsis = deque(maxlen=5)
+
+    def _push_return(self, ret: float):
+        """Add a return and maintain the 5/20-bar running sums"""
+        for window in (5, 20):
+            if len(self.returns) >= window:
+                old = self.returns[-window]
+                self.returns_sum[window] -= old
+                self.returns_sumsq[window] -= old * old
+            self.returns_sum[window] += ret
+            self.returns_sumsq[window] += ret * ret
+        self.returns.append(ret)
+
+    def _returns_stats(self, window: int) -> Tuple[float, float]:
+        """Mean and sample std of the last `window` returns"""
+        mean = self.returns_sum[window] / window
+        var = (self.returns_sumsq[window] - window * mean * mean) / (window - 1)
+        return mean, float(np.sqrt(max(var, 0.0)))
+
+    def update(self, bar: Dict[str, float]) -> Optional[Dict[str, float]]:
+        """
+        Consume one bar and return its features
+
+        Args:
+            bar: Mapping with 'close' plus any of the indicator columns
+                prepare_features understands
+
+        Returns:
+            Feature dict in prepare_features column order, or None while the
+            look-back windows are still filling
+        """
+        close = float(bar['close'])
+        prev_close = self.closes[-1] if self.closes else np.nan
+        self.closes.append(close)
+        ret = close / prev_close - 1
+        if not np.isnan(ret):
+            self._push_return(ret)
+
+        features: Dict[str, float] = {}
+        features['returns'] = ret
+        features['log_returns'] = np.log1p(ret)
+        features['price_momentum_5'] = close / self.closes[-6] - 1 if len(self.closes) > 5 else np.nan
+        features['price_momentum_10'] = close / self.closes[0] - 1 if len(self.closes) > 10 else np.nan
+
+        if 'volume' in bar:
+            volume = float(bar['volume'])
+            prev_volume = self.volumes[-1] if self.volumes else np.nan
+            self.volumes.append(volume)
+            self.volume_changes.append(volume / prev_volume - 1)
+            features['volume_change'] = self.volume_changes[-1]
+            features['volume_ma_ratio'] = (
+                volume / (sum(self.volumes) / 20) if len(self.volumes) == 20 else np.nan
+            )
+
+        if 'rsi' in bar:
+            rsi = float(bar['rsi'])
+            self.rsis.append(rsi)
+            features['rsi'] = rsi
+            features['rsi_ma'] = sum(self.rsis) / 5 if len(self.rsis) == 5 else np.nan
+            features['rsi_oversold'] = int(rsi < 30)
+            features['rsi_overbought'] = int(rsi > 70)
+
+        if 'macd' in bar:
+            features['macd'] = bar['macd']
+            features['macd_signal'] = bar['macd_signal']
+            features['macd_hist'] = bar['macd_histogram']
+            features['macd_bullish'] = int(bar['macd'] > bar['macd_signal'])
+
+        if 'bb_upper' in bar:
+            bb_range = bar['bb_upper'] - bar['bb_lower']
+            features['bb_position'] = (close - bar['bb_lower']) / bb_range
+            features['bb_width'] = bb_range / bar['bb_middle']
+
+        if 'atr' in bar:
+            features['atr'] = bar['atr']
+            features['atr_pct'] = bar['atr'] / close
+
+        if 'ema_12' in bar and 'ema_26' in bar:
+            features['ema_diff'] = (bar['ema_12'] - bar['ema_26']) / bar['ema_26']
+            features['ema_bullish'] = int(bar['ema_12'] > bar['ema_26'])
+
+        if 'stoch_k' in bar:
+            features['stoch_k'] = bar['stoch_k']
+            features['stoch_d'] = bar['stoch_d']
+            features['stoch_oversold'] = int(bar['stoch_k'] < 20)
+            features['stoch_overbought'] = int(bar['stoch_k'] > 80)
+
+        # Lag features
+        histories = {'returns': self.returns, 'volume_change': self.volume_changes, 'rsi': self.rsis}
+        for name, history in histories.items():
+            if name in features:
+                for lag in [1, 2, 3]:
+                    features[f'{name}_lag{lag}'] = history[-1 - lag] if len(history) > lag else np.nan
+
+        # Rolling statistics
+        for window in (5, 20):
+            if len(self.returns) >= window:
+                mean, std = self._returns_stats(window)
+            else:
+                mean = std = np.nan
+            features[f'returns_mean_{window}'] = mean
+            features[f'returns_std_{window}'] = std
+
+        if any(np.isnan(value) for value in features.values()):
+            return None
+        return features
+
+
+class PredictionStore:
+    """
+    SQLite-backed prediction cache that survives restarts
+
+    Entries are content-addressed: the key is the SHA-256 of the scaled
+    feature vector, the technical score and the model version, so a hit is
+    only possible for exactly the same inputs to exactly the same models.
+
+    Policies:
+        enabled: read and write
+        read_only: read, never write
+        replay: read only; a miss never falls through to the models
+        disabled: no lookups, no writes
+    """
+
+    POLICIES = ('enabled', 'read_only', 'replay', 'disabled')
+
+    def __init__(self, path: str, policy: str = 'enabled'):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path: SQLite file path
+            policy: One of POLICIES
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown prediction cache policy '{policy}', expected one of {self.POLICIES}")
+        self.policy = policy
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS predictions (
+                key BLOB PRIMARY KEY,
+                signal REAL NOT NULL,
+                confidence REAL NOT NULL,
+                probabilities TEXT NOT NULL,
+                model_votes TEXT NOT NULL,
+                reasoning TEXT NOT NULL,
+                ts INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+
+    @staticmethod
+    def make_key(features: np.ndarray, tech_score: float, model_version: str) -> bytes:
+        """Content hash of a prediction's inputs"""
+        digest = hashlib.sha256(np.ascontiguousarray(features, dtype=np.float64).tobytes())
+        digest.update(np.float64(tech_score).tobytes())
+        digest.update(model_version.encode())
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[PredictionResult]:
+        """Look up a cached result"""
+        if self.policy == 'disabled':
+            return None
+
+        row = self.conn.execute(
+            'SELECT signal, confidence, probabilities, model_votes, reasoning FROM predictions WHERE key = ?',
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        return PredictionResult(
+            signal=row[0],
+            confidence=row[1],
+            probabilities=json.loads(row[2]),
+            model_votes=json.loads(row[3]),
+            reasoning=json.loads(row[4])
+        )
+
+    def put(self, key: bytes, result: PredictionResult):
+        """Store a result (only under the 'enabled' policy)"""
+        if self.policy != 'enabled':
+            return
+
+        self.conn.execute(
+            'INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (key, result.signal, result.confidence, json.dumps(result.probabilities),
+             json.dumps(result.model_votes), json.dumps(result.reasoning), int(time.time() * 1000))
+        )
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+
 class EnhancedMLPredictor:
     """
     Enhanced ML predictor with ensemble logic and periodic retraining
@@ -65,7 +461,13 @@ class EnhancedMLPredictor:
         min_training_samples: int = 500,
         ensemble_weights: Optional[Dict[str, float]] = None,
         use_cross_validation: bool = True,
-        cv_folds: int = 5
+        cv_folds: int = 5,
+        cache_path: Optional[str] = None,
+        cache_policy: str = 'enabled',
+        warm_start: bool = False,
+        warm_start_trees: int = 50,
+        max_trees: int = 400,
+        max_boost_rounds: int = 400
     ):
         """
         Initialize enhanced ML predictor
@@ -77,6 +479,12 @@ class EnhancedMLPredictor:
             ensemble_weights: Weights for ensemble models
             use_cross_validation: Use CV for validation
             cv_folds: Number of CV folds
+            cache_path: SQLite file for the persistent prediction cache (None = in-memory only)
+            cache_policy: Persistent cache policy (enabled/read_only/replay/disabled)
+            warm_start: Extend existing models on retrain instead of refitting from scratch
+            warm_start_trees: Trees added to the Random Forest per warm-start retrain
+            max_trees: Forest size cap; the oldest trees are dropped beyond it
+            max_boost_rounds: XGBoost round cap; a warm start that could pass it refits from scratch
         """
         self.model_dir = Path(model_dir)
         self.model_dir.mkdir(exist_ok=True)
@@ -85,6 +493,10 @@ class EnhancedMLPredictor:
         self.min_training_samples = min_training_samples
         self.use_cross_validation = use_cross_validation
         self.cv_folds = cv_folds
+        self.warm_start = warm_start
+        self.warm_start_trees = warm_start_trees
+        self.max_trees = max_trees
+        self.max_boost_rounds = max_boost_rounds
         
         # Ensemble weights (default: equal)
         if ensemble_weights is None:
@@ -100,20 +512,37 @@ class EnhancedMLPredictor:
         total_weight = sum(self.ensemble_weights.values())
         self.ensemble_weights = {k: v/total_weight for k, v in self.ensemble_weights.items()}
         
+        # Fixed-order weight vector matching the vote vector built in _score()
+        self._weight_vec = np.array([self.ensemble_weights.get(name, 0.0) for name in ENSEMBLE_MEMBERS])
+        
         # Models
         self.rf_model: Optional[RandomForestClassifier] = None
+        self.rf_classes: Optional[np.ndarray] = None  # rf_model.classes_, cached for argmax lookups
+        self.rf_fast: Optional[CompiledForest] = None  # flattened rf_model used by predict()
         self.xgb_model = None
+        self.xgb_booster = None  # xgb_model's Booster up to best_iteration, scored via inplace_predict
+        # XGBoost releases the GIL while predicting, so it runs beside the forest
+        self._score_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='xgb-score')
         self.scaler: Optional[StandardScaler] = None
         
         # Performance tracking
         self.performance: Dict[str, ModelPerformance] = {}
         self.last_training_time: Optional[datetime] = None
-        self.prediction_cache: Dict[str, Tuple[PredictionResult, datetime]] = {}
+        # LRU keyed by (bar timestamp in ns, close) -> (result, time.monotonic() at insert)
+        self.prediction_cache: OrderedDict[Tuple[int, float], Tuple[PredictionResult, float]] = OrderedDict()
         self.cache_ttl = 300  # 5 minutes
+        self.cache_size = 1024
+        self.prediction_store = PredictionStore(cache_path, cache_policy) if cache_path else None
+        self.model_version = ''
+        self._online: Dict[str, OnlineFeatures] = {}  # per-symbol streaming state for predict_online()
         
-        # Training data buffer
-        self.training_buffer: List[Dict] = []
+        # Training data buffer: preallocated ring of feature rows and labels,
+        # allocated on the first add_training_samples() call
         self.max_buffer_size = 10000
+        self._buf_X: Optional[np.ndarray] = None
+        self._buf_y: Optional[np.ndarray] = None
+        self._buf_columns: List[str] = []
+        self._buf_head = 0
         
         # Load existing models
         self.load_models()
@@ -121,76 +550,112 @@ class EnhancedMLPredictor:
     def prepare_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Prepare feature matrix from DataFrame
-        
+
+        Columns are pulled out as float64 arrays once and every feature is
+        derived with plain NumPy; the DataFrame is only assembled at the end,
+        with float features downcast to float32.
+
         Args:
             df: DataFrame with OHLCV and indicators
             
         Returns:
             DataFrame with features
         """
-        features = pd.DataFrame(index=df.index)
-        
-        # Price features
-        features['returns'] = df['close'].pct_change()
-        features['log_returns'] = np.log(df['close'] / df['close'].shift(1))
-        features['price_momentum_5'] = df['close'].pct_change(5)
-        features['price_momentum_10'] = df['close'].pct_change(10)
-        
-        # Volume features
-        if 'volume' in df.columns:
-            features['volume_change'] = df['volume'].pct_change()
-            features['volume_ma_ratio'] = df['volume'] / df['volume'].rolling(20).mean()
-        
-        # Technical indicators
-        if 'rsi' in df.columns:
-            features['rsi'] = df['rsi']
-            features['rsi_ma'] = df['rsi'].rolling(5).mean()
-            features['rsi_oversold'] = (df['rsi'] < 30).astype(int)
-            features['rsi_overbought'] = (df['rsi'] > 70).astype(int)
-        
-        if 'macd' in df.columns:
-            features['macd'] = df['macd']
-            features['macd_signal'] = df['macd_signal']
-            features['macd_hist'] = df['macd_histogram']
-            features['macd_bullish'] = (df['macd'] > df['macd_signal']).astype(int)
-        
-        if 'bb_upper' in df.columns:
-            features['bb_position'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
-            features['bb_width'] = (df['bb_upper'] - df['bb_lower']) / df['bb_middle']
-        
-        if 'atr' in df.columns:
-            features['atr'] = df['atr']
-            features['atr_pct'] = df['atr'] / df['close']
-        
-        # EMA features
-        if 'ema_12' in df.columns and 'ema_26' in df.columns:
-            features['ema_diff'] = (df['ema_12'] - df['ema_26']) / df['ema_26']
-            features['ema_bullish'] = (df['ema_12'] > df['ema_26']).astype(int)
-        
-        # Stochastic
-        if 'stoch_k' in df.columns:
-            features['stoch_k'] = df['stoch_k']
-            features['stoch_d'] = df['stoch_d']
-            features['stoch_oversold'] = (df['stoch_k'] < 20).astype(int)
-            features['stoch_overbought'] = (df['stoch_k'] > 80).astype(int)
-        
-        # Lag features
-        for col in ['returns', 'volume_change', 'rsi']:
-            if col in features.columns:
-                for lag in [1, 2, 3]:
-                    features[f'{col}_lag{lag}'] = features[col].shift(lag)
+        col = lambda name: df[name].to_numpy(dtype=np.float64)
+        close = col('close')
+        features: Dict[str, np.ndarray] = {}
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Price features
+            returns = _pct_change(close)
+            features['returns'] = returns
+            features['log_returns'] = np.log1p(returns)
+            features['price_momentum_5'] = _pct_change(close, 5)
+            features['price_momentum_10'] = _pct_change(close, 10)
+            
+            # Volume features
+            if 'volume' in df.columns:
+                volume = col('volume')
+                features['volume_change'] = _pct_change(volume)
+                features['volume_ma_ratio'] = volume / _rolling_mean(volume, 20)
+            
+            # Technical indicators
+            if 'rsi' in df.columns:
+                rsi = col('rsi')
+                features['rsi'] = rsi
+                features['rsi_ma'] = _rolling_mean(rsi, 5)
+                features['rsi_oversold'] = (rsi < 30).view(np.int8)
+                features['rsi_overbought'] = (rsi > 70).view(np.int8)
+            
+            if 'macd' in df.columns:
+                macd, macd_signal = col('macd'), col('macd_signal')
+                features['macd'] = macd
+                features['macd_signal'] = macd_signal
+                features['macd_hist'] = col('macd_histogram')
+                features['macd_bullish'] = (macd > macd_signal).view(np.int8)
+            
+            if 'bb_upper' in df.columns:
+                bb_upper, bb_lower = col('bb_upper'), col('bb_lower')
+                bb_range = bb_upper - bb_lower
+                features['bb_position'] = (close - bb_lower) / bb_range
+                features['bb_width'] = bb_range / col('bb_middle')
+            
+            if 'atr' in df.columns:
+                atr = col('atr')
+                features['atr'] = atr
+                features['atr_pct'] = atr / close
+            
+            # EMA features
+            if 'ema_12' in df.columns and 'ema_26' in df.columns:
+                ema_12, ema_26 = col('ema_12'), col('ema_26')
+                features['ema_diff'] = (ema_12 - ema_26) / ema_26
+                features['ema_bullish'] = (ema_12 > ema_26).view(np.int8)
+            
+            # Stochastic
+            if 'stoch_k' in df.columns:
+                stoch_k = col('stoch_k')
+                features['stoch_k'] = stoch_k
+                features['stoch_d'] = col('stoch_d')
+                features['stoch_oversold'] = (stoch_k < 20).view(np.int8)
+                features['stoch_overbought'] = (stoch_k > 80).view(np.int8)
+            
+            # Lag features
+            for name in ['returns', 'volume_change', 'rsi']:
+                if name in features:
+                    for lag in [1, 2, 3]:
+                        features[f'{name}_lag{lag}'] = _shift(features[name], lag)
+            
+            # Rolling statistics
+            features['returns_mean_5'] = _rolling_mean(returns, 5)
+            features['returns_std_5'] = _rolling_std(returns, 5)
+            features['returns_mean_20'] = _rolling_mean(returns, 20)
+            features['returns_std_20'] = _rolling_std(returns, 20)
         
-        # Rolling statistics
-        if 'returns' in features.columns:
-            features['returns_mean_5'] = features['returns'].rolling(5).mean()
-            features['returns_std_5'] = features['returns'].rolling(5).std()
-            features['returns_mean_20'] = features['returns'].rolling(20).mean()
-            features['returns_std_20'] = features['returns'].rolling(20).std()
+        # Drop the warm-up head unconditionally; past it only gaps in the
+        # input indicators can leave NaNs, so scan just the remaining rows
+        valid = np.arange(len(close)) >= FEATURE_WARMUP
+        for values in features.values():
+            if values.dtype.kind == 'f':
+                valid[FEATURE_WARMUP:] &= ~np.isnan(values[FEATURE_WARMUP:])
         
-        # Drop NaN
-        features = features.dropna()
+        return pd.DataFrame(
+            {name: values[valid].astype(np.float32, copy=False) if values.dtype.kind == 'f' else values[valid]
+             for name, values in features.items()},
+            index=df.index[valid]
+        )
+    
+    def prepare_features_last(self, df: pd.DataFrame, window: int = FEATURE_LOOKBACK) -> pd.DataFrame:
+        """
+        Prepare only the latest feature row from the tail of a DataFrame
         
-        return features
+        Args:
+            df: DataFrame with OHLCV and indicators
+            window: Number of trailing bars to compute features over
+            
+        Returns:
+            DataFrame with at most one row (empty if the tail has no complete row)
+        """
+        return self.prepare_features(df.iloc[-window:]).iloc[-1:]
     
     def create_labels(self, df: pd.DataFrame, forward_periods: int = 5) -> pd.Series:
         """
@@ -203,17 +668,21 @@ class EnhancedMLPredictor:
         Returns:
             Series with labels (1=buy, 0=hold, -1=sell)
         """
-        future_returns = df['close'].shift(-forward_periods) / df['close'] - 1
+        close = df['close'].to_numpy(dtype=np.float64)
         
         # Thresholds for classification
         buy_threshold = 0.02  # 2% gain
         sell_threshold = -0.02  # 2% loss
         
-        labels = pd.Series(0, index=df.index)  # Default: hold
-        labels[future_returns > buy_threshold] = 1  # Buy
-        labels[future_returns < sell_threshold] = -1  # Sell
+        labels = np.zeros(len(close), dtype=np.int8)  # Default: hold (also the last bars with no future)
+        if forward_periods < len(close):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                future_returns = close[forward_periods:] / close[:-forward_periods] - 1
+            head = labels[:-forward_periods]
+            head[future_returns > buy_threshold] = 1  # Buy
+            head[future_returns < sell_threshold] = -1  # Sell
         
-        return labels
+        return pd.Series(labels, index=df.index)
     
     def train_random_forest(
         self,
@@ -259,7 +728,9 @@ class EnhancedMLPredictor:
         
         # Cross-validation
         if self.use_cross_validation:
-            cv_scores = cross_val_score(rf_model, X_train, y_train, cv=self.cv_folds)
+            cv_scores = cross_val_score(
+                rf_model, X_train, y_train, cv=TimeSeriesSplit(n_splits=self.cv_folds), n_jobs=-1
+            )
             logger.info(f"RF CV Score: {cv_scores.mean():.4f} (+/- {cv_scores.std():.4f})")
         
         return rf_model
@@ -269,7 +740,8 @@ class EnhancedMLPredictor:
         X_train: np.ndarray,
         y_train: np.ndarray,
         X_val: Optional[np.ndarray] = None,
-        y_val: Optional[np.ndarray] = None
+        y_val: Optional[np.ndarray] = None,
+        init_model=None
     ):
         """
         Train XGBoost model
@@ -279,6 +751,7 @@ class EnhancedMLPredictor:
             y_train: Training labels
             X_val: Validation features
             y_val: Validation labels
+            init_model: Booster to continue boosting from (warm start)
             
         Returns:
             Trained XGB model
@@ -289,11 +762,24 @@ class EnhancedMLPredictor:
         
         logger.info("Training XGBoost model...")
         
+        if init_model is not None:
+            # Continue from the early-stopping best round, not the overfit tail
+            best_iteration = init_model.attr('best_iteration')
+            if best_iteration is not None:
+                init_model = init_model[:int(best_iteration) + 1]
+            
+            # Boosting rounds can't be retired like forest trees; start over instead
+            if init_model.num_boosted_rounds() + XGB_ROUNDS > self.max_boost_rounds:
+                logger.info(
+                    f"XGB booster at {init_model.num_boosted_rounds()} rounds, refitting from scratch"
+                )
+                init_model = None
+        
         # Convert labels to 0, 1, 2 (XGBoost requirement)
         y_train_xgb = y_train + 1  # -1,0,1 -> 0,1,2
         
         xgb_model = xgb.XGBClassifier(
-            n_estimators=200,
+            n_estimators=XGB_ROUNDS,
             max_depth=10,
             learning_rate=0.05,
             subsample=0.8,
@@ -304,7 +790,9 @@ class EnhancedMLPredictor:
             random_state=42,
             n_jobs=-1,
             objective='multi:softprob',
-            num_class=3
+            tree_method='hist',
+            num_class=3,
+            early_stopping_rounds=20  # constructor argument since xgboost 2.0
         )
         
         eval_set = [(X_train, y_train_xgb)]
@@ -316,8 +804,8 @@ class EnhancedMLPredictor:
             X_train,
             y_train_xgb,
             eval_set=eval_set,
-            early_stopping_rounds=20,
-            verbose=False
+            verbose=False,
+            xgb_model=init_model
         )
         
         train_score = xgb_model.score(X_train, y_train_xgb)
@@ -329,6 +817,20 @@ class EnhancedMLPredictor:
         
         return xgb_model
     
+    def _retrain_due(self, force_retrain: bool) -> bool:
+        """Check whether the retrain interval has elapsed"""
+        if force_retrain or self.last_training_time is None:
+            return True
+        
+        time_since_training = datetime.now() - self.last_training_time
+        if time_since_training < self.retrain_interval:
+            logger.debug(
+                f"Retraining not needed yet. "
+                f"Next in {self.retrain_interval - time_since_training}"
+            )
+            return False
+        return True
+    
     def train_models(
         self,
         df: pd.DataFrame,
@@ -345,16 +847,8 @@ class EnhancedMLPredictor:
             True if training was performed
         """
         try:
-            # Check if retraining needed
-            if not force_retrain:
-                if self.last_training_time is not None:
-                    time_since_training = datetime.now() - self.last_training_time
-                    if time_since_training < self.retrain_interval:
-                        logger.debug(
-                            f"Retraining not needed yet. "
-                            f"Next in {self.retrain_interval - time_since_training}"
-                        )
-                        return False
+            if not self._retrain_due(force_retrain):
+                return False
             
             logger.info("Starting model training...")
             
@@ -367,50 +861,170 @@ class EnhancedMLPredictor:
             features = features.loc[common_index]
             labels = labels.loc[common_index]
             
-            if len(features) < self.min_training_samples:
-                logger.warning(
-                    f"Insufficient training samples: {len(features)} < {self.min_training_samples}"
-                )
-                return False
-            
-            logger.info(f"Training with {len(features)} samples")
-            
-            # Split data
-            X_train, X_val, y_train, y_val = train_test_split(
-                features.values,
-                labels.values,
-                test_size=0.2,
-                random_state=42,
-                stratify=labels.values
+            return self._fit(
+                features.to_numpy(dtype=np.float32, copy=False),
+                labels.to_numpy(dtype=np.int8, copy=False),
+                features.columns.tolist()
             )
             
-            # Scale features
-            self.scaler = StandardScaler()
-            X_train_scaled = self.scaler.fit_transform(X_train)
-            X_val_scaled = self.scaler.transform(X_val)
-            
-            # Train Random Forest
-            self.rf_model = self.train_random_forest(X_train_scaled, y_train, X_val_scaled, y_val)
-            
-            # Train XGBoost
-            if XGBOOST_AVAILABLE and self.ensemble_weights.get('xgboost', 0) > 0:
-                self.xgb_model = self.train_xgboost(X_train_scaled, y_train, X_val_scaled, y_val)
-            
-            # Calculate performance metrics
-            self.calculate_performance_metrics(X_val_scaled, y_val, features.columns.tolist())
+        except Exception as e:
+            logger.exception(f"Error during model training: {e}")
+            return False
+    
+    def add_training_samples(self, features: pd.DataFrame, labels: pd.Series):
+        """
+        Append labelled feature rows to the training ring buffer
+        
+        Once max_buffer_size rows are held, new rows overwrite the oldest.
+        
+        Args:
+            features: Feature rows as produced by prepare_features()
+            labels: Labels aligned with features (-1, 0, 1)
+        """
+        if self._buf_X is None or list(features.columns) != self._buf_columns:
+            self._buf_columns = list(features.columns)
+            self._buf_X = np.empty((self.max_buffer_size, len(self._buf_columns)), dtype=np.float32)
+            self._buf_y = np.empty(self.max_buffer_size, dtype=np.int8)
+            self._buf_head = 0
+        
+        X = features.to_numpy(dtype=np.float32)[-self.max_buffer_size:]
+        y = labels.to_numpy(dtype=np.int8)[-self.max_buffer_size:]
+        self._buf_head += len(features)
+        slots = (self._buf_head - len(X) + np.arange(len(X))) % self.max_buffer_size
+        self._buf_X[slots] = X
+        self._buf_y[slots] = y
+    
+    def train_from_buffer(self, force_retrain: bool = False) -> bool:
+        """
+        Train or retrain models on the rows held in the training buffer
+        
+        Args:
+            force_retrain: Force retraining regardless of schedule
             
-            # Save models
-            self.save_models(features.columns.tolist())
+        Returns:
+            True if training was performed
+        """
+        try:
+            if self._buf_X is None or not self._retrain_due(force_retrain):
+                return False
             
-            self.last_training_time = datetime.now()
-            logger.info("✅ Model training completed successfully")
+            logger.info("Starting model training from buffer...")
             
-            return True
+            # Unroll the ring oldest-first so the chronological split holds
+            filled = min(self._buf_head, self.max_buffer_size)
+            order = (self._buf_head - filled + np.arange(filled)) % self.max_buffer_size
+            return self._fit(self._buf_X[order], self._buf_y[order], self._buf_columns)
             
         except Exception as e:
             logger.exception(f"Error during model training: {e}")
             return False
     
+    def _fit(self, X: np.ndarray, y: np.ndarray, feature_names: List[str]) -> bool:
+        """
+        Split, scale and fit the ensemble on a feature matrix
+        
+        Args:
+            X: Feature matrix
+            y: Labels (-1, 0, 1)
+            feature_names: Column names of X
+            
+        Returns:
+            True if training was performed
+        """
+        if len(X) < self.min_training_samples:
+            logger.warning(
+                f"Insufficient training samples: {len(X)} < {self.min_training_samples}"
+            )
+            return False
+        
+        logger.info(f"Training with {len(X)} samples")
+        X = np.asarray(X, dtype=np.float32)
+        
+        # Chronological split: validate on the most recent 20% so no future
+        # bars leak into training
+        split = int(len(X) * 0.8)
+        X_train, X_val = X[:split], X[split:]
+        y_train, y_val = y[:split], y[split:]
+        
+        # Warm starts keep the existing scaler: the current trees were grown on its scale
+        warm = self._can_warm_start(X.shape[1], y_train)
+        if not warm:
+            # Scale features; float32 statistics keep the scaled matrices float32
+            self.scaler = StandardScaler().fit(X_train)
+            self.scaler.mean_ = self.scaler.mean_.astype(np.float32)
+            self.scaler.scale_ = self.scaler.scale_.astype(np.float32)
+        X_train_scaled = self.scaler.transform(X_train)
+        X_val_scaled = self.scaler.transform(X_val)
+        
+        # Train Random Forest and XGBoost side by side; both release the GIL while fitting
+        train_xgb = XGBOOST_AVAILABLE and self.ensemble_weights.get('xgboost', 0) > 0
+        if warm:
+            logger.info("Warm-starting models from the current ensemble")
+            jobs = [delayed(self.extend_random_forest)(X_train_scaled, y_train)]
+        else:
+            jobs = [delayed(self.train_random_forest)(X_train_scaled, y_train, X_val_scaled, y_val)]
+        if train_xgb:
+            init_model = self.xgb_booster if warm else None
+            jobs.append(delayed(self.train_xgboost)(X_train_scaled, y_train, X_val_scaled, y_val, init_model))
+        models = Parallel(n_jobs=len(jobs), prefer='threads')(jobs)
+        
+        self.rf_model = models[0]
+        self.rf_classes = self.rf_model.classes_
+        self.rf_fast = CompiledForest(self.rf_model)
+        if train_xgb:
+            self.xgb_model = models[1]
+            self.xgb_booster = _best_booster(self.xgb_model) if self.xgb_model is not None else None
+        
+        # Calculate performance metrics
+        self.calculate_performance_metrics(X_val_scaled, y_val, feature_names)
+        
+        # Save models
+        self.save_models(feature_names)
+        
+        self.last_training_time = datetime.now()
+        logger.info("✅ Model training completed successfully")
+        
+        return True
+    
+    def _can_warm_start(self, n_features: int, y_train: np.ndarray) -> bool:
+        """Check whether the current models can be extended with new data"""
+        return (
+            self.warm_start
+            and self.rf_model is not None
+            and self.scaler is not None
+            and getattr(self.scaler, 'n_features_in_', None) == n_features
+            and np.array_equal(np.unique(y_train), self.rf_model.classes_)
+        )
+    
+    def extend_random_forest(self, X_train: np.ndarray, y_train: np.ndarray) -> RandomForestClassifier:
+        """
+        Grow the current Random Forest by warm_start_trees trees fitted on new data
+        
+        Args:
+            X_train: Training features (scaled with the current scaler)
+            y_train: Training labels
+            
+        Returns:
+            Extended RF model
+        """
+        rf_model = self.rf_model
+        # The 'balanced' preset would be recomputed from this window only; pin it explicitly
+        class_weight = compute_class_weight('balanced', classes=rf_model.classes_, y=y_train)
+        rf_model.set_params(
+            warm_start=True,
+            n_estimators=len(rf_model.estimators_) + self.warm_start_trees,
+            class_weight=dict(zip(rf_model.classes_, class_weight))
+        )
+        rf_model.fit(X_train, y_train)
+        
+        # Keep the forest bounded by retiring the oldest trees
+        if len(rf_model.estimators_) > self.max_trees:
+            rf_model.estimators_ = rf_model.estimators_[-self.max_trees:]
+            rf_model.n_estimators = self.max_trees
+        
+        logger.info(f"RF extended to {len(rf_model.estimators_)} trees")
+        return rf_model
+    
     def calculate_performance_metrics(
         self,
         X_val: np.ndarray,
@@ -489,10 +1103,11 @@ class EnhancedMLPredictor:
         """
         try:
             # Check cache
-            cache_key = f"{df['close'].iloc[-1]}_{df.index[-1]}"
+            cache_key = (int(df.index[-1].value), round(float(df['close'].iloc[-1]), 8))
             if use_cache and cache_key in self.prediction_cache:
                 cached_result, cache_time = self.prediction_cache[cache_key]
-                if (datetime.now() - cache_time).total_seconds() < self.cache_ttl:
+                if time.monotonic() - cache_time < self.cache_ttl:
+                    self.prediction_cache.move_to_end(cache_key)
                     logger.debug("Using cached prediction")
                     return cached_result
             
@@ -507,8 +1122,8 @@ class EnhancedMLPredictor:
                     reasoning=["Models not trained yet"]
                 )
             
-            # Prepare features
-            features = self.prepare_features(df)
+            # Prepare features for the latest bar only
+            features = self.prepare_features_last(df)
             if features.empty:
                 logger.warning("No valid features, returning neutral")
                 return PredictionResult(
@@ -519,75 +1134,159 @@ class EnhancedMLPredictor:
                     reasoning=["Insufficient feature data"]
                 )
             
-            latest_features = features.iloc[-1:].values
+            latest_features = features.iloc[-1:].to_numpy(dtype=np.float32, copy=False)
             latest_features_scaled = self.scaler.transform(latest_features)
+            tech_score = self.calculate_technical_score(df)
             
-            # Collect model predictions
-            model_votes = {}
-            probabilities_list = []
-            reasoning = []
-            
-            # Random Forest prediction
-            if self.rf_model is not None:
-                rf_proba = self.rf_model.predict_proba(latest_features_scaled)[0]
-                rf_pred = self.rf_model.predict(latest_features_scaled)[0]
-                model_votes['random_forest'] = float(rf_pred)
-                probabilities_list.append(rf_proba)
-                reasoning.append(
-                    f"RF: {['Sell', 'Hold', 'Buy'][int(rf_pred)+1]} "
-                    f"(conf: {max(rf_proba):.2f})"
+            # Check persistent cache
+            store_key = None
+            if use_cache and self.prediction_store is not None:
+                store_key = PredictionStore.make_key(
+                    latest_features_scaled, tech_score,
+                    f"{self.model_version}:{json.dumps(self.ensemble_weights, sort_keys=True)}"
                 )
+                stored = self.prediction_store.get(store_key)
+                if stored is not None:
+                    self._remember(cache_key, stored)
+                    return stored
+                if self.prediction_store.policy == 'replay':
+                    logger.warning("Prediction not found in replay cache, returning neutral")
+                    return PredictionResult(
+                        signal=0.0,
+                        confidence=0.3,
+                        probabilities={'buy': 0.33, 'hold': 0.34, 'sell': 0.33},
+                        model_votes={},
+                        reasoning=["Replay cache miss"]
+                    )
             
-            # XGBoost prediction
-            if self.xgb_model is not None:
-                xgb_proba = self.xgb_model.predict_proba(latest_features_scaled)[0]
-                xgb_pred = self.xgb_model.predict(latest_features_scaled)[0] - 1
-                model_votes['xgboost'] = float(xgb_pred)
-                probabilities_list.append(xgb_proba)
-                reasoning.append(
-                    f"XGB: {['Sell', 'Hold', 'Buy'][int(xgb_pred)+1]} "
-                    f"(conf: {max(xgb_proba):.2f})"
-                )
+            result = self._score(latest_features_scaled, tech_score)
             
-            # Technical score (simple heuristic)
-            tech_score = self.calculate_technical_score(df)
-            model_votes['technical_score'] = tech_score
-            reasoning.append(f"Technical score: {tech_score:.2f}")
+            # Cache result
+            self._remember(cache_key, result)
+            if store_key is not None:
+                self.prediction_store.put(store_key, result)
+            
+            return result
             
-            # Ensemble weighted vote
-            ensemble_signal = sum(
-                vote * self.ensemble_weights.get(name, 0)
-                for name, vote in model_votes.items()
+        except Exception as e:
+            logger.exception(f"Error making prediction: {e}")
+            return PredictionResult(
+                signal=0.0,
+                confidence=0.3,
+                probabilities={'buy': 0.33, 'hold': 0.34, 'sell': 0.33},
+                model_votes={},
+                reasoning=[f"Error: {str(e)}"]
             )
+    
+    def _score(self, features_scaled: np.ndarray, tech_score: float) -> PredictionResult:
+        """
+        Run the ensemble on one scaled feature row
+        
+        Args:
+            features_scaled: Scaled feature matrix of shape (1, n_features)
+            tech_score: Technical score of the same bar
             
-            # Average probabilities
-            if probabilities_list:
-                avg_proba = np.mean(probabilities_list, axis=0)
-                probabilities = {
-                    'sell': float(avg_proba[0]),
-                    'hold': float(avg_proba[1]),
-                    'buy': float(avg_proba[2])
-                }
-                confidence = float(max(avg_proba))
-            else:
-                probabilities = {'buy': 0.33, 'hold': 0.34, 'sell': 0.33}
-                confidence = 0.5
-            
-            result = PredictionResult(
-                signal=float(np.clip(ensemble_signal, -1, 1)),
-                confidence=confidence,
-                probabilities=probabilities,
-                model_votes=model_votes,
-                reasoning=reasoning
+        Returns:
+            PredictionResult with ensemble prediction
+        """
+        # Collect model predictions
+        model_votes = {}
+        probabilities_list = []
+        reasoning = []
+        vote_vec = np.zeros(len(ENSEMBLE_MEMBERS))
+        
+        # XGBoost scores on the worker thread while the forest runs here
+        xgb_future = (
+            self._score_pool.submit(self.xgb_booster.inplace_predict, features_scaled)
+            if self.xgb_booster is not None else None
+        )
+        
+        # Random Forest prediction
+        if self.rf_model is not None:
+            rf_proba = self.rf_fast.predict_proba(features_scaled)[0]
+            rf_pred = self.rf_classes[int(np.argmax(rf_proba))]
+            model_votes['random_forest'] = vote_vec[0] = float(rf_pred)
+            probabilities_list.append(rf_proba)
+            reasoning.append(
+                f"RF: {['Sell', 'Hold', 'Buy'][int(rf_pred)+1]} "
+                f"(conf: {max(rf_proba):.2f})"
+            )
+        
+        # XGBoost prediction
+        if xgb_future is not None:
+            xgb_proba = xgb_future.result()[0]
+            xgb_pred = int(np.argmax(xgb_proba)) - 1  # 0,1,2 -> -1,0,1
+            model_votes['xgboost'] = vote_vec[1] = float(xgb_pred)
+            probabilities_list.append(xgb_proba)
+            reasoning.append(
+                f"XGB: {['Sell', 'Hold', 'Buy'][int(xgb_pred)+1]} "
+                f"(conf: {max(xgb_proba):.2f})"
             )
+        
+        # Technical score (simple heuristic)
+        model_votes['technical_score'] = vote_vec[2] = tech_score
+        reasoning.append(f"Technical score: {tech_score:.2f}")
+        
+        # Ensemble weighted vote
+        ensemble_signal = float(self._weight_vec @ vote_vec)
+        
+        # Average probabilities
+        if probabilities_list:
+            avg_proba = np.mean(probabilities_list, axis=0)
+            probabilities = {
+                'sell': float(avg_proba[0]),
+                'hold': float(avg_proba[1]),
+                'buy': float(avg_proba[2])
+            }
+            confidence = float(max(avg_proba))
+        else:
+            probabilities = {'buy': 0.33, 'hold': 0.34, 'sell': 0.33}
+            confidence = 0.5
+        
+        return PredictionResult(
+            signal=float(np.clip(ensemble_signal, -1, 1)),
+            confidence=confidence,
+            probabilities=probabilities,
+            model_votes=model_votes,
+            reasoning=reasoning
+        )
+    
+    def predict_online(self, symbol: str, bar: Dict[str, float]) -> PredictionResult:
+        """
+        Predict from a single new bar using streaming feature state
+        
+        Each symbol keeps its own state. Bars must be fed in order per symbol;
+        the first ~25 bars of a symbol only warm up the look-back windows and
+        return a neutral prediction.
+        
+        Args:
+            symbol: Trading pair the bar belongs to
+            bar: Mapping (or Series) with the latest OHLCV and indicator values
             
-            # Cache result
-            self.prediction_cache[cache_key] = (result, datetime.now())
+        Returns:
+            PredictionResult with ensemble prediction
+        """
+        try:
+            online = self._online.get(symbol)
+            if online is None:
+                online = self._online[symbol] = OnlineFeatures()
+            features = online.update(bar)
             
-            return result
+            if features is None or self.rf_model is None or self.scaler is None:
+                return PredictionResult(
+                    signal=0.0,
+                    confidence=0.3,
+                    probabilities={'buy': 0.33, 'hold': 0.34, 'sell': 0.33},
+                    model_votes={},
+                    reasoning=["Models not trained yet" if features is not None else "Warming up feature state"]
+                )
+            
+            features_scaled = self.scaler.transform(np.array([list(features.values())], dtype=np.float32))
+            tech_score = _technical_score(bar)
+            return self._score(features_scaled, tech_score)
             
         except Exception as e:
-            logger.exception(f"Error making prediction: {e}")
+            logger.exception(f"Error making online prediction: {e}")
             return PredictionResult(
                 signal=0.0,
                 confidence=0.3,
@@ -596,6 +1295,101 @@ class EnhancedMLPredictor:
                 reasoning=[f"Error: {str(e)}"]
             )
     
+    def _remember(self, cache_key: Tuple[int, float], result: PredictionResult):
+        """Insert into the in-memory LRU, evicting the oldest entry when full"""
+        self.prediction_cache[cache_key] = (result, time.monotonic())
+        self.prediction_cache.move_to_end(cache_key)
+        if len(self.prediction_cache) > self.cache_size:
+            self.prediction_cache.popitem(last=False)
+    
+    def predict_batch(
+        self,
+        df: pd.DataFrame,
+        indices: Optional[Sequence] = None
+    ) -> List[PredictionResult]:
+        """
+        Score many rows with one feature pass and one predict_proba per model
+        
+        Args:
+            df: DataFrame with OHLCV and indicators
+            indices: Index labels of rows to score (default: every row with
+                complete features)
+            
+        Returns:
+            List of PredictionResult, one per scored row in index order
+        """
+        try:
+            if self.rf_model is None or self.scaler is None:
+                logger.warning("Models not trained, cannot score batch")
+                return []
+            
+            features = self.prepare_features(df)
+            if indices is not None:
+                features = features[features.index.isin(indices)]
+            if features.empty:
+                return []
+            
+            X_scaled = self.scaler.transform(features.to_numpy())
+            positions = df.index.get_indexer(features.index)
+            
+            # One (n_rows,) vote column and one (n_rows, 3) probability block per model
+            names, votes, probas = [], [], []
+            
+            xgb_future = (
+                self._score_pool.submit(self.xgb_booster.inplace_predict, X_scaled)
+                if self.xgb_booster is not None else None
+            )
+            
+            rf_proba = self.rf_fast.predict_proba(X_scaled)
+            names.append('random_forest')
+            votes.append(self.rf_classes[rf_proba.argmax(axis=1)].astype(np.float64))
+            probas.append(rf_proba)
+            
+            if xgb_future is not None:
+                xgb_proba = xgb_future.result()
+                names.append('xgboost')
+                votes.append(xgb_proba.argmax(axis=1) - 1.0)
+                probas.append(xgb_proba)
+            
+            names.append('technical_score')
+            votes.append(self.calculate_technical_scores(df)[positions])
+            
+            vote_matrix = np.column_stack(votes)
+            weights = self._weight_vec[[ENSEMBLE_MEMBERS.index(name) for name in names]]
+            signals = np.clip(np.einsum('ij,j->i', vote_matrix, weights), -1, 1)
+            
+            avg_proba = np.mean(probas, axis=0)
+            confidences = avg_proba.max(axis=1)
+            labels = np.array(['Sell', 'Hold', 'Buy'])
+            model_labels = [labels[vote.astype(int) + 1] for vote in votes[:-1]]
+            model_confs = [proba.max(axis=1) for proba in probas]
+            
+            results = []
+            for i in range(len(features)):
+                reasoning = [
+                    f"{tag}: {model_labels[m][i]} (conf: {model_confs[m][i]:.2f})"
+                    for m, tag in enumerate(['RF', 'XGB'][:len(probas)])
+                ]
+                reasoning.append(f"Technical score: {vote_matrix[i, -1]:.2f}")
+                
+                results.append(PredictionResult(
+                    signal=float(signals[i]),
+                    confidence=float(confidences[i]),
+                    probabilities={
+                        'sell': float(avg_proba[i, 0]),
+                        'hold': float(avg_proba[i, 1]),
+                        'buy': float(avg_proba[i, 2])
+                    },
+                    model_votes={name: float(vote_matrix[i, j]) for j, name in enumerate(names)},
+                    reasoning=reasoning
+                ))
+            
+            return results
+            
+        except Exception as e:
+            logger.exception(f"Error making batch prediction: {e}")
+            return []
+    
     def calculate_technical_score(self, df: pd.DataFrame) -> float:
         """
         Calculate simple technical score from indicators
@@ -603,61 +1397,43 @@ class EnhancedMLPredictor:
         Returns:
             Score from -1 to 1
         """
-        score = 0.0
+        # One row lookup instead of a label lookup per indicator column
+        return _technical_score(df.iloc[-1])
+    
+    def calculate_technical_scores(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Calculate the technical score for every row at once
+        
+        Returns:
+            Array of scores from -1 to 1
+        """
+        score = np.zeros(len(df))
         count = 0
         
         # RSI
         if 'rsi' in df.columns:
-            rsi = df['rsi'].iloc[-1]
-            if rsi < 30:
-                score += 1
-            elif rsi > 70:
-                score -= 1
-            else:
-                score += (50 - rsi) / 20  # Linear between 30-70
+            rsi = df['rsi'].to_numpy(dtype=np.float64)
+            score += np.where(rsi < 30, 1.0, np.where(rsi > 70, -1.0, (50 - rsi) / 20))  # Linear between 30-70
             count += 1
         
         # MACD
         if 'macd' in df.columns and 'macd_signal' in df.columns:
-            if df['macd'].iloc[-1] > df['macd_signal'].iloc[-1]:
-                score += 0.5
-            else:
-                score -= 0.5
+            score += np.where(df['macd'].to_numpy() > df['macd_signal'].to_numpy(), 0.5, -0.5)
             count += 1
         
         # EMA trend
         if 'ema_12' in df.columns and 'ema_26' in df.columns:
-            if df['ema_12'].iloc[-1] > df['ema_26'].iloc[-1]:
-                score += 0.5
-            else:
-                score -= 0.5
+            score += np.where(df['ema_12'].to_numpy() > df['ema_26'].to_numpy(), 0.5, -0.5)
             count += 1
         
-        return score / count if count > 0 else 0.0
+        return score / count if count > 0 else score
     
     def save_models(self, feature_names: List[str]):
-        """Save models and metadata"""
+        """Save models, scaler and metadata as one compressed artifact"""
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.model_version = timestamp
             
-            # Save Random Forest
-            if self.rf_model is not None:
-                rf_path = self.model_dir / f'rf_model_{timestamp}.joblib'
-                joblib.dump(self.rf_model, rf_path)
-                logger.info(f"RF model saved to {rf_path}")
-            
-            # Save XGBoost
-            if self.xgb_model is not None:
-                xgb_path = self.model_dir / f'xgb_model_{timestamp}.json'
-                self.xgb_model.save_model(str(xgb_path))
-                logger.info(f"XGB model saved to {xgb_path}")
-            
-            # Save scaler
-            if self.scaler is not None:
-                scaler_path = self.model_dir / f'scaler_{timestamp}.joblib'
-                joblib.dump(self.scaler, scaler_path)
-            
-            # Save metadata
             metadata = {
                 'timestamp': timestamp,
                 'feature_names': feature_names,
@@ -672,11 +1448,20 @@ class EnhancedMLPredictor:
                 'ensemble_weights': self.ensemble_weights
             }
             
-            metadata_path = self.model_dir / f'metadata_{timestamp}.json'
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            bundle = {
+                'rf': self.rf_model,
+                'xgb_bytes': bytes(self.xgb_booster.save_raw('ubj')) if self.xgb_booster is not None else None,
+                'scaler': self.scaler,
+                'meta': metadata
+            }
+            
+            # Write atomically so a crash never leaves a truncated artifact behind
+            path = self.model_dir / MODEL_ARTIFACT
+            tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+            joblib.dump(bundle, tmp_path, compress=MODEL_COMPRESSION)
+            os.replace(tmp_path, path)
             
-            logger.info("Model metadata saved")
+            logger.info(f"Models saved to {path}")
             
         except Exception as e:
             logger.exception(f"Error saving models: {e}")
@@ -684,33 +1469,60 @@ class EnhancedMLPredictor:
     def load_models(self):
         """Load latest models"""
         try:
-            # Find latest models
-            rf_models = sorted(self.model_dir.glob('rf_model_*.joblib'))
-            xgb_models = sorted(self.model_dir.glob('xgb_model_*.json'))
-            scalers = sorted(self.model_dir.glob('scaler_*.joblib'))
+            path = self.model_dir / MODEL_ARTIFACT
+            if not path.exists():
+                self._load_legacy_models()
+                return
+            
+            bundle = joblib.load(path)
             
-            if rf_models:
-                self.rf_model = joblib.load(rf_models[-1])
-                logger.info(f"Loaded RF model: {rf_models[-1].name}")
+            if bundle['rf'] is not None:
+                self.rf_model = bundle['rf']
+                self.rf_classes = self.rf_model.classes_
+                self.rf_fast = CompiledForest(self.rf_model)
             
-            if xgb_models and XGBOOST_AVAILABLE:
+            if bundle['xgb_bytes'] is not None and XGBOOST_AVAILABLE:
                 self.xgb_model = xgb.XGBClassifier()
-                self.xgb_model.load_model(str(xgb_models[-1]))
-                logger.info(f"Loaded XGB model: {xgb_models[-1].name}")
-            
-            if scalers:
-                self.scaler = joblib.load(scalers[-1])
-                logger.info(f"Loaded scaler: {scalers[-1].name}")
-            
-            # Load metadata
-            metadata_files = sorted(self.model_dir.glob('metadata_*.json'))
-            if metadata_files:
-                with open(metadata_files[-1], 'r') as f:
-                    metadata = json.load(f)
-                    logger.info(f"Loaded metadata from {metadata_files[-1].name}")
-                    
+                self.xgb_model.load_model(bytearray(bundle['xgb_bytes']))
+                self.xgb_booster = _best_booster(self.xgb_model)
+            
+            self.scaler = bundle['scaler']
+            self.model_version = bundle['meta'].get('timestamp', '')
+            logger.info(f"Loaded models from {path.name} ({self.model_version})")
+            
         except Exception as e:
             logger.exception(f"Error loading models: {e}")
+    
+    def _load_legacy_models(self):
+        """Load models saved as separate timestamped files by older versions"""
+        # Find latest models
+        rf_models = sorted(self.model_dir.glob('rf_model_*.joblib'))
+        xgb_models = sorted(self.model_dir.glob('xgb_model_*.json'))
+        scalers = sorted(self.model_dir.glob('scaler_*.joblib'))
+        
+        if rf_models:
+            self.rf_model = joblib.load(rf_models[-1])
+            self.rf_classes = self.rf_model.classes_
+            self.rf_fast = CompiledForest(self.rf_model)
+            logger.info(f"Loaded RF model: {rf_models[-1].name}")
+        
+        if xgb_models and XGBOOST_AVAILABLE:
+            self.xgb_model = xgb.XGBClassifier()
+            self.xgb_model.load_model(str(xgb_models[-1]))
+            self.xgb_booster = _best_booster(self.xgb_model)
+            logger.info(f"Loaded XGB model: {xgb_models[-1].name}")
+        
+        if scalers:
+            self.scaler = joblib.load(scalers[-1])
+            logger.info(f"Loaded scaler: {scalers[-1].name}")
+        
+        # Load metadata
+        metadata_files = sorted(self.model_dir.glob('metadata_*.json'))
+        if metadata_files:
+            with open(metadata_files[-1], 'r') as f:
+                metadata = json.load(f)
+                self.model_version = metadata.get('timestamp', '')
+                logger.info(f"Loaded metadata from {metadata_files[-1].name}")
 
 
 # Example usage
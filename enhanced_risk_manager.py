@@ -1,8 +1,18 @@
 """
 Enhanced Risk Manager with Dynamic Position Sizing and Capital Preservation
 Advanced risk management with volatility-based sizing, circuit breakers, and real-time SL/TP
+
+Sizing and stop-loss methods read a precomputed df['atr'] column; run
+ensure_atr() once per bar before calling into the risk manager rather
+than recomputing ATR per call.
 """
 
+import bisect
+import logging
+import math
+import sys
+import time
+
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
@@ -10,10 +20,86 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from logger import setup_logger
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed"""
+        return lambda func: func
+
 logger = setup_logger('enhanced_risk_manager')
 
+# Slotted dataclasses need Python 3.10; older interpreters fall back to __dict__
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+ATR_PERIOD = 14
+TRAILING_ACTIVATION_PCT = 2.0  # profit that arms the trailing stop
+KELLY_CONTINUOUS_MIN_TRADES = 30  # closed trades before switching to continuous Kelly
+TP_RISK_MULTIPLES = (2.0, 3.0, 5.0)  # take-profit distances in multiples of stop risk
+
+
+def ensure_atr(df: pd.DataFrame, n: int = ATR_PERIOD) -> pd.DataFrame:
+    """
+    Add a Wilder-smoothed 'atr' column if the frame does not have one
+    
+    Args:
+        df: OHLC DataFrame
+        n: ATR period
+        
+    Returns:
+        The same DataFrame with an 'atr' column
+    """
+    if 'atr' in df.columns:
+        return df
+    
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    
+    # True range; fmax skips the missing previous close on the first bar
+    tr = np.fmax.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    df['atr'] = pd.Series(tr, index=df.index).ewm(alpha=1 / n, adjust=False).mean()
+    return df
+
+
+@njit(cache=True, fastmath=True)
+def _combine_size(
+    base, strength, confidence, current_dd, dd_threshold,
+    daily_pnl, loss_threshold, gain_threshold, kelly_mult, min_size, max_size
+):
+    """
+    Apply the dynamic sizing multipliers to a base size and clamp it
+    
+    Returns:
+        Tuple of (size, strength, confidence, drawdown, daily P&L) multipliers
+    """
+    # Signal strength (50 = neutral, 100 = strong) and confidence
+    strength_mult = (strength / 50.0) ** 0.5  # 0.7 to 1.4
+    confidence_mult = 0.5 + confidence * 0.5  # 0.5 to 1.0
+    
+    # Reduce size in drawdown
+    dd_mult = 0.5 if current_dd > dd_threshold else 1.0
+    
+    # Reduce size after losses, increase after wins
+    if daily_pnl < -loss_threshold:
+        pnl_mult = 0.5
+    elif daily_pnl > gain_threshold:
+        pnl_mult = 1.2
+    else:
+        pnl_mult = 1.0
+    
+    size = base * strength_mult * confidence_mult * dd_mult * pnl_mult * kelly_mult
+    size = max(min_size, min(size, max_size))
+    return size, strength_mult, confidence_mult, dd_mult, pnl_mult
+
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Position:
     """Trading position with risk parameters"""
     symbol: str
@@ -28,6 +114,15 @@ class Position:
     trailing_stop_active: bool = False
     highest_price: float = 0.0
     lowest_price: float = float('inf')
+    activation_price: float = field(init=False, repr=False, default=0.0)
+    
+    def __post_init__(self):
+        """Precompute the price at which the trailing stop arms"""
+        move = TRAILING_ACTIVATION_PCT / 100
+        if self.side == 'long':
+            self.activation_price = self.entry_price * (1 + move)
+        else:
+            self.activation_price = self.entry_price * (1 - move)
     
     def update_pnl(self, current_price: float):
         """Update unrealized PNL"""
@@ -47,7 +142,7 @@ class Position:
         return (self.unrealized_pnl / (self.entry_price * self.size)) * 100
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RiskMetrics:
     """Real-time risk metrics"""
     total_exposure: float
@@ -100,6 +195,11 @@ class EnhancedRiskManager:
         self.max_daily_loss_pct = max_daily_loss_pct
         self.max_drawdown_pct = max_drawdown_pct
         
+        # Derived limits used on every sizing call
+        self._max_pos_frac = max_position_size_pct / 100
+        self._half_max_dd = max_drawdown_pct / 2
+        self._half_max_dl = max_daily_loss_pct / 2
+        
         self.use_kelly_criterion = use_kelly_criterion
         self.kelly_fraction = kelly_fraction
         
@@ -107,20 +207,156 @@ class EnhancedRiskManager:
         self.trailing_stop_pct = trailing_stop_pct
         
         self.positions: Dict[str, Position] = {}
+        # Full trade history; statistics come from running aggregates, not scans of this list
         self.closed_positions: List[Position] = []
         
         self.daily_start_capital = initial_capital
         self.day_start_date = datetime.now().date()
+        self._next_day_ts = self._next_midnight_ts(self.day_start_date)
         
         self.circuit_breaker_active = False
         self.circuit_breaker_until: Optional[datetime] = None
+        self._cb_until_ts = 0.0  # epoch seconds; compared on every check
         
         self.trade_history: List[Dict] = []
         
+        # Running aggregates over closed_positions, maintained by record_closed_position()
+        self._reset_closed_stats()
+        
+        # Open positions as parallel arrays (one slot per entry of self.positions)
+        self._pos_objs: List[Position] = []
+        self._pos_idx: Dict[str, int] = {}
+        self._pos_entry = np.empty(0, dtype=np.float64)
+        self._pos_size = np.empty(0, dtype=np.float64)
+        self._pos_side = np.empty(0, dtype=np.float64)  # +1 long, -1 short
+        self._pos_high = np.empty(0, dtype=np.float64)
+        self._pos_low = np.empty(0, dtype=np.float64)
+        
+    def _reset_closed_stats(self):
+        """Clear the closed-position aggregates"""
+        self._n_closed = 0
+        self._n_wins = 0
+        self._n_losses = 0
+        self._sum_wins = 0.0
+        self._sum_losses = 0.0
+        self._sum_ret = 0.0
+        self._sum_ret_sq = 0.0
+        self._sorted_pnl: List[float] = []  # realized P&L kept sorted for VaR
+        self._loss_streak = 0  # consecutive losing trades at the end of the history
+    
+    def _record_closed(self, position: Position):
+        """Fold one closed position into the running aggregates"""
+        pnl = position.realized_pnl
+        self._n_closed += 1
+        if pnl > 0:
+            self._n_wins += 1
+            self._sum_wins += pnl
+        elif pnl < 0:
+            self._n_losses += 1
+            self._sum_losses -= pnl
+        ret = pnl / self.initial_capital
+        self._sum_ret += ret
+        self._sum_ret_sq += ret * ret
+        bisect.insort(self._sorted_pnl, pnl)
+        self._loss_streak = self._loss_streak + 1 if pnl < 0 else 0
+    
+    def _sync_closed_stats(self):
+        """Rebuild the aggregates if closed_positions was changed directly"""
+        n = len(self.closed_positions)
+        if self._n_closed == n:
+            return
+        
+        pnl = np.fromiter((p.realized_pnl for p in self.closed_positions), dtype=np.float64, count=n)
+        returns = pnl / self.initial_capital
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
+        
+        self._n_closed = n
+        self._n_wins = int(wins.size)
+        self._n_losses = int(losses.size)
+        self._sum_wins = float(wins.sum())
+        self._sum_losses = float(-losses.sum())
+        self._sum_ret = float(returns.sum())
+        self._sum_ret_sq = float(np.dot(returns, returns))
+        self._sorted_pnl = np.sort(pnl).tolist()
+        not_losses = np.flatnonzero(pnl >= 0)
+        self._loss_streak = int(n - 1 - not_losses[-1]) if not_losses.size else n
+    
+    def _sync_position_arrays(self):
+        """Rebuild the position arrays if self.positions has changed"""
+        objs = list(self.positions.values())
+        if len(objs) == len(self._pos_objs) and all(a is b for a, b in zip(objs, self._pos_objs)):
+            return
+        
+        self._pos_objs = objs
+        self._pos_idx = {symbol: i for i, symbol in enumerate(self.positions)}
+        self._pos_entry = np.array([p.entry_price for p in objs], dtype=np.float64)
+        self._pos_size = np.array([p.size for p in objs], dtype=np.float64)
+        self._pos_side = np.array([1.0 if p.side == 'long' else -1.0 for p in objs], dtype=np.float64)
+        self._pos_high = np.array([p.highest_price for p in objs], dtype=np.float64)
+        self._pos_low = np.array([p.lowest_price for p in objs], dtype=np.float64)
+    
+    @property
+    def position_symbols(self) -> List[str]:
+        """Symbols of open positions in the order update_pnl_all() expects prices"""
+        self._sync_position_arrays()
+        return list(self._pos_idx)
+    
+    def update_pnl_all(self, prices: np.ndarray) -> np.ndarray:
+        """
+        Update unrealized P&L and price extremes of all open positions at once
+        
+        Args:
+            prices: Current prices ordered like position_symbols
+            
+        Returns:
+            Unrealized P&L per position
+        """
+        self._sync_position_arrays()
+        prices = np.asarray(prices, dtype=np.float64)
+        
+        # Positions may also move through Position.update_pnl one at a time
+        n = len(self._pos_objs)
+        self._pos_high = np.fromiter((p.highest_price for p in self._pos_objs), np.float64, n)
+        self._pos_low = np.fromiter((p.lowest_price for p in self._pos_objs), np.float64, n)
+        
+        pnl = self._pos_side * (prices - self._pos_entry) * self._pos_size
+        np.maximum(self._pos_high, prices, out=self._pos_high)
+        np.minimum(self._pos_low, prices, out=self._pos_low)
+        
+        # Mirror the results onto the Position objects used for logging and stops
+        for position, value, high, low in zip(
+            self._pos_objs, pnl.tolist(), self._pos_high.tolist(), self._pos_low.tolist()
+        ):
+            position.unrealized_pnl = value
+            position.highest_price = high
+            position.lowest_price = low
+        
+        return pnl
+    
+    def record_closed_position(self, position: Position):
+        """
+        Move a position into the closed-position history
+        
+        Args:
+            position: Closed position with realized_pnl set
+        """
+        self._sync_closed_stats()
+        self.closed_positions.append(position)
+        self._record_closed(position)
+    
+    @staticmethod
+    def _last_bar(df: pd.DataFrame) -> Tuple[float, Optional[float]]:
+        """Read the latest close and ATR as plain floats (ATR is None if absent)"""
+        current_price = float(df['close'].values[-1])
+        atr = float(df['atr'].values[-1]) if 'atr' in df.columns else None
+        return current_price, atr
+    
     def calculate_position_size_volatility(
         self,
         symbol: str,
-        df: pd.DataFrame,
+        current_price: float,
+        atr: Optional[float],
         risk_per_trade_pct: float = 2.0
     ) -> float:
         """
@@ -128,20 +364,18 @@ class EnhancedRiskManager:
         
         Args:
             symbol: Trading pair
-            df: DataFrame with price data and ATR
+            current_price: Latest close price
+            atr: Latest ATR value (None if unavailable)
             risk_per_trade_pct: Risk per trade as % of capital
             
         Returns:
             Position size in base currency
         """
         try:
-            if 'atr' not in df.columns:
+            if atr is None:
                 logger.warning(f"ATR not available for {symbol}, using fixed size")
                 return self.calculate_fixed_position_size()
             
-            current_price = df['close'].iloc[-1]
-            atr = df['atr'].iloc[-1]
-            
             if atr == 0 or current_price == 0:
                 return self.calculate_fixed_position_size()
             
@@ -159,15 +393,16 @@ class EnhancedRiskManager:
             position_size = position_size_usd / current_price
             
             # Apply maximum position size limit
-            max_position_usd = self.current_capital * (self.max_position_size_pct / 100)
+            max_position_usd = self.current_capital * self._max_pos_frac
             if position_size_usd > max_position_usd:
                 position_size = max_position_usd / current_price
-                logger.info(f"Position size capped at {self.max_position_size_pct}% of capital")
+                logger.info("Position size capped at %s%% of capital", self.max_position_size_pct)
             
-            logger.debug(
-                f"Volatility-based sizing: {position_size:.8f} {symbol.split('/')[0]} "
-                f"(ATR: {atr:.2f}, Stop: {stop_distance_pct:.2f}%)"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Volatility-based sizing: %.8f %s (ATR: %.2f, Stop: %.2f%%)",
+                    position_size, symbol.split('/')[0], atr, stop_distance_pct
+                )
             
             return position_size
             
@@ -175,6 +410,26 @@ class EnhancedRiskManager:
             logger.exception(f"Error calculating volatility-based position size: {e}")
             return self.calculate_fixed_position_size()
     
+    def calculate_position_size_volatility_df(
+        self,
+        symbol: str,
+        df: pd.DataFrame,
+        risk_per_trade_pct: float = 2.0
+    ) -> float:
+        """
+        DataFrame variant of calculate_position_size_volatility
+        
+        Args:
+            symbol: Trading pair
+            df: DataFrame with price data and ATR
+            risk_per_trade_pct: Risk per trade as % of capital
+            
+        Returns:
+            Position size in base currency
+        """
+        current_price, atr = self._last_bar(df)
+        return self.calculate_position_size_volatility(symbol, current_price, atr, risk_per_trade_pct)
+    
     def calculate_kelly_position_size(
         self,
         win_rate: float,
@@ -208,8 +463,8 @@ class EnhancedRiskManager:
             kelly_pct = max(1.0, min(kelly_pct * 100, self.max_position_size_pct))
             
             logger.debug(
-                f"Kelly sizing: {kelly_pct:.2f}% "
-                f"(WR: {win_rate:.2%}, W/L: {win_loss_ratio:.2f})"
+                "Kelly sizing: %.2f%% (WR: %.2f%%, W/L: %.2f)",
+                kelly_pct, win_rate * 100, win_loss_ratio
             )
             
             return kelly_pct
@@ -218,14 +473,35 @@ class EnhancedRiskManager:
             logger.exception(f"Error calculating Kelly position size: {e}")
             return self.max_position_size_pct / 2
     
+    def calculate_kelly_continuous(self) -> float:
+        """
+        Calculate position size using continuous Kelly (f* = mean / variance)
+        
+        Uses the running per-trade return moments, so no win/loss scan is needed.
+        
+        Returns:
+            Position size as % of capital
+        """
+        mean_ret, variance = self._return_moments()
+        if variance is None:
+            return self.max_position_size_pct / 2
+        
+        kelly_pct = self.kelly_fraction * (mean_ret / variance) * 100
+        
+        # Clamp between 1% and max position size
+        kelly_pct = max(1.0, min(kelly_pct, self.max_position_size_pct))
+        logger.debug("Continuous Kelly sizing: %.2f%%", kelly_pct)
+        return kelly_pct
+    
     def calculate_fixed_position_size(self) -> float:
         """Calculate fixed position size"""
-        return self.current_capital * (self.max_position_size_pct / 100)
+        return self.current_capital * self._max_pos_frac
     
     def calculate_dynamic_position_size(
         self,
         symbol: str,
-        df: pd.DataFrame,
+        current_price: float,
+        atr: Optional[float],
         signal_strength: float = 50.0,
         signal_confidence: float = 0.5
     ) -> float:
@@ -234,7 +510,8 @@ class EnhancedRiskManager:
         
         Args:
             symbol: Trading pair
-            df: DataFrame with price data
+            current_price: Latest close price
+            atr: Latest ATR value (None if unavailable)
             signal_strength: Signal strength 0-100
             signal_confidence: Signal confidence 0-1
             
@@ -242,75 +519,51 @@ class EnhancedRiskManager:
             Position size in base currency
         """
         try:
-            current_price = df['close'].iloc[-1]
-            
             # 1. Base size from volatility
-            base_size = self.calculate_position_size_volatility(symbol, df)
-            
-            # 2. Adjust for signal strength (50 = neutral, 100 = strong)
-            strength_multiplier = (signal_strength / 50.0) ** 0.5  # 0.7 to 1.4
-            
-            # 3. Adjust for signal confidence
-            confidence_multiplier = 0.5 + (signal_confidence * 0.5)  # 0.5 to 1.0
+            base_size = self.calculate_position_size_volatility(symbol, current_price, atr)
             
-            # 4. Adjust for current drawdown
-            current_dd = self.get_current_drawdown_pct()
-            if current_dd > self.max_drawdown_pct / 2:
-                dd_multiplier = 0.5  # Reduce size in drawdown
-            else:
-                dd_multiplier = 1.0
-            
-            # 5. Adjust for daily P&L
-            daily_pnl_pct = self.get_daily_pnl_pct()
-            if daily_pnl_pct < -self.max_daily_loss_pct / 2:
-                pnl_multiplier = 0.5  # Reduce size after losses
-            elif daily_pnl_pct > self.max_daily_loss_pct:
-                pnl_multiplier = 1.2  # Increase size after wins
-            else:
-                pnl_multiplier = 1.0
-            
-            # 6. Apply Kelly sizing if enabled
-            if self.use_kelly_criterion and len(self.closed_positions) >= 10:
+            # 2. Apply Kelly sizing if enabled
+            self._sync_closed_stats()
+            if self.use_kelly_criterion and self._n_closed >= KELLY_CONTINUOUS_MIN_TRADES:
+                kelly_pct = self.calculate_kelly_continuous()
+                kelly_multiplier = kelly_pct / self.max_position_size_pct
+            elif self.use_kelly_criterion and self._n_closed >= 10:
                 win_rate, avg_win, avg_loss = self.calculate_win_statistics()
                 kelly_pct = self.calculate_kelly_position_size(win_rate, avg_win, avg_loss)
                 kelly_multiplier = kelly_pct / self.max_position_size_pct
             else:
                 kelly_multiplier = 1.0
             
-            # Combine all multipliers
-            final_multiplier = (
-                strength_multiplier *
-                confidence_multiplier *
-                dd_multiplier *
-                pnl_multiplier *
-                kelly_multiplier
-            )
-            
-            position_size = base_size * final_multiplier
-            
             # Ensure minimum and maximum limits
             min_size = (self.current_capital * 0.01) / current_price  # 1% minimum
-            max_size = (self.current_capital * self.max_position_size_pct / 100) / current_price
-            
-            position_size = max(min_size, min(position_size, max_size))
+            max_size = (self.current_capital * self._max_pos_frac) / current_price
+            
+            # 3. Combine strength, confidence, drawdown, daily P&L and Kelly multipliers
+            (position_size, strength_multiplier, confidence_multiplier,
+             dd_multiplier, pnl_multiplier) = _combine_size(
+                float(base_size), float(signal_strength), float(signal_confidence),
+                self.get_current_drawdown_pct(), float(self._half_max_dd),
+                self.get_daily_pnl_pct(), float(self._half_max_dl), float(self.max_daily_loss_pct),
+                float(kelly_multiplier), min_size, max_size
+            )
             
             logger.info(
-                f"Dynamic position size: {position_size:.8f} "
-                f"(multipliers: str={strength_multiplier:.2f}, "
-                f"conf={confidence_multiplier:.2f}, dd={dd_multiplier:.2f}, "
-                f"pnl={pnl_multiplier:.2f}, kelly={kelly_multiplier:.2f})"
+                "Dynamic position size: %.8f "
+                "(multipliers: str=%.2f, conf=%.2f, dd=%.2f, pnl=%.2f, kelly=%.2f)",
+                position_size, strength_multiplier, confidence_multiplier,
+                dd_multiplier, pnl_multiplier, kelly_multiplier
             )
             
             return position_size
             
         except Exception as e:
             logger.exception(f"Error calculating dynamic position size: {e}")
-            return self.calculate_fixed_position_size() / df['close'].iloc[-1]
+            return self.calculate_fixed_position_size() / current_price
     
     def calculate_stop_loss(
         self,
         entry_price: float,
-        df: pd.DataFrame,
+        atr: Optional[float],
         side: str = 'long'
     ) -> float:
         """
@@ -318,15 +571,14 @@ class EnhancedRiskManager:
         
         Args:
             entry_price: Entry price
-            df: DataFrame with ATR
+            atr: Latest ATR value (None if unavailable)
             side: 'long' or 'short'
             
         Returns:
             Stop-loss price
         """
         try:
-            if 'atr' in df.columns:
-                atr = df['atr'].iloc[-1]
+            if atr is not None:
                 stop_distance = atr * 2  # 2x ATR
             else:
                 # Fallback: 2% stop
@@ -342,7 +594,7 @@ class EnhancedRiskManager:
             else:
                 stop_loss = entry_price + stop_distance
             
-            logger.debug(f"Stop-loss calculated: {stop_loss:.2f} (distance: {stop_distance:.2f})")
+            logger.debug("Stop-loss calculated: %.2f (distance: %.2f)", stop_loss, stop_distance)
             return stop_loss
             
         except Exception as e:
@@ -372,23 +624,70 @@ class EnhancedRiskManager:
             risk = abs(entry_price - stop_loss)
             
             # TP at 2x, 3x, 5x risk
-            risk_multiples = [2, 3, 5][:levels]
-            
             take_profits = []
-            for multiple in risk_multiples:
+            for multiple in TP_RISK_MULTIPLES[:levels]:
                 if side == 'long':
                     tp = entry_price + (risk * multiple)
                 else:
                     tp = entry_price - (risk * multiple)
                 take_profits.append(tp)
             
-            logger.debug(f"Take-profit levels: {take_profits}")
+            logger.debug("Take-profit levels: %s", take_profits)
             return take_profits
             
         except Exception as e:
             logger.exception(f"Error calculating take-profit levels: {e}")
             return [entry_price * 1.04] if side == 'long' else [entry_price * 0.96]
     
+    def calculate_stop_loss_batch(
+        self,
+        entry_prices: np.ndarray,
+        atrs: np.ndarray,
+        sides: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized calculate_stop_loss for many positions
+        
+        Args:
+            entry_prices: Entry prices
+            atrs: Latest ATR values (NaN where unavailable)
+            sides: +1 for long, -1 for short
+            
+        Returns:
+            Stop-loss prices
+        """
+        entry_prices = np.asarray(entry_prices, dtype=np.float64)
+        atrs = np.asarray(atrs, dtype=np.float64)
+        
+        # 2x ATR, 2% fallback, kept between 1% and 5% of entry
+        stop_distance = np.where(np.isnan(atrs), entry_prices * 0.02, atrs * 2)
+        stop_distance = np.clip(stop_distance, entry_prices * 0.01, entry_prices * 0.05)
+        return entry_prices - np.asarray(sides, dtype=np.float64) * stop_distance
+    
+    def calculate_take_profit_batch(
+        self,
+        entry_prices: np.ndarray,
+        stop_losses: np.ndarray,
+        sides: np.ndarray,
+        multiples: Tuple[float, ...] = TP_RISK_MULTIPLES
+    ) -> np.ndarray:
+        """
+        Vectorized calculate_take_profit_levels for many positions
+        
+        Args:
+            entry_prices: Entry prices
+            stop_losses: Stop-loss prices
+            sides: +1 for long, -1 for short
+            multiples: Take-profit distances in multiples of risk
+            
+        Returns:
+            Array of shape (positions, levels) with take-profit prices
+        """
+        entry_prices = np.asarray(entry_prices, dtype=np.float64)
+        risk = np.abs(entry_prices - np.asarray(stop_losses, dtype=np.float64))
+        signed_risk = np.asarray(sides, dtype=np.float64) * risk
+        return entry_prices[:, None] + signed_risk[:, None] * np.asarray(multiples, dtype=np.float64)[None, :]
+    
     def update_trailing_stop(
         self,
         symbol: str,
@@ -411,10 +710,15 @@ class EnhancedRiskManager:
         
         if not position.trailing_stop_active:
             # Activate trailing stop after profit threshold (e.g., 2% profit)
-            profit_pct = position.get_pnl_pct()
-            if profit_pct >= 2.0:
+            if position.side == 'long':
+                armed = current_price >= position.activation_price
+            else:
+                armed = current_price <= position.activation_price
+            if armed:
                 position.trailing_stop_active = True
-                logger.info(f"Trailing stop activated for {symbol} at {profit_pct:.2f}% profit")
+                logger.info(
+                    f"Trailing stop activated for {symbol} at {position.get_pnl_pct():.2f}% profit"
+                )
         
         if position.trailing_stop_active:
             if position.side == 'long':
@@ -451,7 +755,7 @@ class EnhancedRiskManager:
         """
         # Check if already active and expired
         if self.circuit_breaker_active:
-            if self.circuit_breaker_until and datetime.now() > self.circuit_breaker_until:
+            if time.time() > self._cb_until_ts:
                 self.circuit_breaker_active = False
                 self.circuit_breaker_until = None
                 logger.info("Circuit breaker deactivated")
@@ -471,12 +775,10 @@ class EnhancedRiskManager:
             return True
         
         # Check consecutive losses
-        if len(self.closed_positions) >= 5:
-            last_5 = self.closed_positions[-5:]
-            consecutive_losses = all(p.realized_pnl < 0 for p in last_5)
-            if consecutive_losses:
-                self.activate_circuit_breaker("5 consecutive losses", hours=12)
-                return True
+        self._sync_closed_stats()
+        if self._loss_streak >= 5:
+            self.activate_circuit_breaker("5 consecutive losses", hours=12)
+            return True
         
         return False
     
@@ -489,7 +791,8 @@ class EnhancedRiskManager:
             hours: Duration in hours
         """
         self.circuit_breaker_active = True
-        self.circuit_breaker_until = datetime.now() + timedelta(hours=hours)
+        self._cb_until_ts = time.time() + hours * 3600
+        self.circuit_breaker_until = datetime.fromtimestamp(self._cb_until_ts)
         
         logger.warning(
             f"🔴 CIRCUIT BREAKER ACTIVATED: {reason} "
@@ -520,18 +823,42 @@ class EnhancedRiskManager:
         Returns:
             Tuple of (win_rate, avg_win, avg_loss)
         """
-        if not self.closed_positions:
+        self._sync_closed_stats()
+        if not self._n_closed:
             return 0.5, 0.0, 0.0
         
-        wins = [p.realized_pnl for p in self.closed_positions if p.realized_pnl > 0]
-        losses = [abs(p.realized_pnl) for p in self.closed_positions if p.realized_pnl < 0]
-        
-        win_rate = len(wins) / len(self.closed_positions)
-        avg_win = np.mean(wins) if wins else 0.0
-        avg_loss = np.mean(losses) if losses else 0.0
+        win_rate = self._n_wins / self._n_closed
+        avg_win = self._sum_wins / self._n_wins if self._n_wins else 0.0
+        avg_loss = self._sum_losses / self._n_losses if self._n_losses else 0.0
         
         return win_rate, avg_win, avg_loss
     
+    def _return_moments(self) -> Tuple[float, Optional[float]]:
+        """
+        Mean and population variance of per-trade returns on initial capital
+        
+        Returns:
+            Tuple of (mean, variance); variance is None when it is zero
+        """
+        self._sync_closed_stats()
+        if not self._n_closed:
+            return 0.0, None
+        
+        mean_ret = self._sum_ret / self._n_closed
+        mean_sq = self._sum_ret_sq / self._n_closed
+        variance = mean_sq - mean_ret * mean_ret
+        # Treat rounding-level variance as zero, like np.std of identical returns
+        if variance > 1e-12 * mean_sq:
+            return mean_ret, variance
+        return mean_ret, None
+    
+    def _pnl_percentile(self, q: float) -> float:
+        """Percentile of realized P&L with NumPy's default linear interpolation"""
+        pos = (len(self._sorted_pnl) - 1) * q / 100
+        lo = int(pos)
+        hi = min(lo + 1, len(self._sorted_pnl) - 1)
+        return self._sorted_pnl[lo] + (self._sorted_pnl[hi] - self._sorted_pnl[lo]) * (pos - lo)
+    
     def get_risk_metrics(self) -> RiskMetrics:
         """
         Calculate comprehensive risk metrics
@@ -541,9 +868,8 @@ class EnhancedRiskManager:
         """
         try:
             # Total exposure
-            total_exposure = sum(
-                p.entry_price * p.size for p in self.positions.values()
-            )
+            self._sync_position_arrays()
+            total_exposure = float(np.dot(self._pos_entry, self._pos_size))
             exposure_pct = (total_exposure / self.current_capital) * 100 if self.current_capital > 0 else 0
             
             # Daily P&L
@@ -558,15 +884,15 @@ class EnhancedRiskManager:
                 win_rate, avg_win, avg_loss = self.calculate_win_statistics()
                 profit_factor = (avg_win * win_rate) / (avg_loss * (1 - win_rate)) if avg_loss > 0 else 0
                 
-                # Sharpe ratio (simplified)
-                returns = [p.realized_pnl / self.initial_capital for p in self.closed_positions]
-                if len(returns) > 1:
-                    sharpe = np.mean(returns) / np.std(returns) * np.sqrt(252) if np.std(returns) > 0 else 0
+                # Sharpe ratio (simplified), from running sums of per-trade returns
+                mean_ret, variance = self._return_moments()
+                if variance is not None:
+                    sharpe = mean_ret / math.sqrt(variance) * math.sqrt(252)
                 else:
                     sharpe = 0.0
                 
                 # Value at Risk (95%)
-                var_95 = np.percentile([p.realized_pnl for p in self.closed_positions], 5)
+                var_95 = self._pnl_percentile(5)
             else:
                 win_rate = 0.5
                 profit_factor = 0.0
@@ -611,18 +937,10 @@ class EnhancedRiskManager:
         Returns:
             Tuple of (can_open, reason)
         """
-        # Circuit breaker check
+        # Circuit breaker check (also covers the daily loss and drawdown limits)
         if self.check_circuit_breaker():
             return False, "Circuit breaker active"
         
-        # Daily loss limit
-        if self.get_daily_pnl_pct() <= -self.max_daily_loss_pct:
-            return False, "Daily loss limit reached"
-        
-        # Drawdown limit
-        if self.get_current_drawdown_pct() >= self.max_drawdown_pct:
-            return False, "Maximum drawdown reached"
-        
         # Check if already have position
         if symbol in self.positions:
             return False, "Position already open for this symbol"
@@ -634,12 +952,18 @@ class EnhancedRiskManager:
         
         return True, "OK"
     
+    @staticmethod
+    def _next_midnight_ts(day) -> float:
+        """Epoch timestamp of the local midnight that ends the given date"""
+        return datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+    
     def reset_daily_metrics(self):
         """Reset daily metrics at day start"""
-        current_date = datetime.now().date()
-        if current_date != self.day_start_date:
+        if time.time() >= self._next_day_ts:
+            current_date = datetime.now().date()
             self.daily_start_capital = self.current_capital
             self.day_start_date = current_date
+            self._next_day_ts = self._next_midnight_ts(current_date)
             logger.info(f"Daily metrics reset. Starting capital: ${self.current_capital:.2f}")
 
 
@@ -660,10 +984,14 @@ if __name__ == '__main__':
         'atr': [2, 2.1, 2.0, 1.9, 2.1]
     })
     
+    current_price = float(df['close'].values[-1])
+    atr = float(df['atr'].values[-1])
+    
     # Calculate position size
     size = risk_mgr.calculate_dynamic_position_size(
         'BTC/USDT',
-        df,
+        current_price,
+        atr,
         signal_strength=75,
         signal_confidence=0.8
     )
@@ -671,7 +999,7 @@ if __name__ == '__main__':
     
     # Calculate stop-loss and take-profit
     entry_price = 104
-    stop_loss = risk_mgr.calculate_stop_loss(entry_price, df, 'long')
+    stop_loss = risk_mgr.calculate_stop_loss(entry_price, atr, 'long')
     take_profits = risk_mgr.calculate_take_profit_levels(entry_price, stop_loss, 'long')
     
     print(f"Entry: ${entry_price}")
@@ -1,15 +1,33 @@
 """
 Logger Module - Comprehensive logging and monitoring for the trading bot
 """
+import atexit
+import copy
+import json
 import logging
 import os
+import queue
+import sys
+import threading
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
-from colorama import Fore, Style, init
-import traceback
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from colorama import Fore, Style
 
-# Initialize colorama for Windows support
-init(autoreset=True)
+try:
+    import orjson
+    
+    def _json_line(obj):
+        return orjson.dumps(
+            obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+except ImportError:
+    def _json_line(obj):
+        return json.dumps(obj, default=str, separators=(',', ':'))
+
+# Only Windows consoles need colorama's help to render ANSI codes
+if sys.platform == 'win32':
+    from colorama import just_fix_windows_console
+    just_fix_windows_console()
 
 
 class ColoredFormatter(logging.Formatter):
@@ -23,18 +41,144 @@ class ColoredFormatter(logging.Formatter):
         'CRITICAL': Fore.RED + Style.BRIGHT,
     }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._colored_levels = {
+            level: f"{color}{level}{Style.RESET_ALL}" for level, color in self.COLORS.items()
+        }
+    
     def format(self, record):
-        log_color = self.COLORS.get(record.levelname, '')
-        record.levelname = f"{log_color}{record.levelname}{Style.RESET_ALL}"
+        log_color = self.COLORS.get(record.levelname)
+        if log_color is None:
+            return super().format(record)
+        
+        # Color a copy so other handlers of the same record see it unchanged
+        record = copy.copy(record)
+        record.levelname = self._colored_levels[record.levelname]
         record.msg = f"{log_color}{record.msg}{Style.RESET_ALL}"
         return super().format(record)
 
 
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formatter that renders each record as one JSON object per line
+    
+    Structured fields are taken from the record's 'fields' attribute (pass
+    them with extra={'fields': {...}}); records without it carry their message.
+    """
+    
+    def format(self, record):
+        entry = {'ts': record.created, 'level': record.levelname}
+        fields = getattr(record, 'fields', None)
+        if fields is not None:
+            entry.update(fields)
+        else:
+            entry['message'] = record.getMessage()
+        return _json_line(entry)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves record formatting to the listener thread
+    
+    The stock prepare() formats the whole record, traceback included, on the
+    logging thread. Here only the message arguments are merged into msg, so
+    mutable arguments are captured as they were at the call; exc_info travels
+    with the record and the listener-side formatters render it once, caching
+    it in exc_text.
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler that writes through a 64 KB buffer
+    
+    Records are flushed to disk immediately at flush_level and above, and
+    otherwise at most flush_interval seconds after they were written. The
+    file is opened in binary mode and each record is encoded once, skipping
+    the text layer. The size in bytes is tracked in memory, so rollover
+    checks do not seek the stream (which would flush the buffer on every
+    record).
+    """
+    
+    BUFFER_SIZE = 65536
+    
+    def __init__(self, filename, flush_interval=30.0, flush_level=logging.ERROR, **kwargs):
+        """
+        Initialize the handler
+        
+        Args:
+            filename: Log file path
+            flush_interval: Maximum seconds a buffered record waits for a flush
+            flush_level: Records at or above this level are flushed immediately
+            **kwargs: Passed to RotatingFileHandler (mode is always 'ab')
+        """
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self._size = 0
+        self._flush_timer = None
+        encoding = kwargs.pop('encoding', None)
+        errors = kwargs.pop('errors', None)
+        kwargs['mode'] = 'ab'
+        super().__init__(filename, **kwargs)
+        self.encoding = encoding or 'utf-8'
+        self.errors = errors or 'strict'
+    
+    def _open(self):
+        stream = open(self.baseFilename, 'ab', buffering=self.BUFFER_SIZE)
+        self._size = os.fstat(stream.fileno()).st_size
+        return stream
+    
+    def _encode(self, record):
+        return (self.format(record) + self.terminator).encode(self.encoding, self.errors)
+    
+    def emit(self, record):
+        try:
+            data = self._encode(record)
+            if self.stream is None:
+                self.stream = self._open()
+            # Rollover check against the tracked size; replaces shouldRollover()
+            if self.maxBytes > 0 and self._size + len(data) >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(data)
+            self._size += len(data)
+            
+            if record.levelno >= self.flush_level:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        self.acquire()
+        try:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            super().flush()
+        finally:
+            self.release()
+
+
 class TradingLogger:
     """
     Centralized logging system for the trading bot
     """
     
+    # Instance currently owning the named loggers
+    _active = None
+    
     def __init__(self, log_dir='logs', log_level='INFO', max_bytes=10485760, backup_count=5):
         """
         Initialize the logger
@@ -53,20 +197,45 @@ class TradingLogger:
         # Create logs directory if it doesn't exist
         os.makedirs(log_dir, exist_ok=True)
         
+        # Retire a previous instance so its listener thread and open files don't linger
+        if TradingLogger._active is not None:
+            TradingLogger._active.close()
+        
+        # Loggers only enqueue records; a background listener owns the real handlers
+        self._queue = queue.SimpleQueue()
+        self._handlers = []
+        
         # Initialize loggers
         self.main_logger = self._setup_logger('main', 'bot.log')
-        self.trade_logger = self._setup_logger('trades', 'trades.log')
-        self.signal_logger = self._setup_logger('signals', 'signals.log')
+        self.trade_logger = self._setup_logger('trades', 'trades.log', json_lines=True)
+        self.signal_logger = self._setup_logger('signals', 'signals.log', json_lines=True)
         self.error_logger = self._setup_logger('errors', 'errors.log', logging.ERROR)
         
-    def _setup_logger(self, name, filename, level=None):
+        # Console handler shared by all loggers, colored only on a terminal
+        console_handler = logging.StreamHandler()
+        formatter_class = ColoredFormatter if sys.stderr.isatty() else logging.Formatter
+        console_formatter = formatter_class(
+            '%(asctime)s - %(levelname)s - %(message)s',
+            datefmt='%H:%M:%S'
+        )
+        console_handler.setFormatter(console_formatter)
+        self._handlers.append(console_handler)
+        
+        self._listener = QueueListener(self._queue, *self._handlers, respect_handler_level=True)
+        self._listener.start()
+        self._listener_running = True
+        atexit.register(self.shutdown)
+        TradingLogger._active = self
+        
+    def _setup_logger(self, name, filename, level=None, json_lines=False):
         """
-        Set up a logger with file and console handlers
+        Set up a logger that enqueues records for the listener thread
         
         Args:
             name: Logger name
             filename: Log file name
             level: Logging level (optional)
+            json_lines: Write the file as JSON Lines instead of text
         
         Returns:
             Configured logger
@@ -74,56 +243,71 @@ class TradingLogger:
         logger = logging.getLogger(name)
         logger.setLevel(level or self.log_level)
         logger.handlers.clear()
+        logger.addHandler(DeferredQueueHandler(self._queue))
+        logger.propagate = False
         
-        # File handler with rotation
+        # File handler with rotation, fed by the listener with this logger's records only
         file_path = os.path.join(self.log_dir, filename)
-        file_handler = RotatingFileHandler(
+        file_handler = BufferedRotatingFileHandler(
             file_path,
             maxBytes=self.max_bytes,
             backupCount=self.backup_count,
             encoding='utf-8'
         )
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        if json_lines:
+            file_formatter = JsonLinesFormatter()
+        else:
+            file_formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            )
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
-        
-        # Console handler with colors
-        console_handler = logging.StreamHandler()
-        console_formatter = ColoredFormatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%H:%M:%S'
-        )
-        console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
+        file_handler.addFilter(logging.Filter(name))
+        self._handlers.append(file_handler)
         
         return logger
     
-    def info(self, message):
-        """Log info message"""
-        self.main_logger.info(message)
+    def shutdown(self):
+        """Flush queued records and stop the listener thread"""
+        if self._listener_running:
+            self._listener_running = False
+            self._listener.stop()
+            for handler in self._handlers:
+                try:
+                    handler.flush()
+                except (OSError, ValueError):
+                    pass  # stream already closed at interpreter exit
+    
+    def close(self):
+        """Stop the listener and close all handlers"""
+        self.shutdown()
+        for handler in self._handlers:
+            handler.close()
+        if TradingLogger._active is self:
+            TradingLogger._active = None
+    
+    def info(self, message, *args):
+        """Log info message (%-style args are formatted lazily)"""
+        self.main_logger.info(message, *args)
     
-    def debug(self, message):
+    def debug(self, message, *args):
         """Log debug message"""
-        self.main_logger.debug(message)
+        self.main_logger.debug(message, *args)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """Log warning message"""
-        self.main_logger.warning(message)
+        self.main_logger.warning(message, *args)
     
-    def error(self, message, exc_info=None):
+    def error(self, message, *args, exc_info=None):
         """Log error message"""
-        self.main_logger.error(message)
-        self.error_logger.error(message)
-        if exc_info:
-            self.error_logger.error(traceback.format_exc())
+        self.main_logger.error(message, *args)
+        # The traceback is only formatted if the error logger emits the record
+        self.error_logger.error(message, *args, exc_info=exc_info)
     
-    def critical(self, message):
+    def critical(self, message, *args, exc_info=None):
         """Log critical message"""
-        self.main_logger.critical(message)
-        self.error_logger.critical(message)
+        self.main_logger.critical(message, *args)
+        self.error_logger.critical(message, *args, exc_info=exc_info)
     
     def log_trade(self, action, symbol, price, amount, reason=''):
         """
@@ -136,12 +320,17 @@ class TradingLogger:
             amount: Trade amount
             reason: Reason for trade
         """
+        if not (self.trade_logger.isEnabledFor(logging.INFO) or self.main_logger.isEnabledFor(logging.INFO)):
+            return
+        
         message = f"{action} {amount} {symbol} @ {price}"
         if reason:
             message += f" | Reason: {reason}"
         
-        self.trade_logger.info(message)
-        self.main_logger.info(f"TRADE: {message}")
+        self.trade_logger.info(message, extra={'fields': {
+            'action': action, 'symbol': symbol, 'price': price, 'amount': amount, 'reason': reason
+        }})
+        self.main_logger.info("TRADE: %s", message)
     
     def log_signal(self, signal_type, symbol, price, indicators, strength=None):
         """
@@ -154,6 +343,9 @@ class TradingLogger:
             indicators: Dictionary of indicator values
             strength: Signal strength (0-100)
         """
+        if not (self.signal_logger.isEnabledFor(logging.INFO) or self.main_logger.isEnabledFor(logging.INFO)):
+            return
+        
         message = f"{signal_type} signal for {symbol} @ {price}"
         if strength:
             message += f" | Strength: {strength}%"
@@ -162,8 +354,11 @@ class TradingLogger:
         indicator_str = " | ".join([f"{k}: {v}" for k, v in indicators.items()])
         message += f" | {indicator_str}"
         
-        self.signal_logger.info(message)
-        self.main_logger.info(f"SIGNAL: {message}")
+        self.signal_logger.info(message, extra={'fields': {
+            'signal': signal_type, 'symbol': symbol, 'price': price,
+            'strength': strength, 'indicators': indicators
+        }})
+        self.main_logger.info("SIGNAL: %s", message)
     
     def log_performance(self, metrics):
         """
@@ -172,6 +367,9 @@ class TradingLogger:
         Args:
             metrics: Dictionary of performance metrics
         """
+        if not self.main_logger.isEnabledFor(logging.INFO):
+            return
+        
         message = "Performance Summary: "
         message += " | ".join([f"{k}: {v}" for k, v in metrics.items()])
         self.main_logger.info(message)
@@ -185,8 +383,8 @@ class TradingLogger:
             exc_value: Exception value
             exc_traceback: Exception traceback
         """
-        error_msg = ''.join(traceback.format_exception(exc_type, exc_value, exc_traceback))
-        self.error_logger.critical(f"Unhandled exception:\n{error_msg}")
+        self.error_logger.critical("Unhandled exception:",
+                                   exc_info=(exc_type, exc_value, exc_traceback))
         self.main_logger.critical("Unhandled exception occurred - check error log")
 
 
@@ -6,19 +6,31 @@ import sys
 import time
 import yaml
 import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from dotenv import load_dotenv
 from typing import Dict, List
 
 from logger import get_logger
-from database import TradingDatabase
-from data_fetcher import DataFetcher
+from database import TradingDatabase, AsyncTradingDatabase
+from data_fetcher import DataFetcher, WebSocketDataFetcher
 from analyzer import TechnicalAnalyzer
 from trader import Trader
 from telegram_bot import TelegramBot
 from backtester import Backtester
 
 
+@dataclass
+class SignalSnapshot:
+    """Last signal seen for a symbol"""
+    __slots__ = ('signal', 'strength', 'price', 'timestamp')
+    signal: str
+    strength: int
+    price: float
+    timestamp: datetime
+
+
 class TradingBot:
     """
     Main trading bot orchestrator
@@ -47,18 +59,32 @@ class TradingBot:
         self.logger.info("=" * 60)
         
         # Initialize database
-        db_path = self.config.get('database', {}).get('path', 'data/trading_bot.db')
-        self.db = TradingDatabase(db_path)
+        db_config = self.config.get('database', {})
+        self.db = TradingDatabase(db_config.get('path', 'data/trading_bot.db'),
+                                  group_commit=db_config.get('group_commit', True))
+        self.async_db = AsyncTradingDatabase(self.db)
         self.logger.info("Database initialized")
         
         # Initialize data fetcher
-        self.data_fetcher = DataFetcher(
-            primary_source=self.config.get('data', {}).get('sources', {}).get('primary', 'binance'),
-            backup_source=self.config.get('data', {}).get('sources', {}).get('backup', 'coingecko'),
+        data_config = self.config.get('data', {})
+        fetcher_kwargs = dict(
+            primary_source=data_config.get('sources', {}).get('primary', 'binance'),
+            backup_source=data_config.get('sources', {}).get('backup', 'coingecko'),
             api_key=os.getenv('BINANCE_API_KEY'),
             api_secret=os.getenv('BINANCE_API_SECRET')
         )
-        self.logger.info("Data fetcher initialized")
+        self.data_fetcher = None
+        if data_config.get('streaming', False):
+            try:
+                self.data_fetcher = WebSocketDataFetcher(
+                    symbols=self.config.get('symbols', ['BTC/USDT']), **fetcher_kwargs
+                )
+                self.logger.info("Data fetcher initialized with WebSocket streams")
+            except Exception as e:
+                self.logger.warning("WebSocket streaming unavailable (%s), falling back to REST", e)
+        if self.data_fetcher is None:
+            self.data_fetcher = DataFetcher(**fetcher_kwargs)
+            self.logger.info("Data fetcher initialized")
         
         # Initialize technical analyzer
         self.analyzer = TechnicalAnalyzer(config=self.config.get('indicators', {}))
@@ -75,7 +101,7 @@ class TradingBot:
             api_secret=os.getenv('BINANCE_API_SECRET') if trading_mode == 'live' else None,
             config=self.config
         )
-        self.logger.info(f"Trader initialized in {trading_mode} mode")
+        self.logger.info("Trader initialized in %s mode", trading_mode)
         
         # Initialize Telegram bot
         telegram_token = os.getenv('TELEGRAM_BOT_TOKEN')
@@ -98,17 +124,45 @@ class TradingBot:
         # Bot settings
         self.symbols = self.config.get('symbols', ['BTC/USDT'])
         self.timeframe = self.config.get('data', {}).get('primary_timeframe', '15m')
-        self.update_interval = int(os.getenv('UPDATE_INTERVAL', 
-                                    self.config.get('bot', {}).get('update_interval', 300)))
-        self.auto_trade = self.config.get('bot', {}).get('auto_trade', False)
+        bot_config = self.config.get('bot', {})
+        self.update_interval = int(os.getenv('UPDATE_INTERVAL', bot_config.get('update_interval', 300)))
+        self.auto_trade = bot_config.get('auto_trade', False)
+        # Resolved once; checked on every new signal
+        self.notify_signals = (self.telegram_bot is not None and
+                               bot_config.get('notifications', {}).get('signals', True))
+        
+        # Blocking OHLCV fetches run here so symbols can be scanned concurrently
+        self._fetch_pool = ThreadPoolExecutor(max_workers=min(16, max(1, len(self.symbols))),
+                                              thread_name_prefix='ohlcv-fetch')
         
         # State
         self.running = False
-        self.last_signals = {}
+        self.last_signals: Dict[str, SignalSnapshot] = {}
         
         self.logger.info("Trading bot initialization complete")
-        self.logger.info(f"Monitoring symbols: {', '.join(self.symbols)}")
-        self.logger.info(f"Update interval: {self.update_interval} seconds")
+        self.logger.info("Monitoring symbols: %s", ', '.join(self.symbols))
+        self.logger.info("Update interval: %s seconds", self.update_interval)
+    
+    def _log_write_errors(self, result, what: str):
+        """
+        Log a failed database write once it completes
+        
+        With group commit, inserts return the writer's Future, which is the
+        only place a failed write reports its error.
+        
+        Args:
+            result: Return value of the insert (row ID or Future)
+            what: Description of the record for the log message
+        """
+        if not isinstance(result, Future):
+            return
+        
+        def report(future):
+            error = future.exception()
+            if error is not None:
+                self.logger.error("Failed to store %s: %s", what, error)
+        
+        result.add_done_callback(report)
     
     def run_backtest(self, symbol: str = 'BTC/USDT', timeframe: str = '1h', 
                     candles: int = 1000):
@@ -121,7 +175,7 @@ class TradingBot:
             candles: Number of candles to fetch
         """
         self.logger.info("=" * 60)
-        self.logger.info(f"Running Backtest for {symbol}")
+        self.logger.info("Running Backtest for %s", symbol)
         self.logger.info("=" * 60)
         
         # Fetch historical data
@@ -148,13 +202,13 @@ class TradingBot:
         self.logger.info("=" * 60)
         self.logger.info("Backtest Results")
         self.logger.info("=" * 60)
-        self.logger.info(f"Total Trades: {results['total_trades']}")
-        self.logger.info(f"Win Rate: {results['win_rate']}%")
-        self.logger.info(f"Total Return: {results['total_return']}%")
-        self.logger.info(f"Net Profit: ${results['net_profit']}")
-        self.logger.info(f"Max Drawdown: {results['max_drawdown']}%")
-        self.logger.info(f"Sharpe Ratio: {results['sharpe_ratio']}")
-        self.logger.info(f"Profit Factor: {results['profit_factor']}")
+        self.logger.info("Total Trades: %s", results['total_trades'])
+        self.logger.info("Win Rate: %s%%", results['win_rate'])
+        self.logger.info("Total Return: %s%%", results['total_return'])
+        self.logger.info("Net Profit: $%s", results['net_profit'])
+        self.logger.info("Max Drawdown: %s%%", results['max_drawdown'])
+        self.logger.info("Sharpe Ratio: %s", results['sharpe_ratio'])
+        self.logger.info("Profit Factor: %s", results['profit_factor'])
         self.logger.info("=" * 60)
         
         return results
@@ -167,11 +221,13 @@ class TradingBot:
             symbol: Trading pair to analyze
         """
         try:
-            # Fetch data
-            df = self.data_fetcher.fetch_ohlcv(symbol, self.timeframe, 500)
+            # Fetch data off the event loop
+            df = await asyncio.get_running_loop().run_in_executor(
+                self._fetch_pool, self.data_fetcher.fetch_ohlcv, symbol, self.timeframe, 500
+            )
             
             if df is None:
-                self.logger.warning(f"Could not fetch data for {symbol}")
+                self.logger.warning("Could not fetch data for %s", symbol)
                 return
             
             # Calculate indicators and generate signal
@@ -181,30 +237,27 @@ class TradingBot:
             current_price = df.iloc[-1]['close']
             
             # Store signal in database
-            self.db.insert_signal(
+            result = await self.async_db.insert_signal(
                 symbol=symbol,
                 signal_type=signal,
                 price=current_price,
                 indicators=indicators,
                 strength=strength
             )
+            self._log_write_errors(result, f"{symbol} signal")
             
             # Check if signal has changed
-            last_signal = self.last_signals.get(symbol, {}).get('signal')
+            last = self.last_signals.get(symbol)
+            last_signal = last.signal if last is not None else None
             if last_signal != signal and signal != 'HOLD':
-                self.logger.info(f"New signal for {symbol}: {signal} (Strength: {strength}%)")
+                self.logger.info("New signal for %s: %s (Strength: %s%%)", symbol, signal, strength)
                 
                 # Notify via Telegram
-                if self.telegram_bot and self.config.get('bot', {}).get('notifications', {}).get('signals', True):
+                if self.notify_signals:
                     await self.telegram_bot.notify_signal(symbol, signal, strength, current_price)
             
             # Update last signal
-            self.last_signals[symbol] = {
-                'signal': signal,
-                'strength': strength,
-                'price': current_price,
-                'timestamp': datetime.now()
-            }
+            self.last_signals[symbol] = SignalSnapshot(signal, strength, current_price, datetime.now())
             
             # Execute trade if auto_trade is enabled
             if self.auto_trade and signal in ['BUY', 'SELL']:
@@ -214,7 +267,7 @@ class TradingBot:
             self._check_risk_management(symbol, current_price)
             
         except Exception as e:
-            self.logger.error(f"Error analyzing {symbol}: {e}", exc_info=True)
+            self.logger.error("Error analyzing %s: %s", symbol, e, exc_info=True)
     
     async def _execute_auto_trade(self, symbol: str, signal: str, price: float, strength: int):
         """
@@ -249,7 +302,7 @@ class TradingBot:
                     await self.telegram_bot.notify_trade('SELL', symbol, price, trade['amount'])
             
         except Exception as e:
-            self.logger.error(f"Error executing auto trade for {symbol}: {e}", exc_info=True)
+            self.logger.error("Error executing auto trade for %s: %s", symbol, e, exc_info=True)
     
     def _check_risk_management(self, symbol: str, current_price: float):
         """
@@ -263,7 +316,7 @@ class TradingBot:
             action = self.trader.check_stop_loss_take_profit(symbol, current_price)
             
             if action == 'SELL':
-                self.logger.warning(f"Risk management triggered for {symbol}")
+                self.logger.warning("Risk management triggered for %s", symbol)
                 trade = self.trader.execute_sell(
                     symbol=symbol,
                     price=current_price,
@@ -276,7 +329,7 @@ class TradingBot:
                     )
         
         except Exception as e:
-            self.logger.error(f"Error checking risk management for {symbol}: {e}", exc_info=True)
+            self.logger.error("Error checking risk management for %s: %s", symbol, e, exc_info=True)
     
     async def trading_loop(self):
         """
@@ -286,35 +339,35 @@ class TradingBot:
         
         while self.running:
             try:
-                self.logger.info(f"Scanning {len(self.symbols)} symbols...")
+                self.logger.info("Scanning %d symbols...", len(self.symbols))
                 
-                # Analyze each symbol
-                for symbol in self.symbols:
-                    await self.analyze_and_trade(symbol)
-                    await asyncio.sleep(1)  # Small delay between symbols
+                # Analyze all symbols concurrently (the fetcher's rate limiter paces requests)
+                await asyncio.gather(*(self.analyze_and_trade(symbol) for symbol in self.symbols),
+                                     return_exceptions=True)
                 
                 # Update portfolio in database
                 status = self.trader.get_status()
-                self.db.update_balance(
+                result = await self.async_db.update_balance(
                     balance=status['balance'],
                     equity=status['equity'],
                     profit_loss=status.get('total_pnl', 0),
                     profit_loss_percent=status.get('total_pnl_percent', 0)
                 )
+                self._log_write_errors(result, "balance snapshot")
                 
                 # Log status
-                self.logger.info(f"Balance: ${status['balance']:.2f}, Equity: ${status['equity']:.2f}, "
-                               f"Positions: {status['positions']}")
+                self.logger.info("Balance: $%.2f, Equity: $%.2f, Positions: %s",
+                                 status['balance'], status['equity'], status['positions'])
                 
                 # Wait for next update
-                self.logger.info(f"Waiting {self.update_interval} seconds until next scan...")
+                self.logger.info("Waiting %s seconds until next scan...", self.update_interval)
                 await asyncio.sleep(self.update_interval)
                 
             except KeyboardInterrupt:
                 self.logger.info("Keyboard interrupt received")
                 break
             except Exception as e:
-                self.logger.error(f"Error in trading loop: {e}", exc_info=True)
+                self.logger.error("Error in trading loop: %s", e, exc_info=True)
                 self.logger.info("Recovering from error in 10 seconds...")
                 await asyncio.sleep(10)
     
@@ -355,7 +408,7 @@ class TradingBot:
             await self.telegram_bot.app.stop()
             await self.telegram_bot.app.shutdown()
         except Exception as e:
-            self.logger.error(f"Error running Telegram bot: {e}", exc_info=True)
+            self.logger.error("Error running Telegram bot: %s", e, exc_info=True)
     
     def run(self):
         """
@@ -372,9 +425,12 @@ class TradingBot:
         except KeyboardInterrupt:
             self.logger.info("Shutting down trading bot...")
         except Exception as e:
-            self.logger.critical(f"Fatal error: {e}", exc_info=True)
+            self.logger.critical("Fatal error: %s", e, exc_info=True)
         finally:
             self.running = False
+            self._fetch_pool.shutdown(wait=False)
+            self.data_fetcher.close()
+            self.db.close()
             self.logger.info("Trading bot stopped")
 
 
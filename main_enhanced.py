@@ -17,7 +17,7 @@ from config_models import BotConfig
 from security_manager import SecurityManager
 from async_data_fetcher import AsyncDataFetcher
 from adaptive_strategy import AdaptiveStrategyEngine
-from enhanced_risk_manager import EnhancedRiskManager
+from enhanced_risk_manager import EnhancedRiskManager, ensure_atr
 from enhanced_ml_predictor import EnhancedMLPredictor
 
 try:
@@ -111,7 +111,10 @@ class EnhancedTradingBot:
                 model_dir='./models',
                 retrain_interval_hours=self.config.ml.retrain_interval_hours,
                 min_training_samples=self.config.ml.min_training_samples,
-                ensemble_weights=self.config.ml.ensemble_weights
+                ensemble_weights=self.config.ml.ensemble_weights,
+                cache_path=self.config.ml.prediction_cache_path,
+                cache_policy=self.config.ml.prediction_cache_policy,
+                warm_start=self.config.ml.warm_start_retrain
             )
         else:
             self.ml_predictor = None
@@ -185,6 +188,7 @@ class EnhancedTradingBot:
             df = await self.update_market_data(symbol)
             if df is None:
                 return
+            df = ensure_atr(df)
             
             # Get ML prediction
             ml_prediction = None
@@ -224,7 +228,7 @@ class EnhancedTradingBot:
                 logger.info(f"Cannot trade {symbol}: {reason}")
                 return
             
-            current_price = df['close'].iloc[-1]
+            current_price = float(df['close'].values[-1])
             
             # Execute trading logic
             if signal.action == 'BUY' and symbol not in self.positions:
@@ -249,16 +253,19 @@ class EnhancedTradingBot:
     ):
         """Execute buy order"""
         try:
+            atr = float(df['atr'].values[-1])
+            
             # Calculate position size
             position_size = self.risk_mgr.calculate_dynamic_position_size(
                 symbol=symbol,
-                df=df,
+                current_price=current_price,
+                atr=atr,
                 signal_strength=signal.strength,
                 signal_confidence=signal.confidence
             )
             
             # Calculate stop-loss and take-profit
-            stop_loss = self.risk_mgr.calculate_stop_loss(current_price, df, 'long')
+            stop_loss = self.risk_mgr.calculate_stop_loss(current_price, atr, 'long')
             take_profits = self.risk_mgr.calculate_take_profit_levels(
                 current_price,
                 stop_loss,
@@ -343,7 +350,7 @@ class EnhancedTradingBot:
                 # Update capital
                 position.realized_pnl = position.unrealized_pnl
                 self.risk_mgr.current_capital += position.realized_pnl
-                self.risk_mgr.closed_positions.append(position)
+                self.risk_mgr.record_closed_position(position)
                 
                 # Update peak capital
                 if self.risk_mgr.current_capital > self.risk_mgr.peak_capital:
@@ -9,6 +9,7 @@ from telegram.ext import (
 )
 from telegram.constants import ParseMode
 import asyncio
+from datetime import datetime
 from typing import Dict
 from logger import get_logger
 from database import TradingDatabase
@@ -144,8 +145,9 @@ The bot automatically monitors markets and executes trades based on signals.
             # Add position details
             if status.get('position_details'):
                 status_text += "\n*Position Details:*\n"
+                prices = self.data_fetcher.fetch_prices(list(status['position_details']))
                 for symbol, pos in status['position_details'].items():
-                    current_price = self.data_fetcher.fetch_current_price(symbol)
+                    current_price = prices.get(symbol)
                     pnl = (current_price - pos['entry_price']) * pos['amount'] if current_price else 0
                     pnl_percent = (pnl / (pos['entry_price'] * pos['amount'])) * 100 if current_price else 0
                     
@@ -227,7 +229,8 @@ The bot automatically monitors markets and executes trades based on signals.
     async def cmd_trades(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Trades command - Show recent trades"""
         try:
-            trades = self.db.get_trades(limit=10)
+            trades = self.db.get_trades(
+                limit=10, columns=('timestamp', 'symbol', 'action', 'price', 'amount', 'profit_loss'))
             
             if not trades:
                 await update.message.reply_text("📭 No recent trades")
@@ -240,7 +243,7 @@ The bot automatically monitors markets and executes trades based on signals.
                 symbol = trade['symbol']
                 price = trade['price']
                 amount = trade['amount']
-                timestamp = trade['timestamp'][:16]  # Date and time only
+                timestamp = datetime.fromtimestamp(trade['timestamp'] / 1000).strftime('%Y-%m-%d %H:%M')
                 pnl = trade.get('profit_loss', 0)
                 
                 emoji = "🟢" if action == "BUY" else "🔴"
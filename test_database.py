@@ -0,0 +1,171 @@
+"""
+Tests for the trading database
+"""
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from database import TradingDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = TradingDatabase(str(tmp_path / 'data' / 'trading_bot.db'), group_commit=False)
+    yield database
+    database.close()
+
+
+def test_performance_summary_with_null_pnl(db):
+    """Trades without a P&L count as trades but as neither wins nor losses"""
+    db.insert_trade(symbol='BTC/USDT', action='SELL', price=1, amount=1, profit_loss=5.0)
+    null_id = db.insert_trade(symbol='X', action='SELL', price=1, amount=1, profit_loss=None)
+
+    summary = db.get_performance_summary()
+    assert (summary['total_trades'], summary['winning_trades'], summary['losing_trades']) == (2, 1, 0)
+    assert summary['total_profit_loss'] == 5.0
+
+    with db.get_connection() as conn:
+        conn.execute('UPDATE trades SET profit_loss = -2.0 WHERE id = ?', (null_id,))
+    summary = db.get_performance_summary()
+    assert (summary['total_trades'], summary['winning_trades'], summary['losing_trades']) == (2, 1, 1)
+    assert summary['total_profit_loss'] == 3.0
+
+    with db.get_connection() as conn:
+        conn.execute('UPDATE trades SET profit_loss = NULL WHERE id = ?', (null_id,))
+    summary = db.get_performance_summary()
+    assert (summary['winning_trades'], summary['losing_trades']) == (1, 0)
+    assert summary['total_profit_loss'] == 5.0
+
+    with db.get_connection() as conn:
+        conn.execute('DELETE FROM trades WHERE id = ?', (null_id,))
+    summary = db.get_performance_summary()
+    assert (summary['total_trades'], summary['winning_trades'], summary['losing_trades']) == (1, 1, 0)
+    assert summary['total_profit_loss'] == 5.0
+
+
+# Schema written by releases before timestamps moved to epoch milliseconds
+_BASELINE_SCHEMA = '''
+    CREATE TABLE trades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, symbol TEXT NOT NULL,
+        action TEXT NOT NULL, price REAL NOT NULL, amount REAL NOT NULL, total_value REAL NOT NULL,
+        commission REAL DEFAULT 0, profit_loss REAL DEFAULT 0, reason TEXT,
+        status TEXT DEFAULT 'completed', order_id TEXT, metadata TEXT
+    );
+    CREATE TABLE signals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, symbol TEXT NOT NULL,
+        signal_type TEXT NOT NULL, price REAL NOT NULL, strength INTEGER, indicators TEXT,
+        executed BOOLEAN DEFAULT 0, metadata TEXT
+    );
+    CREATE TABLE portfolio (
+        symbol TEXT PRIMARY KEY, amount REAL NOT NULL, avg_buy_price REAL NOT NULL,
+        current_price REAL, total_value REAL, profit_loss REAL, profit_loss_percent REAL,
+        last_updated TEXT
+    );
+    CREATE TABLE balance (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, balance REAL NOT NULL,
+        equity REAL NOT NULL, profit_loss REAL, profit_loss_percent REAL
+    );
+    CREATE TABLE market_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL, open REAL NOT NULL, high REAL NOT NULL, low REAL NOT NULL,
+        close REAL NOT NULL, volume REAL NOT NULL, UNIQUE(timestamp, symbol, timeframe)
+    );
+'''
+
+
+def test_migrates_baseline_schema(tmp_path):
+    """Rows in a baseline-schema database survive the move to epoch-millisecond tables"""
+    path = tmp_path / 'trading_bot.db'
+    stamp = '2024-03-01T12:30:00.250000'
+    stamp_ms = int(datetime.fromisoformat(stamp).timestamp() * 1000)
+
+    legacy = sqlite3.connect(path)
+    legacy.executescript(_BASELINE_SCHEMA)
+    legacy.execute("INSERT INTO trades (timestamp, symbol, action, price, amount, total_value, profit_loss) "
+                   "VALUES (?, 'BTC/USDT', 'SELL', 100, 2, 200, 7.5)", (stamp,))
+    legacy.execute("INSERT INTO trades (timestamp, symbol, action, price, amount, total_value, profit_loss) "
+                   "VALUES (?, 'ETH/USDT', 'SELL', 10, 1, 10, -2.5)", (stamp,))
+    legacy.execute("INSERT INTO signals (timestamp, symbol, signal_type, price, strength, indicators) "
+                   "VALUES (?, 'BTC/USDT', 'BUY', 100, 80, '{\"rsi\": 25}')", (stamp,))
+    legacy.execute("INSERT INTO portfolio VALUES ('BTC/USDT', 2, 100, 110, 220, 20, 10, ?)", (stamp,))
+    legacy.execute("INSERT INTO balance (timestamp, balance, equity) VALUES (?, 1000, 1020)", (stamp,))
+    legacy.execute("INSERT INTO market_data (timestamp, symbol, timeframe, open, high, low, close, volume) "
+                   "VALUES (?, 'BTC/USDT', '1h', 1, 2, 0.5, 1.5, 10)", (stamp,))
+    legacy.commit()
+    legacy.close()
+
+    db = TradingDatabase(str(path))
+    try:
+        trades = db.get_trades()
+        assert sorted((t['symbol'], t['profit_loss'], t['timestamp']) for t in trades) == [
+            ('BTC/USDT', 7.5, stamp_ms), ('ETH/USDT', -2.5, stamp_ms)]
+
+        signal, = db.get_signals()
+        assert (signal['timestamp'], signal['indicators']) == (stamp_ms, {'rsi': 25})
+
+        holding, = db.get_portfolio()
+        assert (holding['total_value'], holding['profit_loss'], holding['last_updated']) == (220, 20, stamp_ms)
+
+        assert db.get_latest_balance()['timestamp'] == stamp_ms
+        candle, = db.get_market_data('BTC/USDT', '1h')
+        assert (candle['timestamp'], candle['close']) == (stamp_ms, 1.5)
+
+        summary = db.get_performance_summary()
+        assert (summary['total_trades'], summary['winning_trades'], summary['losing_trades']) == (2, 1, 1)
+        assert summary['total_profit_loss'] == 5.0
+
+        with db.get_connection(readonly=True) as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert not any(name.endswith('_legacy') for name in tables)
+    finally:
+        db.close()
+
+
+def test_group_commit_failing_row_keeps_rest_of_batch(tmp_path):
+    """A row that violates a constraint fails its own Future; the rest of the batch commits"""
+    db = TradingDatabase(str(tmp_path / 'trading_bot.db'), group_commit=True, batch_window=0.5)
+    try:
+        futures = [
+            db.insert_signal('BTC/USDT', 'BUY', 100.0, {'rsi': 25}),
+            db.insert_signal('ETH/USDT', 'SELL', None, {'rsi': 75}),
+            db.insert_signal('SOL/USDT', 'HOLD', 20.0, {'rsi': 50}),
+        ]
+        db.flush()
+
+        assert isinstance(futures[0].result(), int)
+        with pytest.raises(sqlite3.IntegrityError):
+            futures[1].result()
+        assert isinstance(futures[2].result(), int)
+
+        assert sorted(s['symbol'] for s in db.get_signals()) == ['BTC/USDT', 'SOL/USDT']
+    finally:
+        db.close()
+
+
+def test_close_flushes_queued_writes(tmp_path):
+    """close() commits every queued insert before shutting the writer down"""
+    path = str(tmp_path / 'trading_bot.db')
+    db = TradingDatabase(path, group_commit=True, batch_size=8, batch_window=0.5)
+    futures = [db.insert_trade('BTC/USDT', 'BUY', 100.0 + i, 1.0) for i in range(50)]
+    db.close()
+
+    assert all(future.done() for future in futures)
+    reopened = TradingDatabase(path)
+    try:
+        assert len(reopened.get_trades(limit=100)) == 50
+    finally:
+        reopened.close()
+
+
+def test_readonly_connection_sees_commits_but_cannot_write(db):
+    """Read-only pool connections see committed rows and refuse writes"""
+    db.insert_trade('BTC/USDT', 'BUY', 100.0, 1.0)
+
+    with db.get_connection(readonly=True) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM trades').fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM trades")
+
+    db.insert_trade('ETH/USDT', 'BUY', 10.0, 1.0)
+    assert len(db.get_trades()) == 2
@@ -0,0 +1,116 @@
+"""
+Regression tests for the Enhanced ML Predictor scoring paths
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from enhanced_ml_predictor import EnhancedMLPredictor, OnlineFeatures, XGB_ROUNDS, XGBOOST_AVAILABLE, _best_booster
+
+
+def _noise_dataset(n_rows=400, n_features=6, seed=0):
+    """Random features and labels, so early stopping halts well before the last round"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, n_features)).astype(np.float32)
+    y = rng.integers(-1, 2, n_rows)
+    return X, y
+
+
+def _ohlcv_with_warmup(n_rows=200, seed=1):
+    """Price/volume frame whose RSI column starts with the NaN warm-up a real indicator has"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_rows)))
+    volume = rng.uniform(10, 100, n_rows)
+    rsi = rng.uniform(10, 90, n_rows)
+    rsi[:14] = np.nan
+    return pd.DataFrame({'close': close, 'volume': volume, 'rsi': rsi})
+
+
+@pytest.mark.skipif(not XGBOOST_AVAILABLE, reason="xgboost not installed")
+def test_xgb_booster_matches_predict_proba(tmp_path):
+    """inplace_predict on the scoring booster must honour best_iteration like predict_proba"""
+    predictor = EnhancedMLPredictor(model_dir=str(tmp_path))
+    X, y = _noise_dataset()
+    model = predictor.train_xgboost(X[:300], y[:300], X[300:], y[300:])
+
+    assert model.best_iteration + 1 < model.get_booster().num_boosted_rounds()
+
+    booster = _best_booster(model)
+    np.testing.assert_allclose(booster.inplace_predict(X), model.predict_proba(X), rtol=1e-6, atol=1e-6)
+
+
+def test_online_features_match_batch_after_nan_warmup(tmp_path):
+    """Leading NaN indicator values must only delay the streaming features"""
+    predictor = EnhancedMLPredictor(model_dir=str(tmp_path))
+    df = _ohlcv_with_warmup()
+    batch = predictor.prepare_features(df)
+
+    online = OnlineFeatures()
+    rows = {i: row for i, bar in enumerate(df.to_dict('records'))
+            if (row := online.update(bar)) is not None}
+
+    assert list(rows) == list(batch.index)
+    np.testing.assert_allclose(
+        pd.DataFrame.from_dict(rows, orient='index')[batch.columns].to_numpy(dtype=np.float64),
+        batch.to_numpy(dtype=np.float64),
+        rtol=1e-5
+    )
+
+
+def test_predict_online_recovers_after_nan_warmup(tmp_path):
+    """predict_online leaves the warm-up state once the NaN head has scrolled out"""
+    predictor = EnhancedMLPredictor(model_dir=str(tmp_path))
+    df = _ohlcv_with_warmup()
+
+    reasons = [predictor.predict_online('BTC/USDT', bar).reasoning[0] for bar in df.to_dict('records')]
+
+    assert reasons[-1] == "Models not trained yet"
+    assert reasons.count("Warming up feature state") < 30
+
+
+@pytest.mark.skipif(not XGBOOST_AVAILABLE, reason="xgboost not installed")
+def test_xgb_warm_start_continues_from_best_iteration(tmp_path):
+    """A warm start builds on the best_iteration slice, not the full previous booster"""
+    predictor = EnhancedMLPredictor(model_dir=str(tmp_path))
+    X, y = _noise_dataset(seed=0)
+    first = predictor.train_xgboost(X[:300], y[:300], X[300:], y[300:])
+    base_rounds = first.best_iteration + 1
+    assert base_rounds < first.get_booster().num_boosted_rounds()
+
+    X, y = _noise_dataset(seed=1)
+    second = predictor.train_xgboost(X[:300], y[:300], X[300:], y[300:], first.get_booster())
+
+    assert base_rounds < second.get_booster().num_boosted_rounds() <= base_rounds + XGB_ROUNDS
+
+
+@pytest.mark.skipif(not XGBOOST_AVAILABLE, reason="xgboost not installed")
+def test_xgb_warm_start_over_round_cap_refits(tmp_path):
+    """A warm start that could pass max_boost_rounds falls back to a cold fit"""
+    predictor = EnhancedMLPredictor(model_dir=str(tmp_path), max_boost_rounds=XGB_ROUNDS)
+    X, y = _noise_dataset(seed=0)
+    first = predictor.train_xgboost(X[:300], y[:300], X[300:], y[300:])
+
+    X, y = _noise_dataset(seed=1)
+    warm = predictor.train_xgboost(X[:300], y[:300], X[300:], y[300:], first.get_booster())
+    cold = predictor.train_xgboost(X[:300], y[:300], X[300:], y[300:])
+
+    np.testing.assert_array_equal(warm.predict_proba(X), cold.predict_proba(X))
+
+
+def test_predict_online_keeps_symbols_apart(tmp_path):
+    """Interleaved bars of two symbols leave each symbol with the state of its own stream"""
+    predictor = EnhancedMLPredictor(model_dir=str(tmp_path))
+    frames = {'BTC/USDT': _ohlcv_with_warmup(seed=1), 'ETH/USDT': _ohlcv_with_warmup(seed=2)}
+
+    for i in range(len(frames['BTC/USDT'])):
+        for symbol, df in frames.items():
+            predictor.predict_online(symbol, df.iloc[i].to_dict())
+
+    for symbol, df in frames.items():
+        reference = OnlineFeatures()
+        for bar in df.to_dict('records'):
+            reference.update(bar)
+        online = predictor._online[symbol]
+        np.testing.assert_allclose(list(online.closes), list(reference.closes))
+        np.testing.assert_allclose(list(online.returns), list(reference.returns))
+        np.testing.assert_allclose(list(online.rsis), list(reference.rsis))
@@ -0,0 +1,136 @@
+"""
+Regression tests for the Enhanced Risk Manager's closed-trade statistics and batch helpers
+"""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from enhanced_risk_manager import EnhancedRiskManager, Position, TP_RISK_MULTIPLES
+
+INITIAL_CAPITAL = 10000.0
+
+
+def _closed(pnl):
+    """Closed long position carrying only the realized P&L the statistics read"""
+    return Position('BTC/USDT', 'long', 100.0, 1.0, 98.0, [104.0], datetime.now(), realized_pnl=pnl)
+
+
+def _pnl_history(n=60, seed=0):
+    """Rounded random P&L with flat trades and a losing run at the end"""
+    rng = np.random.default_rng(seed)
+    pnl = np.round(rng.normal(5, 50, n), 2)
+    pnl[::7] = 0.0
+    pnl[-6:] = -np.abs(pnl[-6:]) - 1
+    return pnl
+
+
+def _assert_matches_reference(manager, pnl):
+    """Compare every closed-trade statistic with a direct NumPy computation over pnl"""
+    returns = pnl / INITIAL_CAPITAL
+    wins = pnl[pnl > 0]
+    losses = np.abs(pnl[pnl < 0])
+    win_rate = len(wins) / len(pnl)
+
+    stats = manager.calculate_win_statistics()
+    np.testing.assert_allclose(stats, (win_rate, wins.mean(), losses.mean()), rtol=1e-12)
+
+    mean_ret, variance = manager._return_moments()
+    assert mean_ret == pytest.approx(np.mean(returns), rel=1e-9)
+    assert variance == pytest.approx(np.var(returns), rel=1e-9)
+
+    for q in (0, 5, 50, 95, 100):
+        assert manager._pnl_percentile(q) == pytest.approx(np.percentile(pnl, q), rel=1e-12, abs=1e-12)
+
+    not_losses = np.flatnonzero(pnl >= 0)
+    assert manager._loss_streak == len(pnl) - 1 - not_losses[-1]
+
+    metrics = manager.get_risk_metrics()
+    assert metrics.win_rate == pytest.approx(win_rate)
+    assert metrics.sharpe_ratio == pytest.approx(np.mean(returns) / np.std(returns) * np.sqrt(252), rel=1e-9)
+    assert metrics.var_95 == pytest.approx(np.percentile(pnl, 5), rel=1e-12)
+    assert metrics.profit_factor == pytest.approx(
+        (wins.mean() * win_rate) / (losses.mean() * (1 - win_rate)), rel=1e-9
+    )
+
+
+def test_recorded_positions_match_numpy_reference():
+    """record_closed_position keeps the running aggregates equal to a full recomputation"""
+    manager = EnhancedRiskManager(INITIAL_CAPITAL)
+    pnl = _pnl_history()
+
+    for i, value in enumerate(pnl, start=1):
+        manager.record_closed_position(_closed(value))
+        if i >= 10:
+            _assert_matches_reference(manager, pnl[:i])
+
+
+def test_directly_appended_positions_match_numpy_reference():
+    """Positions appended straight to closed_positions are picked up by the rebuild"""
+    manager = EnhancedRiskManager(INITIAL_CAPITAL)
+    pnl = _pnl_history(seed=1)
+
+    for value in pnl[:30]:
+        manager.closed_positions.append(_closed(value))
+    _assert_matches_reference(manager, pnl[:30])
+
+    # Mixing both paths: recorded trades build on the rebuilt aggregates
+    for value in pnl[30:45]:
+        manager.record_closed_position(_closed(value))
+    for value in pnl[45:]:
+        manager.closed_positions.append(_closed(value))
+    _assert_matches_reference(manager, pnl)
+
+
+def test_loss_streak_trips_circuit_breaker_on_both_paths():
+    """Five trailing losses trip the breaker whether recorded or appended directly"""
+    recorded = EnhancedRiskManager(INITIAL_CAPITAL)
+    appended = EnhancedRiskManager(INITIAL_CAPITAL)
+
+    for value in [10.0, -1.0, 0.0, -1.0, -1.0, -1.0, -1.0]:
+        recorded.record_closed_position(_closed(value))
+        appended.closed_positions.append(_closed(value))
+    assert recorded._loss_streak == 4
+    assert not recorded.check_circuit_breaker()
+    assert not appended.check_circuit_breaker()
+
+    recorded.record_closed_position(_closed(-1.0))
+    appended.closed_positions.append(_closed(-1.0))
+    assert recorded.check_circuit_breaker()
+    assert appended.check_circuit_breaker()
+
+
+def test_stop_loss_batch_matches_scalar():
+    """calculate_stop_loss_batch agrees with calculate_stop_loss, including the NaN fallback and clipping"""
+    manager = EnhancedRiskManager(INITIAL_CAPITAL)
+    rng = np.random.default_rng(2)
+    entries = rng.uniform(10, 50000, 200)
+    atrs = entries * rng.uniform(0.0, 0.04, 200)
+    atrs[::5] = np.nan
+    sides = np.where(rng.random(200) < 0.5, 1.0, -1.0)
+
+    batch = manager.calculate_stop_loss_batch(entries, atrs, sides)
+
+    expected = [
+        manager.calculate_stop_loss(entry, None if np.isnan(atr) else atr, 'long' if side > 0 else 'short')
+        for entry, atr, side in zip(entries, atrs, sides)
+    ]
+    np.testing.assert_allclose(batch, expected, rtol=1e-12)
+
+
+def test_take_profit_batch_matches_scalar():
+    """calculate_take_profit_batch agrees with calculate_take_profit_levels row by row"""
+    manager = EnhancedRiskManager(INITIAL_CAPITAL)
+    rng = np.random.default_rng(3)
+    entries = rng.uniform(10, 50000, 200)
+    sides = np.where(rng.random(200) < 0.5, 1.0, -1.0)
+    stops = entries - sides * entries * rng.uniform(0.01, 0.05, 200)
+
+    batch = manager.calculate_take_profit_batch(entries, stops, sides)
+
+    assert batch.shape == (200, len(TP_RISK_MULTIPLES))
+    expected = [
+        manager.calculate_take_profit_levels(entry, stop, 'long' if side > 0 else 'short', len(TP_RISK_MULTIPLES))
+        for entry, stop, side in zip(entries, stops, sides)
+    ]
+    np.testing.assert_allclose(batch, expected, rtol=1e-12)
@@ -0,0 +1,59 @@
+"""
+Tests for the trading logger's file output
+"""
+import glob
+import json
+import os
+
+from logger import TradingLogger
+
+
+def _read_lines(log_dir, pattern):
+    """Lines of every file matching pattern, rotated backups included"""
+    lines = []
+    for path in glob.glob(os.path.join(log_dir, pattern)):
+        with open(path, encoding='utf-8') as f:
+            lines.extend(f.read().splitlines())
+    return lines
+
+
+def test_logger_rotates_and_writes_structured_files(tmp_path):
+    """Records logged past max_bytes rotate, and close() leaves every file complete"""
+    log_dir = str(tmp_path / 'logs')
+    logger = TradingLogger(log_dir=log_dir, log_level='DEBUG', max_bytes=4096, backup_count=3)
+
+    for i in range(500):
+        logger.info("Tick %d processed", i)
+    logger.log_signal('BUY', 'BTC/USDT', 45000.0, {'RSI': 28, 'MACD': 'bullish'}, 85)
+    logger.log_trade('BUY', 'BTC/USDT', 45000.0, 0.1, 'Strong buy signal')
+    try:
+        raise ValueError("order rejected")
+    except ValueError:
+        logger.error("Failed to place order for %s", 'BTC/USDT', exc_info=True)
+    logger.close()
+
+    files = sorted(os.listdir(log_dir))
+    assert {'bot.log', 'bot.log.1', 'bot.log.2', 'bot.log.3'} <= set(files)
+    assert 'bot.log.4' not in files
+    for name in ('bot.log', 'bot.log.1', 'bot.log.2', 'bot.log.3'):
+        assert os.path.getsize(os.path.join(log_dir, name)) <= 4096
+
+    bot_lines = _read_lines(log_dir, 'bot.log*')
+    assert any(line.endswith("Tick 499 processed") for line in bot_lines)
+    assert any("TRADE: BUY 0.1 BTC/USDT @ 45000.0" in line for line in bot_lines)
+
+    signal, = [json.loads(line) for line in _read_lines(log_dir, 'signals.log')]
+    assert signal['signal'] == 'BUY' and signal['symbol'] == 'BTC/USDT'
+    assert signal['strength'] == 85
+    assert signal['indicators'] == {'RSI': 28, 'MACD': 'bullish'}
+
+    trade, = [json.loads(line) for line in _read_lines(log_dir, 'trades.log')]
+    assert trade == {**trade, 'action': 'BUY', 'symbol': 'BTC/USDT', 'price': 45000.0,
+                     'amount': 0.1, 'reason': 'Strong buy signal', 'level': 'INFO'}
+
+    errors = "\n".join(_read_lines(log_dir, 'errors.log'))
+    assert "Failed to place order for BTC/USDT" in errors
+    assert "Traceback (most recent call last)" in errors
+    assert "ValueError: order rejected" in errors
+    # The main log gets the message without the traceback
+    assert not any("Traceback" in line for line in bot_lines)
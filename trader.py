@@ -150,16 +150,20 @@ class Trader:
             if trade:
                 self.logger.log_trade('BUY', symbol, price, position_size, reason)
                 
-                # Store in database
-                self.db.insert_trade(
-                    symbol=symbol,
-                    action='BUY',
-                    price=price,
-                    amount=position_size,
-                    commission=trade.get('commission', 0),
-                    reason=reason,
-                    order_id=trade.get('order_id', ''),
-                    metadata={'signal_strength': signal_strength, 'stop_loss': stop_loss}
+                # Store trade and resulting holding in one transaction
+                self.db.record_trade_atomic(
+                    trade={
+                        'symbol': symbol,
+                        'action': 'BUY',
+                        'price': price,
+                        'amount': position_size,
+                        'commission': trade.get('commission', 0),
+                        'reason': reason,
+                        'order_id': trade.get('order_id', ''),
+                        'metadata': {'signal_strength': signal_strength, 'stop_loss': stop_loss}
+                    },
+                    portfolio={'symbol': symbol, 'amount': position_size,
+                               'avg_buy_price': price, 'current_price': price}
                 )
                 
                 return trade
@@ -210,16 +214,20 @@ class Trader:
                 # Calculate profit/loss
                 profit_loss = trade.get('profit_loss', 0)
                 
-                # Store in database
-                self.db.insert_trade(
-                    symbol=symbol,
-                    action='SELL',
-                    price=price,
-                    amount=amount,
-                    commission=trade.get('commission', 0),
-                    profit_loss=profit_loss,
-                    reason=reason,
-                    order_id=trade.get('order_id', '')
+                # Store trade and close the holding in one transaction
+                self.db.record_trade_atomic(
+                    trade={
+                        'symbol': symbol,
+                        'action': 'SELL',
+                        'price': price,
+                        'amount': amount,
+                        'commission': trade.get('commission', 0),
+                        'profit_loss': profit_loss,
+                        'reason': reason,
+                        'order_id': trade.get('order_id', '')
+                    },
+                    portfolio={'symbol': symbol, 'amount': 0,
+                               'avg_buy_price': price, 'current_price': price}
                 )
                 
                 return trade